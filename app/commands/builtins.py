@@ -336,7 +336,7 @@ async def cmd_review_skill(args: str, context: CommandContext) -> str:
 
             # List tools from this server
             tools = context.mcp_manager.get_tools()
-            server_tools = [t for t in tools.values() if t.skill_name == f"mcp::{name}"]
+            server_tools = [t for t in tools.values() if t.server_name == name]
             if server_tools:
                 lines.append(f"\n*Tools ({len(server_tools)}):*")
                 for t in server_tools:
@@ -569,8 +569,7 @@ async def cmd_help(args: str, context: CommandContext) -> str:
             tools = context.mcp_manager.get_tools()
             by_server: dict[str, list] = {}
             for tool in tools.values():
-                server = tool.skill_name.removeprefix("mcp::")
-                by_server.setdefault(server, []).append(tool)
+                by_server.setdefault(tool.server_name, []).append(tool)
             for server, server_tools in by_server.items():
                 desc = context.mcp_manager._server_descriptions.get(server, server)
                 lines.append(f"- 📡 {server} ({desc})")
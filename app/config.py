@@ -32,6 +32,17 @@ class Settings(BaseSettings):
         "Do NOT assume a page is inaccessible without trying the tool first."
     )
     conversation_max_messages: int = 20
+    ollama_keep_alive: str = "24h"  # residencia de modelos en Ollama ("-1" = indefinida)
+    ollama_heartbeat_interval: int = 240  # segundos entre pings de residencia; 0 = off
+
+    # Shared HTTP client pool (Ollama + WhatsApp)
+    http_max_connections: int = 200
+    http_max_keepalive: int = 50
+    http_keepalive_expiry: float = 120.0  # seconds an idle socket is kept warm
+
+    # Default thread pool (asyncio.to_thread / run_in_executor(None)): audit writes,
+    # file I/O, blocking search clients, Whisper
+    thread_pool_size: int = 64
 
     # Database
     database_path: str = "data/localforge.db"
@@ -64,6 +75,12 @@ class Settings(BaseSettings):
 
     # MCP
     mcp_config_path: str = "data/mcp_servers.json"
+    mcp_lazy_connect: bool = (
+        True  # servers con manifest de tools cacheado se conectan al primer uso
+    )
+    mcp_speculative_fetch_fallback: bool = (
+        False  # lanza el fallback mcp-fetch en paralelo a cada tool puppeteer_*
+    )
 
     # Tool router
     max_tools_per_call: int = 8
@@ -93,6 +110,8 @@ class Settings(BaseSettings):
     guardrails_pii_check: bool = True
     guardrails_llm_checks: bool = False  # Activar en Iteración 6
     guardrails_llm_timeout: float = 3.0  # segundos; 0.5 era demasiado bajo para qwen3:8b local
+    llm_response_cache_size: int = 256  # respuestas cacheadas de chat(cache=True); 0 = off
+    llm_response_cache_ttl: float = 300.0  # segundos
 
     # Tracing (Fase 2)
     tracing_enabled: bool = True
@@ -73,7 +73,11 @@ class Repository:
             (conversation_id, limit),
         )
         rows = await cursor.fetchall()
-        return [ChatMessage(role=r[0], content=r[1]) for r in reversed(rows)]  # type: ignore[call-overload]
+        # Rows come from our own schema: model_construct skips pydantic validation (hot path)
+        return [
+            ChatMessage.model_construct(role=r[0], content=r[1])
+            for r in reversed(rows)  # type: ignore[call-overload]
+        ]
 
     async def get_message_count(self, conversation_id: int) -> int:
         cursor = await self._conn.execute(
@@ -138,13 +142,44 @@ class Repository:
         await self._conn.commit()
         return cursor.rowcount > 0
 
+    async def add_memories_bulk(self, rows: list[tuple[str, str | None]]) -> None:
+        """Insert (content, category) rows in a single transaction."""
+        if not rows:
+            return
+        await self._conn.executemany(
+            "INSERT INTO memories (content, category) VALUES (?, ?)",
+            rows,
+        )
+        await self._conn.commit()
+
+    async def remove_memories_bulk(self, contents: list[str]) -> int:
+        """Deactivate memories by content in a single transaction. Returns rows affected."""
+        if not contents:
+            return 0
+        cursor = await self._conn.executemany(
+            "UPDATE memories SET active = 0 WHERE content = ? AND active = 1",
+            [(c,) for c in contents],
+        )
+        await self._conn.commit()
+        return cursor.rowcount
+
+    async def update_memory_category(self, content: str, category: str | None) -> bool:
+        cursor = await self._conn.execute(
+            "UPDATE memories SET category = ? WHERE content = ? AND active = 1",
+            (category, content),
+        )
+        await self._conn.commit()
+        return cursor.rowcount > 0
+
     async def list_memories(self) -> list[Memory]:
         cursor = await self._conn.execute(
             "SELECT id, content, category, active, created_at FROM memories WHERE active = 1 ORDER BY id",
         )
         rows = await cursor.fetchall()
         return [
-            Memory(id=r[0], content=r[1], category=r[2], active=bool(r[3]), created_at=r[4])
+            Memory.model_construct(
+                id=r[0], content=r[1], category=r[2], active=bool(r[3]), created_at=r[4]
+            )
             for r in rows
         ]
 
@@ -211,7 +246,9 @@ class Repository:
         )
         rows = await cursor.fetchall()
         return [
-            Memory(id=r[0], content=r[1], category=r[2], active=bool(r[3]), created_at=r[4])
+            Memory.model_construct(
+                id=r[0], content=r[1], category=r[2], active=bool(r[3]), created_at=r[4]
+            )
             for r in rows
         ]
 
@@ -247,7 +284,7 @@ class Repository:
         )
         row = await cursor.fetchone()
         if row:
-            return ChatMessage(role=row[0], content=row[1])
+            return ChatMessage.model_construct(role=row[0], content=row[1])
         return None
 
     # --- Notes ---
@@ -1215,7 +1252,7 @@ class Repository:
         row = await cursor.fetchone()
         if not row:
             return None
-        return Memory(
+        return Memory.model_construct(
             id=row[0], content=row[1], category=row[2], active=bool(row[3]), created_at=row[4]
         )
 
@@ -52,7 +52,7 @@ def get_rate_limiter(request: Request) -> RateLimiter:
     return request.app.state.rate_limiter
 
 
-def get_transcriber(request: Request) -> Transcriber:
+def get_transcriber(request: Request) -> Transcriber | None:
     return request.app.state.transcriber
 
 
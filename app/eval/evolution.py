@@ -68,7 +68,11 @@ async def propose_prompt_change(
         new_content = await ollama_client.chat([system_msg, user_msg], think=False)
         if hasattr(new_content, "content"):
             new_content = new_content.content
-        new_content = str(new_content).strip()
+        if not isinstance(new_content, str):
+            new_content = str(new_content)
+        # Only pay for the copy when there is surrounding whitespace to trim
+        if new_content[:1].isspace() or new_content[-1:].isspace():
+            new_content = new_content.strip()
     except Exception:
         logger.exception("LLM failed to generate prompt proposal")
         raise
@@ -9,6 +9,7 @@ Strategy (ordered by preference):
 
 from __future__ import annotations
 
+import functools
 import json
 import logging
 
@@ -123,6 +124,14 @@ def _extract_item_list(
     return None  # Could not fit even one item
 
 
+@functools.lru_cache(maxsize=1)
+def get_compaction_threshold() -> int:
+    """Configured compaction threshold, read once (Settings() re-parses env and .env)."""
+    from app.config import Settings
+
+    return Settings().compaction_threshold  # type: ignore[call-arg]
+
+
 async def compact_tool_output(
     tool_name: str,
     text: str,
@@ -136,9 +145,7 @@ async def compact_tool_output(
     then falls back to LLM summarization, then to hard truncation.
     """
     if max_length is None:
-        from app.config import Settings
-
-        max_length = Settings().compaction_threshold  # type: ignore[call-arg]
+        max_length = get_compaction_threshold()
 
     if len(text) <= max_length:
         return text
@@ -2,23 +2,37 @@
 
 from __future__ import annotations
 
+import functools
 import re
+import threading
 import time
 
 from app.guardrails.models import GuardrailResult
+from app.models import ChatMessage
 
 # --- PII patterns ---
 
+# Todos los patrones PII son ASCII-only: re.ASCII evita las tablas Unicode de \d/\s/\b.
+
 # DNI argentino: 7-8 dígitos aislados (no dentro de números más largos)
-_RE_DNI = re.compile(r"\b\d{7,8}\b")
+_RE_DNI = re.compile(r"\b\d{7,8}\b", re.ASCII)
 # Tokens: Bearer, sk-, whsec_, etc.
 _RE_TOKEN = re.compile(
-    r"\b(Bearer\s+[A-Za-z0-9\-._~+/]+=*|sk-[A-Za-z0-9]{20,}|whsec_[A-Za-z0-9]+)\b"
+    r"\b(Bearer\s+[A-Za-z0-9\-._~+/]+=*|sk-[A-Za-z0-9]{20,}|whsec_[A-Za-z0-9]+)\b", re.ASCII
 )
 # Emails
-_RE_EMAIL = re.compile(r"\b[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}\b")
-# Phones: secuencias de 10-15 dígitos, opcionalmente con +/- separadores
-_RE_PHONE = re.compile(r"\b\+?[\d\s\-]{10,15}\b")
+_RE_EMAIL = re.compile(r"\b[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}\b", re.ASCII)
+# Phones: 10-15 caracteres de dígitos/espacios/guiones, opcionalmente con +.
+# Anclado en dígitos en ambos extremos (sin \b) → no puede terminar en separadores
+# y acota el backtracking sobre corridas largas de dígitos y espacios.
+_RE_PHONE = re.compile(r"(?<!\d)\+?\d[\d\s\-]{8,13}\d(?!\d)", re.ASCII)
+# Fechas ISO (YYYY-MM-DD) que matchean el regex de teléfono
+_RE_ISO_DATE = re.compile(r"^\+?\d{4}-\d{2}-\d{2}$")
+# Separadores a normalizar antes de comparar teléfonos/DNIs
+_RE_SEP = re.compile(r"[\s\-]")
+# Prefiltro barato: sin dígitos no puede haber teléfonos ni DNIs
+_RE_ANY_DIGIT = re.compile(r"\d")
+_TOKEN_MARKERS = ("Bearer", "sk-", "whsec_")
 
 # Regex para detectar raw tool JSON leakage
 _RE_RAW_TOOL = re.compile(r'\{"tool_call"', re.IGNORECASE)
@@ -27,11 +41,36 @@ _RE_RAW_TOOL = re.compile(r'\{"tool_call"', re.IGNORECASE)
 _RE_URL = re.compile(r"^https?://\S+$")
 _RE_NON_NATURAL = re.compile(r"^[\w:/\-_.~%?=&#+@]+$")  # sin espacios → no es prosa
 
+# langdetect factory: profiles are loaded once per process and reused by every check.
+# Each detection builds its own Detector (cheap, not thread-safe), so only init is locked.
+_lang_factory = None
+_lang_factory_lock = threading.Lock()
+
+
+def _get_lang_factory():
+    global _lang_factory
+    if _lang_factory is None:
+        with _lang_factory_lock:
+            if _lang_factory is None:
+                from langdetect.detector_factory import PROFILES_DIRECTORY, DetectorFactory
+
+                factory = DetectorFactory()
+                factory.load_profile(PROFILES_DIRECTORY)
+                factory.set_seed(0)  # deterministic results for identical inputs
+                _lang_factory = factory
+    return _lang_factory
+
+
+def _detect_language(text: str) -> str:
+    detector = _get_lang_factory().create()
+    detector.append(text)
+    return detector.detect()
+
 
 def check_not_empty(reply: str) -> GuardrailResult:
-    start = time.monotonic()
+    start = time.perf_counter_ns()
     passed = len(reply.strip()) > 0
-    latency_ms = (time.monotonic() - start) * 1000
+    latency_ms = (time.perf_counter_ns() - start) / 1_000_000
     return GuardrailResult(
         passed=passed,
         check_name="not_empty",
@@ -45,12 +84,13 @@ def check_language_match(user_text: str, reply: str) -> GuardrailResult:
     Only applies when both texts are >= 30 chars (langdetect is unreliable on short texts).
     Skips if user_text has no whitespace (URL, UUID, code) — not natural language.
     """
-    start = time.monotonic()
+    start = time.perf_counter_ns()
     stripped_user = user_text.strip()
+    has_text_long_enough = len(stripped_user) >= 30 and len(reply.strip()) >= 30
 
     # Skip if either text is too short
-    if len(stripped_user) < 30 or len(reply.strip()) < 30:
-        latency_ms = (time.monotonic() - start) * 1000
+    if not has_text_long_enough:
+        latency_ms = (time.perf_counter_ns() - start) / 1_000_000
         return GuardrailResult(
             passed=True,
             check_name="language_match",
@@ -59,9 +99,10 @@ def check_language_match(user_text: str, reply: str) -> GuardrailResult:
         )
 
     # Skip if user_text is non-natural (URL, UUID, code with no spaces)
-    words = stripped_user.split()
+    # Only the first 3 words matter here: don't split the whole message
+    words = stripped_user.split(maxsplit=2)
     if len(words) <= 2 and _RE_NON_NATURAL.match(words[0]):
-        latency_ms = (time.monotonic() - start) * 1000
+        latency_ms = (time.perf_counter_ns() - start) / 1_000_000
         return GuardrailResult(
             passed=True,
             check_name="language_match",
@@ -69,75 +110,109 @@ def check_language_match(user_text: str, reply: str) -> GuardrailResult:
             latency_ms=latency_ms,
         )
 
-    try:
-        from langdetect import detect
+    passed, details = _language_core(user_text, reply)
+    latency_ms = (time.perf_counter_ns() - start) / 1_000_000
+    return GuardrailResult(
+        passed=passed,
+        check_name="language_match",
+        details=details,
+        latency_ms=latency_ms,
+    )
 
-        user_lang = detect(user_text)
-        reply_lang = detect(reply)
-        passed = user_lang == reply_lang
-        latency_ms = (time.monotonic() - start) * 1000
-        return GuardrailResult(
-            passed=passed,
-            check_name="language_match",
-            details=user_lang if not passed else "",
-            latency_ms=latency_ms,
-        )
+
+# Results of the pure check cores are memoized per process (keyed on the exact texts),
+# so re-running guardrails on the same (user_text, reply) skips langdetect and regex work.
+@functools.lru_cache(maxsize=512)
+def _language_core(user_text: str, reply: str) -> tuple[bool, str]:
+    try:
+        user_lang = _detect_language(user_text)
+        reply_lang = _detect_language(reply)
     except Exception:
-        latency_ms = (time.monotonic() - start) * 1000
         # Fail open: if detection fails, don't block the response
-        return GuardrailResult(
-            passed=True,
-            check_name="language_match",
-            details="detection failed, skipping",
-            latency_ms=latency_ms,
-        )
+        return True, "detection failed, skipping"
+    passed = user_lang == reply_lang
+    return passed, user_lang if not passed else ""
 
 
-def check_no_pii(user_text: str, reply: str) -> GuardrailResult:
-    """Check that reply doesn't leak PII not present in user_text."""
-    start = time.monotonic()
+def _extract_pii(text: str) -> dict[str, set[str]]:
+    """Scan text once per PII pattern and return normalized matches keyed by PII kind.
 
-    # Extract PII candidates from reply that were NOT in user_text
-    leaked: list[str] = []
+    Phones and DNIs are normalized (separators stripped) so that formatting differences
+    between user_text and reply don't count as new PII. ISO dates are dropped from the
+    phone set since they match the phone regex.
+    """
+    # Sets are built straight from finditer (no intermediate findall lists)
+    tokens: set[str] = set()
+    if any(marker in text for marker in _TOKEN_MARKERS):
+        tokens = {m.group(0) for m in _RE_TOKEN.finditer(text)}
+    emails: set[str] = set()
+    if "@" in text:
+        emails = {m.group(0) for m in _RE_EMAIL.finditer(text)}
+    phones: set[str] = set()
+    dnis: set[str] = set()
+    if _RE_ANY_DIGIT.search(text) is not None:
+        for match in _RE_PHONE.finditer(text):
+            m = match.group(0)
+            if _RE_ISO_DATE.match(m.strip()):
+                continue
+            phones.add(_RE_SEP.sub("", m))
+        dnis = {_RE_SEP.sub("", m.group(0)) for m in _RE_DNI.finditer(text)}
+    return {"token": tokens, "email": emails, "phone": phones, "dni": dnis}
 
-    for pattern, name in [
-        (_RE_TOKEN, "token"),
-        (_RE_EMAIL, "email"),
-    ]:
-        reply_matches = set(pattern.findall(reply))
-        user_matches = set(pattern.findall(user_text))
-        new_matches = reply_matches - user_matches
-        if new_matches:
-            leaked.append(f"{name}:{','.join(list(new_matches)[:2])}")
 
-    # Phones and DNIs: check for patterns that appear in reply but not user_text
-    # (common in production: bot generates phone numbers)
-    for pattern, name in [(_RE_PHONE, "phone"), (_RE_DNI, "dni")]:
-        reply_matches = set(pattern.findall(reply))
-        user_matches = set(pattern.findall(user_text))
+@functools.lru_cache(maxsize=256)
+def _scan_user_pii(user_text: str) -> dict[str, set[str]]:
+    """Memoized _extract_pii for user_text, which stays constant across retries/remediation.
+
+    The returned sets are shared between callers — treat them as read-only.
+    """
+    return _extract_pii(user_text)
 
-        reply_seqs = set()
-        for m in reply_matches:
-            # Ignore ISO dates (YYYY-MM-DD) which match phone regex
-            if name == "phone" and re.match(r"^\+?\d{4}-\d{2}-\d{2}$", m.strip()):
-                continue
-            reply_seqs.add(re.sub(r"[\s\-]", "", m))
 
-        user_seqs = {re.sub(r"[\s\-]", "", m) for m in user_matches}
-        new_seqs = reply_seqs - user_seqs
-        if new_seqs:
-            leaked.append(f"{name}:{','.join(list(new_seqs)[:2])}")
+def check_no_pii(
+    user_text: str,
+    reply: str,
+    user_pii: dict[str, set[str]] | None = None,
+) -> GuardrailResult:
+    """Check that reply doesn't leak PII not present in user_text.
+
+    Callers that already scanned user_text (via _scan_user_pii) can pass user_pii to skip it.
+    """
+    start = time.perf_counter_ns()
 
-    passed = len(leaked) == 0
-    latency_ms = (time.monotonic() - start) * 1000
+    if user_pii is None:
+        passed, details = _pii_core(user_text, reply)
+    else:
+        passed, details = _diff_pii(_extract_pii(reply), user_pii)
+    latency_ms = (time.perf_counter_ns() - start) / 1_000_000
     return GuardrailResult(
         passed=passed,
         check_name="no_pii",
-        details="; ".join(leaked) if leaked else "",
+        details=details,
         latency_ms=latency_ms,
     )
 
 
+@functools.lru_cache(maxsize=512)
+def _pii_core(user_text: str, reply: str) -> tuple[bool, str]:
+    # Extract PII candidates from reply that were NOT in user_text.
+    # Phones and DNIs included: common in production when the bot generates numbers.
+    reply_pii = _extract_pii(reply)
+    if not any(reply_pii.values()):
+        # Common case: chatty reply with no PII candidates — skip the user_text scan
+        return True, ""
+    return _diff_pii(reply_pii, _scan_user_pii(user_text))
+
+
+def _diff_pii(reply_pii: dict[str, set[str]], user_pii: dict[str, set[str]]) -> tuple[bool, str]:
+    leaked: list[str] = []
+    for name, reply_matches in reply_pii.items():
+        new_matches = reply_matches - user_pii[name]
+        if new_matches:
+            leaked.append(f"{name}:{','.join(list(new_matches)[:2])}")
+    return not leaked, "; ".join(leaked)
+
+
 def redact_pii(text: str) -> str:
     """Redact PII patterns in-place. Used as remediation for no_pii failures."""
     text = _RE_TOKEN.sub("[REDACTED_TOKEN]", text)
@@ -149,9 +224,9 @@ def check_excessive_length(reply: str) -> GuardrailResult:
     """Check that reply isn't excessively long (>8000 chars = possible runaway generation).
     split_message() handles chunking for normal long messages.
     """
-    start = time.monotonic()
+    start = time.perf_counter_ns()
     passed = len(reply) <= 8000
-    latency_ms = (time.monotonic() - start) * 1000
+    latency_ms = (time.perf_counter_ns() - start) / 1_000_000
     return GuardrailResult(
         passed=passed,
         check_name="excessive_length",
@@ -162,9 +237,9 @@ def check_excessive_length(reply: str) -> GuardrailResult:
 
 def check_no_raw_tool_json(reply: str) -> GuardrailResult:
     """Check that reply doesn't contain raw tool call JSON leaking into output."""
-    start = time.monotonic()
+    start = time.perf_counter_ns()
     passed = not bool(_RE_RAW_TOOL.search(reply))
-    latency_ms = (time.monotonic() - start) * 1000
+    latency_ms = (time.perf_counter_ns() - start) / 1_000_000
     return GuardrailResult(
         passed=passed,
         check_name="no_raw_tool_json",
@@ -178,9 +253,7 @@ async def check_tool_coherence(user_text: str, reply: str, ollama_client) -> Gua
 
     Only meaningful when tool_calls_used=True. Fail open on error or timeout.
     """
-    from app.models import ChatMessage
-
-    start = time.monotonic()
+    start = time.perf_counter_ns()
     try:
         prompt = (
             f"User question: {user_text[:300]}\n"
@@ -188,10 +261,12 @@ async def check_tool_coherence(user_text: str, reply: str, ollama_client) -> Gua
             "Does the assistant reply coherently address the user's question? "
             "Reply ONLY with 'yes' or 'no'."
         )
-        response = await ollama_client.chat([ChatMessage(role="user", content=prompt)], think=False)
+        response = await ollama_client.chat(
+            [ChatMessage(role="user", content=prompt)], think=False, cache=True
+        )
         answer = response.strip().lower()
         passed = answer.startswith("yes")
-        latency_ms = (time.monotonic() - start) * 1000
+        latency_ms = (time.perf_counter_ns() - start) / 1_000_000
         return GuardrailResult(
             passed=passed,
             check_name="tool_coherence",
@@ -199,7 +274,7 @@ async def check_tool_coherence(user_text: str, reply: str, ollama_client) -> Gua
             latency_ms=latency_ms,
         )
     except Exception as e:
-        latency_ms = (time.monotonic() - start) * 1000
+        latency_ms = (time.perf_counter_ns() - start) / 1_000_000
         return GuardrailResult(
             passed=True,
             check_name="tool_coherence",
@@ -213,9 +288,7 @@ async def check_hallucination(user_text: str, reply: str, ollama_client) -> Guar
 
     Fail open on error or timeout.
     """
-    from app.models import ChatMessage
-
-    start = time.monotonic()
+    start = time.perf_counter_ns()
     try:
         prompt = (
             f"User question: {user_text[:300]}\n"
@@ -224,10 +297,12 @@ async def check_hallucination(user_text: str, reply: str, ollama_client) -> Guar
             "(e.g., invented numbers, names, or dates not grounded in the question)? "
             "Reply ONLY with 'yes' or 'no'."
         )
-        response = await ollama_client.chat([ChatMessage(role="user", content=prompt)], think=False)
+        response = await ollama_client.chat(
+            [ChatMessage(role="user", content=prompt)], think=False, cache=True
+        )
         answer = response.strip().lower()
         passed = answer.startswith("no")  # "yes" = hallucination detected = fail
-        latency_ms = (time.monotonic() - start) * 1000
+        latency_ms = (time.perf_counter_ns() - start) / 1_000_000
         return GuardrailResult(
             passed=passed,
             check_name="hallucination_check",
@@ -235,10 +310,104 @@ async def check_hallucination(user_text: str, reply: str, ollama_client) -> Guar
             latency_ms=latency_ms,
         )
     except Exception as e:
-        latency_ms = (time.monotonic() - start) * 1000
+        latency_ms = (time.perf_counter_ns() - start) / 1_000_000
         return GuardrailResult(
             passed=True,
             check_name="hallucination_check",
             details=f"check error: {e}",
             latency_ms=latency_ms,
         )
+
+
+def _parse_llm_verdicts(response: str, keys: tuple[str, ...]) -> dict[str, str]:
+    """Parse 'key: yes/no' lines from a batched LLM judgment.
+
+    When a single question was asked, a bare 'yes'/'no' answer is accepted too.
+    Keys without a recognizable verdict are left out.
+    """
+    verdicts: dict[str, str] = {}
+    for line in response.strip().lower().splitlines():
+        key, sep, value = line.partition(":")
+        key = key.strip(" -*`")
+        value = value.strip(" .*`")
+        if sep and key in keys and value[:3] in ("yes", "no"):
+            verdicts[key] = "yes" if value.startswith("yes") else "no"
+    if not verdicts and len(keys) == 1:
+        answer = response.strip().lower()
+        if answer.startswith(("yes", "no")):
+            verdicts[keys[0]] = "yes" if answer.startswith("yes") else "no"
+    return verdicts
+
+
+async def check_combined_llm(
+    user_text: str,
+    reply: str,
+    ollama_client,
+    include_coherence: bool = True,
+) -> list[GuardrailResult]:
+    """LLM check: judge tool coherence and hallucination in a single Ollama call.
+
+    Returns one GuardrailResult per judgment (tool_coherence only when include_coherence).
+    Judgments missing from the answer, and any error, fail open.
+    """
+    start = time.perf_counter_ns()
+    keys = ("coherent", "hallucination") if include_coherence else ("hallucination",)
+    questions = []
+    if include_coherence:
+        questions.append(
+            "coherent: Does the assistant reply coherently address the user's question?"
+        )
+    questions.append(
+        "hallucination: Does the assistant reply contain specific made-up or hallucinated "
+        "facts (e.g., invented numbers, names, or dates not grounded in the question)?"
+    )
+    prompt = (
+        f"User question: {user_text[:300]}\n"
+        f"Assistant reply: {reply[:500]}\n\n"
+        "Answer each question below with 'yes' or 'no'.\n"
+        + "\n".join(questions)
+        + "\n\nReply ONLY with one line per question, in the form '<key>: yes' or '<key>: no'."
+    )
+
+    try:
+        response = await ollama_client.chat(
+            [ChatMessage(role="user", content=prompt)], think=False, cache=True
+        )
+        verdicts = _parse_llm_verdicts(response, keys)
+        error = ""
+    except Exception as e:
+        verdicts = {}
+        error = f"check error: {e}"
+    latency_ms = (time.perf_counter_ns() - start) / 1_000_000
+
+    results: list[GuardrailResult] = []
+    if include_coherence:
+        coherent = verdicts.get("coherent")
+        passed = coherent != "no"
+        if coherent is None:
+            details = error or "no verdict in LLM answer"
+        else:
+            details = "" if passed else "LLM judged reply incoherent with question"
+        results.append(
+            GuardrailResult(
+                passed=passed,
+                check_name="tool_coherence",
+                details=details,
+                latency_ms=latency_ms,
+            )
+        )
+    hallucination = verdicts.get("hallucination")
+    passed = hallucination != "yes"  # "yes" = hallucination detected = fail
+    if hallucination is None:
+        details = error or "no verdict in LLM answer"
+    else:
+        details = "" if passed else "LLM detected potential hallucination"
+    results.append(
+        GuardrailResult(
+            passed=passed,
+            check_name="hallucination_check",
+            details=details,
+            latency_ms=latency_ms,
+        )
+    )
+    return results
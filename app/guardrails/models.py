@@ -1,14 +1,18 @@
-from pydantic import BaseModel
+from dataclasses import dataclass
 
 
-class GuardrailResult(BaseModel):
+# Plain slotted dataclasses: built several times per message from trusted internal
+# values, so Pydantic validation would be pure overhead.
+@dataclass(slots=True)
+class GuardrailResult:
     passed: bool
     check_name: str
     details: str = ""
     latency_ms: float = 0.0
 
 
-class GuardrailReport(BaseModel):
+@dataclass(slots=True)
+class GuardrailReport:
     passed: bool
     results: list[GuardrailResult]
     total_latency_ms: float
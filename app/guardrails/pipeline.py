@@ -5,6 +5,7 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
+from collections.abc import Coroutine
 
 from app.guardrails.checks import (
     check_excessive_length,
@@ -30,45 +31,64 @@ async def run_guardrails(
     Returns a GuardrailReport. Errors in individual checks are caught and
     treated as passing (fail open) to avoid blocking the response.
     """
-    start = time.monotonic()
+    start = time.perf_counter_ns()
     results: list[GuardrailResult] = []
 
-    # Always-on deterministic checks
+    # Always-on deterministic checks (trivial string ops — run inline)
     _run_check(results, check_not_empty, reply)
     _run_check(results, check_excessive_length, reply)
     _run_check(results, check_no_raw_tool_json, reply)
 
+    # Heavier checks run concurrently: langdetect / PII regex scans go to worker
+    # threads and overlap with each other and with the LLM checks. Each check
+    # writes into its own slot so the report keeps a stable order.
+    language_results: list[GuardrailResult] = []
+    pii_results: list[GuardrailResult] = []
+    llm_results: list[GuardrailResult] = []
+    pending: list[Coroutine] = []
+
     # Language check (configurable)
     language_enabled = settings is None or getattr(settings, "guardrails_language_check", True)
     if language_enabled:
-        _run_check(results, check_language_match, user_text, reply)
+        pending.append(
+            asyncio.to_thread(_run_check, language_results, check_language_match, user_text, reply)
+        )
 
     # PII check (configurable)
     pii_enabled = settings is None or getattr(settings, "guardrails_pii_check", True)
     if pii_enabled:
-        _run_check(results, check_no_pii, user_text, reply)
+        pending.append(asyncio.to_thread(_run_check, pii_results, check_no_pii, user_text, reply))
 
     # LLM-based checks (opt-in via guardrails_llm_checks, require ollama_client)
     llm_checks_enabled = settings is not None and getattr(settings, "guardrails_llm_checks", False)
     if llm_checks_enabled and ollama_client is not None:
-        from app.guardrails.checks import check_hallucination, check_tool_coherence
+        from app.guardrails.checks import check_combined_llm
 
         llm_timeout = getattr(settings, "guardrails_llm_timeout", 3.0) if settings else 3.0
-        if tool_calls_used:
-            await _run_async_check(
-                results,
-                "tool_coherence",
-                check_tool_coherence(user_text, reply, ollama_client),
+        # One Ollama round trip judges both coherence (only when tools ran) and hallucination
+        llm_names = (
+            ("tool_coherence", "hallucination_check")
+            if tool_calls_used
+            else ("hallucination_check",)
+        )
+        pending.append(
+            _run_async_check(
+                llm_results,
+                llm_names,
+                check_combined_llm(
+                    user_text, reply, ollama_client, include_coherence=tool_calls_used
+                ),
                 timeout=llm_timeout,
             )
-        await _run_async_check(
-            results,
-            "hallucination_check",
-            check_hallucination(user_text, reply, ollama_client),
-            timeout=llm_timeout,
         )
 
-    total_latency_ms = (time.monotonic() - start) * 1000
+    if pending:
+        await asyncio.gather(*pending)
+    results.extend(language_results)
+    results.extend(pii_results)
+    results.extend(llm_results)
+
+    total_latency_ms = (time.perf_counter_ns() - start) / 1_000_000
     passed = all(r.passed for r in results)
 
     if not passed:
@@ -101,33 +121,44 @@ def _run_check(results: list[GuardrailResult], fn, *args) -> None:
 
 async def _run_async_check(
     results: list[GuardrailResult],
-    check_name: str,
+    check_name: str | tuple[str, ...],
     coro,
     timeout: float = 0.5,
 ) -> None:
-    """Run an async check coroutine with a timeout. Fail open on error or timeout."""
+    """Run an async check coroutine with a timeout. Fail open on error or timeout.
+
+    The coroutine may return a single GuardrailResult or a list of them (batched
+    checks); check_name then lists every check it covers, for the fail-open rows.
+    """
+    names = (check_name,) if isinstance(check_name, str) else check_name
     try:
-        result = await asyncio.wait_for(coro, timeout=timeout)
-        results.append(result)
+        async with asyncio.timeout(timeout):
+            result = await coro
+        if isinstance(result, list):
+            results.extend(result)
+        else:
+            results.append(result)
     except TimeoutError:
         logger.warning(
             "Async guardrail check '%s' timed out (>%.0fms)",
-            check_name,
+            ",".join(names),
             timeout * 1000,
         )
-        results.append(
+        results.extend(
             GuardrailResult(
                 passed=True,
-                check_name=check_name,
+                check_name=name,
                 details="check timed out",
             )
+            for name in names
         )
     except Exception as e:
-        logger.warning("Async guardrail check '%s' raised: %s", check_name, e)
-        results.append(
+        logger.warning("Async guardrail check '%s' raised: %s", ",".join(names), e)
+        results.extend(
             GuardrailResult(
                 passed=True,
-                check_name=check_name,
+                check_name=name,
                 details=f"check raised exception: {e}",
             )
+            for name in names
         )
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Request, Response
 
 from app.models import HealthResponse, OllamaCheck
 
@@ -12,3 +12,19 @@ async def health(request: Request) -> HealthResponse:
         status="ok" if ollama_ok else "degraded",
         checks=OllamaCheck(available=ollama_ok),
     )
+
+
+@router.get("/health/live")
+async def health_live() -> dict:
+    """Liveness: the process is up and serving requests."""
+    return {"status": "ok"}
+
+
+@router.get("/health/ready")
+async def health_ready(request: Request, response: Response) -> dict:
+    """Readiness: 503 until deferred startup (MCP, backfills, warmup) has finished."""
+    ready = getattr(request.app.state, "ready", None)
+    if ready is not None and not ready.is_set():
+        response.status_code = 503
+        return {"status": "starting"}
+    return {"status": "ready"}
@@ -1,7 +1,15 @@
 from __future__ import annotations
 
+import asyncio
+import dataclasses
+import functools
+import hashlib
+import json
 import logging
 import re
+import time
+import weakref
+from collections import OrderedDict
 from dataclasses import dataclass
 
 import httpx
@@ -10,6 +18,50 @@ from app.models import ChatMessage
 
 logger = logging.getLogger(__name__)
 
+_TOOL_JSON_CACHE_MAX = 512
+
+# Bare integers ("-1", "3600") are seconds for Ollama, but only when sent as a JSON number:
+# a string keep_alive goes through Go's time.ParseDuration, which rejects "-1" (no unit)
+_KEEP_ALIVE_SECONDS_RE = re.compile(r"-?\d+")
+
+_THINK_OPEN = "<think>"
+_THINK_CLOSE = "</think>"
+
+
+def _strip_think(content: str) -> str:
+    """Strip deepseek/qwen reasoning blocks (<think>...</think>) in a single forward scan.
+
+    Complete blocks are removed together with the newlines that follow them. Edge-cases
+    when the LLM gets truncated exactly after opening or closing tags: everything up to an
+    orphan </think> and everything from an orphan <think> onwards is dropped.
+    """
+    if _THINK_OPEN not in content and _THINK_CLOSE not in content:
+        return content.strip()
+
+    parts: list[str] = []
+    pos = 0
+    while True:
+        start = content.find(_THINK_OPEN, pos)
+        if start == -1:
+            break
+        end = content.find(_THINK_CLOSE, start + len(_THINK_OPEN))
+        if end == -1:
+            break  # unterminated block: handled as an orphan <think> below
+        parts.append(content[pos:start])
+        pos = end + len(_THINK_CLOSE)
+        while content.startswith("\n", pos):
+            pos += 1
+    parts.append(content[pos:])
+    content = "".join(parts)
+
+    close = content.rfind(_THINK_CLOSE)
+    if close != -1:
+        content = content[close + len(_THINK_CLOSE) :]
+    open_ = content.find(_THINK_OPEN)
+    if open_ != -1:
+        content = content[:open_]
+    return content.strip()
+
 
 @dataclass
 class ChatResponse:
@@ -27,21 +79,89 @@ class OllamaClient:
         http_client: httpx.AsyncClient,
         base_url: str,
         model: str,
+        response_cache_size: int = 256,
+        response_cache_ttl: float = 300.0,
+        keep_alive: str | None = None,
     ):
         self._http = http_client
         self._base_url = base_url.rstrip("/")
+        self._chat_url = f"{self._base_url}/api/chat"
+        self._embed_url = f"{self._base_url}/api/embed"
+        self._generate_url = f"{self._base_url}/api/generate"
+        self._tags_url = f"{self._base_url}/api/tags"
         self._model = model
+        # Ollama unloads idle models after 5 min by default; sent on every request when set
+        self._keep_alive: str | int | None = keep_alive
+        if keep_alive is not None and _KEEP_ALIVE_SECONDS_RE.fullmatch(keep_alive.strip()):
+            self._keep_alive = int(keep_alive)
+        # Exact-match cache for opt-in chat() calls (LLM-as-judge prompts): key → (expires_at, content)
+        self._response_cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._response_cache_size = response_cache_size
+        self._response_cache_ttl = response_cache_ttl
+        # Single-flight: identical requests already on the wire → the Future of the first one
+        self._inflight: dict[str, asyncio.Future[ChatResponse]] = {}
+        # Wire dicts of live ChatMessages, keyed by id(): history messages are resent on
+        # every turn/iteration, so their dicts are built once. Entries die with the message.
+        self._message_dicts: dict[int, tuple[weakref.ref, tuple, dict]] = {}
+        # Serialized tool schemas, keyed by id(): schemas come from the executor's long-lived
+        # tools map, so each one is encoded once. Holds the dict so its id can't be reused.
+        self._tool_json: dict[int, tuple[dict, str]] = {}
+
+    def _request_key(
+        self,
+        messages: list[ChatMessage],
+        model: str,
+        think: bool | None,
+        tools: list[dict] | None = None,
+    ) -> str:
+        raw = repr(
+            (
+                model,
+                think,
+                self._tools_json(tools) if tools else None,
+                [(m.role, m.content, m.images, m.tool_calls) for m in messages],
+            )
+        )
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    def _tools_json(self, tools: list[dict]) -> str:
+        parts = []
+        for schema in tools:
+            cached = self._tool_json.get(id(schema))
+            if cached is None or cached[0] is not schema:
+                if len(self._tool_json) >= _TOOL_JSON_CACHE_MAX:
+                    self._tool_json.clear()  # tools map was rebuilt (hot reload); start over
+                cached = (schema, json.dumps(schema, ensure_ascii=False))
+                self._tool_json[id(schema)] = cached
+            parts.append(cached[1])
+        return "[" + ",".join(parts) + "]"
+
+    def _message_dict(self, m: ChatMessage) -> dict:
+        key = id(m)
+        cached = self._message_dicts.get(key)
+        if cached is not None:
+            ref, fields, d = cached
+            # Reuse only while the message object and its fields are untouched
+            if ref() is m and all(
+                a is b
+                for a, b in zip(fields, (m.role, m.content, m.images, m.tool_calls), strict=True)
+            ):
+                return d
+
+        d = {"role": m.role, "content": m.content}
+        if m.images:
+            d["images"] = m.images
+        if m.tool_calls:
+            d["tool_calls"] = m.tool_calls
+        ref = weakref.ref(m, functools.partial(self._drop_message_dict, key))
+        self._message_dicts[key] = (ref, (m.role, m.content, m.images, m.tool_calls), d)
+        return d
+
+    def _drop_message_dict(self, key: int, _ref: weakref.ref) -> None:
+        self._message_dicts.pop(key, None)
 
     def _build_message_dicts(self, messages: list[ChatMessage]) -> list[dict]:
-        msg_dicts = []
-        for m in messages:
-            d: dict = {"role": m.role, "content": m.content}
-            if m.images:
-                d["images"] = m.images
-            if m.tool_calls:
-                d["tool_calls"] = m.tool_calls
-            msg_dicts.append(d)
-        return msg_dicts
+        return [self._message_dict(m) for m in messages]
 
     async def chat_with_tools(
         self,
@@ -50,7 +170,42 @@ class OllamaClient:
         model: str | None = None,
         think: bool | None = None,
     ) -> ChatResponse:
-        url = f"{self._base_url}/api/chat"
+        """POST /api/chat. Concurrent identical requests share a single round trip."""
+        key = self._request_key(messages, model or self._model, think, tools)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            try:
+                return dataclasses.replace(await asyncio.shield(inflight))
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise  # this caller was cancelled, not the request it joined
+                # The first caller was cancelled mid-flight: issue our own request
+
+        fut: asyncio.Future[ChatResponse] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            response = await self._post_chat(messages, tools, model, think)
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except Exception as e:
+            fut.set_exception(e)
+            fut.exception()  # mark retrieved: there may be no other waiter
+            raise
+        else:
+            fut.set_result(response)
+            return response
+        finally:
+            if self._inflight.get(key) is fut:
+                del self._inflight[key]
+
+    async def _post_chat(
+        self,
+        messages: list[ChatMessage],
+        tools: list[dict] | None,
+        model: str | None,
+        think: bool | None,
+    ) -> ChatResponse:
         use_model = model or self._model
 
         payload: dict = {
@@ -58,6 +213,8 @@ class OllamaClient:
             "messages": self._build_message_dicts(messages),
             "stream": False,
         }
+        if self._keep_alive is not None:
+            payload["keep_alive"] = self._keep_alive
 
         if tools:
             # think: True is incompatible with tools in qwen3
@@ -69,7 +226,7 @@ class OllamaClient:
             # Only enable thinking for default chat model without tools
             payload["think"] = True
 
-        resp = await self._http.post(url, json=payload)
+        resp = await self._http.post(self._chat_url, json=payload)
         if resp.status_code == 404:
             logger.error(
                 "Ollama model '%s' not found — download it with: "
@@ -91,11 +248,7 @@ class OllamaClient:
 
         if content:
             logger.debug("LLM raw response: %s", content[:500])
-            # Strip deepseek/qwen reasoning blocks: <think>...</think>
-            content = re.sub(r"<think>.*?</think>\n*", "", content, flags=re.DOTALL)
-            # Edge-cases if the LLM gets truncated exactly after opening or closing tags
-            content = content.split("</think>")[-1]
-            content = content.split("<think>")[0].strip()
+            content = _strip_think(content)
 
         logger.debug("LLM processed response: %s", content[:500] if content else "(tool_calls)")
         return ChatResponse(
@@ -112,8 +265,32 @@ class OllamaClient:
         messages: list[ChatMessage],
         model: str | None = None,
         think: bool | None = None,
+        cache: bool = False,
     ) -> str:
+        """Plain chat completion returning only the content.
+
+        With cache=True, identical (model, think, messages) requests within the TTL are
+        answered from an in-process LRU instead of re-running inference. Only use it for
+        deterministic-ish prompts (guardrail judgments), never for conversational replies.
+        """
+        if not cache or self._response_cache_size <= 0:
+            response = await self.chat_with_tools(messages, tools=None, model=model, think=think)
+            return response.content
+
+        key = self._request_key(messages, model or self._model, think)
+        hit = self._response_cache.get(key)
+        now = time.monotonic()
+        if hit is not None:
+            if hit[0] > now:
+                self._response_cache.move_to_end(key)
+                return hit[1]
+            del self._response_cache[key]
+
         response = await self.chat_with_tools(messages, tools=None, model=model, think=think)
+        self._response_cache[key] = (time.monotonic() + self._response_cache_ttl, response.content)
+        self._response_cache.move_to_end(key)
+        while len(self._response_cache) > self._response_cache_size:
+            self._response_cache.popitem(last=False)
         return response.content
 
     async def embed(
@@ -122,10 +299,11 @@ class OllamaClient:
         model: str | None = None,
     ) -> list[list[float]]:
         """Generate embeddings for a batch of texts via POST /api/embed."""
-        url = f"{self._base_url}/api/embed"
         use_model = model or self._model
-        payload = {"model": use_model, "input": texts}
-        resp = await self._http.post(url, json=payload)
+        payload: dict = {"model": use_model, "input": texts}
+        if self._keep_alive is not None:
+            payload["keep_alive"] = self._keep_alive
+        resp = await self._http.post(self._embed_url, json=payload)
         if resp.status_code == 404:
             logger.error(
                 "Ollama embedding model '%s' not found — download it with: "
@@ -137,10 +315,23 @@ class OllamaClient:
         data = resp.json()
         return data["embeddings"]
 
+    async def preload(self, model: str | None = None) -> None:
+        """Load a generative model into memory without running inference.
+
+        POST /api/generate with no prompt only loads the weights (no prompt eval, no KV
+        cache fill) and starts the keep_alive timer. Not valid for embedding-only models:
+        warm those with a tiny embed() instead.
+        """
+        payload: dict = {"model": model or self._model}
+        if self._keep_alive is not None:
+            payload["keep_alive"] = self._keep_alive
+        resp = await self._http.post(self._generate_url, json=payload)
+        resp.raise_for_status()
+
     async def is_available(self) -> bool:
         try:
             resp = await self._http.get(
-                f"{self._base_url}/api/tags",
+                self._tags_url,
                 timeout=5.0,
             )
             return resp.status_code == 200
@@ -1,4 +1,7 @@
+import asyncio
+import contextlib
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from pathlib import Path
 
@@ -17,16 +20,111 @@ from app.llm.client import OllamaClient
 from app.logging_config import configure_logging
 from app.memory.daily_log import DailyLog
 from app.memory.markdown import MemoryFile
-from app.models import ChatMessage
+from app.skills.executor import close_audit_trail, warmup_security
 from app.skills.registry import SkillRegistry
 from app.skills.tools import register_builtin_tools
 from app.webhook.rate_limiter import RateLimiter
 from app.webhook.router import router as webhook_router
 from app.webhook.router import wait_for_in_flight
-from app.whatsapp.client import WhatsAppClient
+from app.whatsapp.client import GRAPH_API_URL, WhatsAppClient
 
 logger = logging.getLogger(__name__)
 
+# Startup bounds for the Ollama warmup (seconds)
+_OLLAMA_PROBE_TIMEOUT = 2.0
+_WARMUP_TIMEOUT = 30.0
+
+
+async def _prewarm_connections(http_client: httpx.AsyncClient, settings: Settings) -> None:
+    """Open pooled sockets to Ollama and the Graph API so the first webhook skips TCP/TLS setup.
+
+    The responses themselves are irrelevant (the Graph API answers 400 without a token);
+    what matters is that each connection is returned to the keep-alive pool.
+    """
+    ollama_root = settings.ollama_base_url.rstrip("/") + "/"
+    graph_url = f"{GRAPH_API_URL}/{settings.whatsapp_phone_number_id}"
+    results = await asyncio.gather(
+        *(http_client.head(ollama_root, timeout=5.0) for _ in range(4)),
+        *(http_client.head(graph_url, timeout=5.0) for _ in range(2)),
+        return_exceptions=True,
+    )
+    failed = sum(isinstance(r, BaseException) for r in results)
+    if failed:
+        logger.debug("Connection prewarm: %d/%d requests failed", failed, len(results))
+
+
+async def _deferred_init(app: FastAPI) -> None:
+    """Startup work that may take tens of seconds, run in the background by lifespan.
+
+    Every step is best-effort: a failure is logged and the app still becomes ready
+    (degraded) instead of never passing its readiness probe.
+    """
+    settings = app.state.settings
+    repository = app.state.repository
+    ollama_client = app.state.ollama_client
+
+    async def _load_transcriber() -> None:
+        app.state.transcriber = await asyncio.to_thread(
+            Transcriber,
+            model_size=settings.whisper_model,
+            device=settings.whisper_device,
+            compute_type=settings.whisper_compute_type,
+        )
+
+    # Whisper load (disk/CPU in a worker thread) overlaps MCP server spawn, socket prewarm
+    # and the security layer (policy YAML + audit log tail), so the first tool call is warm
+    startup_results = await asyncio.gather(
+        _prewarm_connections(app.state.http_client, settings),
+        app.state.mcp_manager.initialize(),
+        _load_transcriber(),
+        warmup_security(),
+        return_exceptions=True,
+    )
+    for label, result in zip(
+        ("Connection prewarm", "MCP initialization", "Whisper model load", "Security warmup"),
+        startup_results,
+        strict=True,
+    ):
+        if isinstance(result, BaseException):
+            logger.error("%s failed at startup", label, exc_info=result)
+
+    # Backfill embeddings at startup
+    if app.state.vec_available and settings.semantic_search_enabled:
+        from app.embeddings.indexer import backfill_embeddings, backfill_note_embeddings
+
+        # Independent and I/O-bound on Ollama: overlap their round trips on the shared pool
+        backfill_results = await asyncio.gather(
+            backfill_embeddings(repository, ollama_client, settings.embedding_model),
+            backfill_note_embeddings(repository, ollama_client, settings.embedding_model),
+            return_exceptions=True,
+        )
+        for label, result in zip(("message", "note"), backfill_results, strict=True):
+            if isinstance(result, BaseException):
+                logger.warning("Embedding backfill (%s) failed at startup", label, exc_info=result)
+
+    # Warmup: pre-load Ollama models to avoid cold-start on first message. Probe first so
+    # an unreachable Ollama doesn't hold readiness hostage to the 600 s request timeout.
+    try:
+        async with asyncio.timeout(_OLLAMA_PROBE_TIMEOUT):
+            reachable = await ollama_client.is_available()
+    except TimeoutError:
+        reachable = False
+    if not reachable:
+        logger.warning("Ollama not reachable, skipping model warmup")
+    else:
+        try:
+            async with asyncio.timeout(_WARMUP_TIMEOUT):
+                await asyncio.gather(
+                    ollama_client.embed(["warmup"], model=settings.embedding_model),
+                    ollama_client.preload(),
+                )
+            logger.info("Ollama models warmed up")
+        except Exception:
+            logger.warning("Model warmup failed (non-critical)", exc_info=True)
+
+    app.state.ready.set()
+    logger.info("Deferred startup complete, app is ready")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -34,7 +132,29 @@ async def lifespan(app: FastAPI):
 
     configure_logging(level=settings.log_level, json_format=settings.log_json)
 
-    http_client = httpx.AsyncClient(timeout=httpx.Timeout(600.0, connect=10.0))
+    # Every asyncio.to_thread() lands in the loop's default executor; the stdlib default
+    # (min(32, cpu_count + 4) workers) queues audit writes and file I/O behind slow
+    # blocking calls (web search, Whisper) when many users are active at once.
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.thread_pool_size, thread_name_prefix="wasap-io")
+    )
+
+    # Shared client for Ollama + WhatsApp: keep idle sockets alive between user turns so
+    # each LLM/embedding call reuses a warm connection. HTTP/2 is negotiated via ALPN on
+    # HTTPS hosts (WhatsApp Graph API); plain-http Ollama stays on pooled HTTP/1.1.
+    # retries=1 only retries failed connection attempts, never a sent request.
+    http_client = httpx.AsyncClient(
+        timeout=httpx.Timeout(600.0, connect=10.0),
+        transport=httpx.AsyncHTTPTransport(
+            http2=True,
+            retries=1,
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive,
+                keepalive_expiry=settings.http_keepalive_expiry,
+            ),
+        ),
+    )
 
     # Database
     Path(settings.database_path).parent.mkdir(parents=True, exist_ok=True)
@@ -68,6 +188,9 @@ async def lifespan(app: FastAPI):
         http_client=http_client,
         base_url=settings.ollama_base_url,
         model=settings.ollama_model,
+        response_cache_size=settings.llm_response_cache_size,
+        response_cache_ttl=settings.llm_response_cache_ttl,
+        keep_alive=settings.ollama_keep_alive,
     )
     app.state.repository = repository
 
@@ -92,22 +215,22 @@ async def lifespan(app: FastAPI):
         repository=repository,
         max_messages=settings.conversation_max_messages,
     )
-    app.state.transcriber = Transcriber(
-        model_size=settings.whisper_model,
-        device=settings.whisper_device,
-        compute_type=settings.whisper_compute_type,
-    )
+    # Whisper model loads in _deferred_init; audio messages get a retry notice until then
+    app.state.transcriber = None
 
     # MCP Manager (initialized before skills so expand tools can reference it)
     from app.mcp.manager import McpManager
 
-    mcp_manager = McpManager(config_path=settings.mcp_config_path)
-    await mcp_manager.initialize()
+    mcp_manager = McpManager(
+        config_path=settings.mcp_config_path,
+        lazy_connect=settings.mcp_lazy_connect,
+        speculative_fetch_fallback=settings.mcp_speculative_fetch_fallback,
+    )
     app.state.mcp_manager = mcp_manager
 
     # Skills
     skill_registry = SkillRegistry(skills_dir=settings.skills_dir)
-    skill_registry.load_skills()
+    await asyncio.to_thread(skill_registry.load_skills)
 
     from app.skills.tools import conversation_tools
 
@@ -132,7 +255,12 @@ async def lifespan(app: FastAPI):
 
     from app.skills.tools.scheduler_tools import set_repository, set_scheduler
 
-    scheduler = AsyncIOScheduler()
+    # All jobs are coroutines, so the scheduler's default AsyncIOExecutor runs them on the
+    # loop. coalesce collapses runs missed while the process was down into one, and the
+    # grace period keeps a reminder that fires a few seconds late from being dropped.
+    scheduler = AsyncIOScheduler(
+        job_defaults={"coalesce": True, "max_instances": 1, "misfire_grace_time": 60}
+    )
     scheduler.start()
     set_scheduler(scheduler, app.state.whatsapp_client)
     set_repository(repository)
@@ -206,82 +334,79 @@ async def lifespan(app: FastAPI):
         replace_existing=True,
     )
     # Also run once at startup to clean up pre-existing stale corrections
-    import asyncio as _asyncio
+    _startup_cleanup_task = asyncio.create_task(_cleanup_self_corrections())
+
+    # Model residency heartbeat: a preload + tiny embed refresh Ollama's keep_alive timer on
+    # hosts that cap or ignore long keep_alive values, so the next message skips the reload
+    if settings.ollama_heartbeat_interval > 0:
 
-    _startup_cleanup_task = _asyncio.create_task(_cleanup_self_corrections())
+        async def _ollama_heartbeat() -> None:
+            results = await asyncio.gather(
+                app.state.ollama_client.preload(),
+                app.state.ollama_client.embed(["ka"], model=settings.embedding_model),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    logger.debug("Ollama heartbeat failed", exc_info=result)
+
+        scheduler.add_job(
+            _ollama_heartbeat,
+            trigger="interval",
+            seconds=settings.ollama_heartbeat_interval,
+            id="ollama_heartbeat",
+            replace_existing=True,
+        )
 
     # Memory file watcher (bidirectional sync)
     memory_watcher = None
     if settings.memory_file_watch_enabled:
         try:
-            import asyncio
-
             from app.memory.watcher import MemoryWatcher
 
             memory_watcher = MemoryWatcher(
                 memory_file=memory_file,
                 repository=repository,
-                loop=asyncio.get_event_loop(),
+                loop=asyncio.get_running_loop(),
             )
             memory_file.set_watcher(memory_watcher)
             memory_watcher.start()
         except ImportError:
-            import logging
-
-            logging.getLogger(__name__).warning(
+            logger.warning(
                 "watchdog not installed, MEMORY.md file watching disabled. "
                 "Install with: pip install watchdog"
             )
     app.state.memory_watcher = memory_watcher
 
-    # Backfill embeddings at startup
-    if vec_available and settings.semantic_search_enabled:
-        from app.embeddings.indexer import backfill_embeddings, backfill_note_embeddings
-
-        try:
-            await backfill_embeddings(
-                repository,
-                app.state.ollama_client,
-                settings.embedding_model,
-            )
-            await backfill_note_embeddings(
-                repository,
-                app.state.ollama_client,
-                settings.embedding_model,
-            )
-        except Exception:
-            import logging
-
-            logging.getLogger(__name__).warning(
-                "Embedding backfill failed at startup", exc_info=True
-            )
-
-    # Warmup: pre-load Ollama models to avoid cold-start on first message
-    try:
-        await asyncio.gather(
-            app.state.ollama_client.embed(["warmup"], model=settings.embedding_model),
-            app.state.ollama_client.chat_with_tools(
-                [ChatMessage(role="user", content="hi")],
-                think=False,
-            ),
-        )
-        logger.info("Ollama models warmed up")
-    except Exception:
-        logger.warning("Model warmup failed (non-critical)", exc_info=True)
+    # Slow startup work (MCP connections, backfills, warmup) runs after the port binds;
+    # /health/ready answers 503 until it finishes.
+    app.state.ready = asyncio.Event()
+    app.state._init_task = asyncio.create_task(_deferred_init(app))
 
     yield
 
+    init_task = app.state._init_task
+    if not init_task.done():
+        init_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await init_task
+    # Stop the scheduler first so no new jobs fire while webhooks drain
+    scheduler.shutdown(wait=False)
     await wait_for_in_flight(timeout=30.0)
+    # In-flight handlers may still call MCP tools or emit spans, so the rest waits for the
+    # drain; the independent teardown steps then overlap instead of running back-to-back.
     if memory_watcher:
         memory_watcher.stop()
-    scheduler.shutdown()
-    await mcp_manager.cleanup()
-    # Flush Langfuse before exit so buffered spans are not lost
+    # Audit records are queued and written in batches: flush them before the process exits
+    teardown = [mcp_manager.cleanup(), close_audit_trail()]
+    # Flush Langfuse before exit so buffered spans are not lost (blocking client → thread)
     trace_recorder = getattr(app.state, "trace_recorder", None)
     if trace_recorder is not None and trace_recorder.langfuse is not None:
-        trace_recorder.langfuse.flush()
-    await db_conn.close()
-    await http_client.aclose()
+        teardown.append(asyncio.to_thread(trace_recorder.langfuse.flush))
+    for result in await asyncio.gather(*teardown, return_exceptions=True):
+        if isinstance(result, BaseException):
+            logger.warning("Shutdown step failed", exc_info=result)
+    await asyncio.gather(db_conn.close(), http_client.aclose(), return_exceptions=True)
 
 
 app = FastAPI(title="LocalForge", lifespan=lifespan)
@@ -4,7 +4,9 @@ import asyncio
 import json
 import logging
 import os
+from collections.abc import Mapping
 from contextlib import AsyncExitStack
+from types import MappingProxyType
 from typing import TYPE_CHECKING
 
 from mcp import ClientSession, StdioServerParameters
@@ -22,6 +24,12 @@ logger = logging.getLogger(__name__)
 MCP_TOOL_TIMEOUT = 30.0
 # Timeout for connecting to an MCP server (seconds)
 MCP_CONNECT_TIMEOUT = 30.0
+# mcp-fetch tools that can replace a failed Puppeteer call, in order of preference
+_FETCH_FALLBACK_PREFERENCE = ("fetch_markdown", "fetch", "fetch_txt")
+
+# Environment inherited by stdio servers, snapshotted once at import. Read-only so a
+# per-server override can never leak into the next server's environment.
+_BASE_ENV = MappingProxyType(dict(os.environ))
 
 
 def _make_handler(session: ClientSession, tool_name: str):
@@ -34,10 +42,8 @@ def _make_handler(session: ClientSession, tool_name: str):
 
     async def handler(**kwargs: object) -> str:
         try:
-            res = await asyncio.wait_for(
-                session.call_tool(tool_name, arguments=kwargs),
-                timeout=MCP_TOOL_TIMEOUT,
-            )
+            async with asyncio.timeout(MCP_TOOL_TIMEOUT):
+                res = await session.call_tool(tool_name, arguments=kwargs)
             text_parts: list[str] = []
             for content in res.content:
                 if content.type == "text":
@@ -57,40 +63,102 @@ def _make_handler(session: ClientSession, tool_name: str):
     return handler
 
 
+# path → (mtime_ns, size, parsed config): re-initializing against an unchanged file
+# (hot reload, tests building many managers) skips the read and parse
+_CONFIG_CACHE: dict[str, tuple[int, int, dict]] = {}
+
+
+def _read_config(path: str) -> dict | None:
+    """Read the MCP config file (blocking; called via to_thread). None if it doesn't exist."""
+    try:
+        st = os.stat(path)
+        cached = _CONFIG_CACHE.get(path)
+        if cached is None or cached[:2] != (st.st_mtime_ns, st.st_size):
+            with open(path) as f:
+                cached = (st.st_mtime_ns, st.st_size, json.load(f))
+            _CONFIG_CACHE[path] = cached
+    except FileNotFoundError:
+        return None
+    data = cached[2]
+    # Fresh per-server dicts: managers rewrite "tools"/"enabled" on their own copy
+    return {**data, "servers": {n: dict(c) for n, c in data.get("servers", {}).items()}}
+
+
+def _write_config(path: str, text: str) -> None:
+    """Atomically replace the MCP config file (blocking; called via to_thread)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+    _CONFIG_CACHE.pop(path, None)
+
+
+def _server_env(cfg: dict) -> dict[str, str]:
+    """Inherited environment plus the server's ``env`` overrides from the config."""
+    env = dict(_BASE_ENV)
+    env.update(cfg.get("env") or {})
+    return env
+
+
 class McpManager:
     """Manages connections to multiple MCP servers.
 
     Uses per-server AsyncExitStack instances to support hot-add and
     hot-remove of individual servers without restarting the process.
+
+    With ``lazy_connect``, servers whose config carries a ``tools`` manifest (written
+    back after their first successful connection) are not spawned at startup: their
+    tools are registered as stubs and the server connects on the first tool call.
     """
 
-    def __init__(self, config_path: str = "data/mcp_servers.json"):
+    def __init__(
+        self,
+        config_path: str = "data/mcp_servers.json",
+        lazy_connect: bool = True,
+        speculative_fetch_fallback: bool = False,
+    ):
         self.config_path = config_path
+        self._lazy_connect = lazy_connect
+        # Start the mcp-fetch fallback alongside Puppeteer calls instead of after they fail
+        self.speculative_fetch_fallback = speculative_fetch_fallback
         # Per-server stacks allow individual connect/disconnect
         self._server_stacks: dict[str, AsyncExitStack] = {}
         self._sessions: dict[str, ClientSession] = {}
         self._tools: dict[str, ToolDefinition] = {}
+        # server name → its tool names, in registration order (dict used as an ordered set).
+        # Maintained by _add_tool/_remove_server_tools so per-server lookups skip full scans.
+        self._tools_by_server: dict[str, dict[str, None]] = {}
         self._server_descriptions: dict[str, str] = {}
         # Keep raw server configs for save/reload
         self._server_configs: dict[str, dict] = {}
         # Tracks which web-fetching backend is active: "puppeteer" | "mcp-fetch" | "unavailable"
         self._fetch_mode: str = "unavailable"
+        # Derived views rebuilt only when the tool set changes (see _tools_changed)
+        self._ollama_tools_cache: list[dict] | None = None
+        self._summary_cache: str | None = None
+        self._fetch_fallback_cache: str | None = None
+        self._fetch_fallback_resolved = False
+        # Servers registered from their tools manifest but not spawned yet
+        self._lazy_servers: set[str] = set()
+        self._connect_locks: dict[str, asyncio.Lock] = {}
+        # A server's live tool list differs from the manifest in its config → persist
+        self._manifest_dirty = False
 
     async def initialize(self) -> None:
         """Load config and connect to all enabled servers."""
-        if not os.path.exists(self.config_path):
-            logger.warning("MCP config not found at %s", self.config_path)
-            return
-
         try:
-            with open(self.config_path) as f:
-                data = json.load(f)
+            data = await asyncio.to_thread(_read_config, self.config_path)
         except Exception as e:
             logger.error("Failed to load MCP config: %s", e)
             return
+        if data is None:
+            logger.warning("MCP config not found at %s", self.config_path)
+            return
 
         servers_config = data.get("servers", {})
 
+        enabled: list[str] = []
         for name, cfg in servers_config.items():
             # Always track the config so disabled servers are preserved on save
             self._server_configs[name] = cfg
@@ -100,10 +168,28 @@ class McpManager:
             if not cfg.get("enabled", True):
                 logger.info("MCP server %s is disabled, skipping", name)
                 continue
-
-            await self._connect_server(name, cfg)
+            if self._lazy_connect and cfg.get("tools"):
+                self._register_lazy_server(name, cfg["tools"])
+                continue
+            enabled.append(name)
+
+        # Servers are independent: spawn/connect them concurrently so startup takes
+        # max(connect time) instead of the sum. _connect_server already logs and
+        # swallows its own failures; return_exceptions guards anything unexpected.
+        outcomes = await asyncio.gather(
+            *(self._connect_server(name, servers_config[name]) for name in enabled),
+            return_exceptions=True,
+        )
+        for name, outcome in zip(enabled, outcomes, strict=True):
+            if isinstance(outcome, BaseException):
+                logger.error("Failed to connect to MCP server %s: %s", name, outcome)
+        for name in (*enabled, *self._lazy_servers):
             self._update_dynamic_categories(name)
 
+        # Record freshly discovered tool lists so the next start can stay lazy
+        if self._manifest_dirty:
+            await self._persist_config()
+
         # Invalidate cache once after all servers are loaded
         self._invalidate_tools_cache()
 
@@ -112,8 +198,9 @@ class McpManager:
 
         if self._tools:
             logger.info(
-                "MCP initialized: %d server(s), %d tool(s), fetch_mode=%s",
+                "MCP initialized: %d server(s) connected, %d lazy, %d tool(s), fetch_mode=%s",
                 len(self._sessions),
+                len(self._lazy_servers),
                 len(self._tools),
                 self._fetch_mode,
             )
@@ -134,27 +221,24 @@ class McpManager:
 
             if server_type == "http":
                 url = cfg["url"]
-                transport = await asyncio.wait_for(
-                    server_stack.enter_async_context(streamable_http_client(url)),
-                    timeout=MCP_CONNECT_TIMEOUT,
-                )
+                async with asyncio.timeout(MCP_CONNECT_TIMEOUT):
+                    transport = await server_stack.enter_async_context(streamable_http_client(url))
                 # streamable_http_client yields (read, write, get_session_id)
                 read, write, _ = transport
             else:
                 server_params = StdioServerParameters(
                     command=cfg["command"],
                     args=cfg.get("args", []),
-                    env={**os.environ, **(cfg.get("env") or {})},
-                )
-                transport = await asyncio.wait_for(
-                    server_stack.enter_async_context(stdio_client(server_params)),
-                    timeout=MCP_CONNECT_TIMEOUT,
+                    env=_server_env(cfg),
                 )
+                async with asyncio.timeout(MCP_CONNECT_TIMEOUT):
+                    transport = await server_stack.enter_async_context(stdio_client(server_params))
                 read, write = transport  # type: ignore[misc]
 
             session = await server_stack.enter_async_context(ClientSession(read, write))
 
-            await asyncio.wait_for(session.initialize(), timeout=MCP_CONNECT_TIMEOUT)
+            async with asyncio.timeout(MCP_CONNECT_TIMEOUT):
+                await session.initialize()
 
             self._server_stacks[name] = server_stack
             self._sessions[name] = session
@@ -176,15 +260,25 @@ class McpManager:
     async def _load_tools(self, server_name: str, session: ClientSession) -> None:
         """Fetch tools from the server and register them as ToolDefinitions."""
         try:
-            result = await asyncio.wait_for(session.list_tools(), timeout=MCP_CONNECT_TIMEOUT)
+            async with asyncio.timeout(MCP_CONNECT_TIMEOUT):
+                result = await session.list_tools()
         except Exception as e:
             logger.error("Failed to list tools for server %s: %s", server_name, e)
             return
 
+        # Servers load concurrently (see initialize), but there is no await between the
+        # collision check and the insert below, so no lock is needed around this loop.
+        live_names = {tool.name for tool in result.tools}
+        server_index = self._tools_by_server.get(server_name, {})
+        for stale in [k for k in server_index if k not in live_names]:
+            del server_index[stale]  # stub from an outdated manifest
+            del self._tools[stale]
+
         for tool in result.tools:
-            # Detect name collisions
-            if tool.name in self._tools:
-                existing = self._tools[tool.name].skill_name
+            # Detect name collisions (a stub of this same server is simply replaced)
+            existing_tool = self._tools.get(tool.name)
+            if existing_tool is not None and existing_tool.server_name != server_name:
+                existing = existing_tool.skill_name
                 logger.warning(
                     "MCP tool name collision: '%s' from mcp::%s overwrites %s",
                     tool.name,
@@ -192,15 +286,98 @@ class McpManager:
                     existing,
                 )
 
-            tool_def = ToolDefinition(
-                name=tool.name,
-                description=tool.description or "",
-                parameters=tool.inputSchema,
-                handler=_make_handler(session, tool.name),
-                skill_name=f"mcp::{server_name}",
+            self._add_tool(
+                ToolDefinition(
+                    name=tool.name,
+                    description=tool.description or "",
+                    parameters=tool.inputSchema,
+                    handler=_make_handler(session, tool.name),
+                    skill_name=f"mcp::{server_name}",
+                )
+            )
+        self._tools_changed()
+
+        manifest = [
+            {"name": t.name, "description": t.description, "parameters": t.parameters}
+            for t in (self._tools[tool.name] for tool in result.tools)
+        ]
+        cfg = self._server_configs.get(server_name)
+        if cfg is not None and cfg.get("tools") != manifest:
+            cfg["tools"] = manifest
+            self._manifest_dirty = True
+        if result.tools and logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Registered %d MCP tool(s) from %s: %s",
+                len(result.tools),
+                server_name,
+                ", ".join(tool.name for tool in result.tools),
+            )
+
+    def _add_tool(self, tool_def: ToolDefinition) -> None:
+        previous = self._tools.get(tool_def.name)
+        if previous is not None and previous.server_name != tool_def.server_name:
+            self._tools_by_server.get(previous.server_name or "", {}).pop(tool_def.name, None)
+        self._tools[tool_def.name] = tool_def
+        self._tools_by_server.setdefault(tool_def.server_name or "", {})[tool_def.name] = None
+
+    def _remove_server_tools(self, server_name: str) -> list[str]:
+        names = list(self._tools_by_server.pop(server_name, ()))
+        for name in names:
+            del self._tools[name]
+        return names
+
+    def _register_lazy_server(self, name: str, manifest: list[dict]) -> None:
+        """Register stub tools from a server's cached manifest without spawning it."""
+        for entry in manifest:
+            tool_name = entry.get("name")
+            if not tool_name:
+                continue
+            self._add_tool(
+                ToolDefinition(
+                    name=tool_name,
+                    description=entry.get("description", ""),
+                    parameters=entry.get("parameters") or {"type": "object", "properties": {}},
+                    handler=self._make_lazy_handler(name, tool_name),
+                    skill_name=f"mcp::{name}",
+                )
             )
-            self._tools[tool.name] = tool_def
-            logger.info("Registered MCP tool: %s (server: %s)", tool.name, server_name)
+        self._lazy_servers.add(name)
+        self._tools_changed()
+
+    def _make_lazy_handler(self, server_name: str, tool_name: str):
+        """Stub handler: connect the server on first use, then call the real tool."""
+
+        async def handler(**kwargs: object) -> str:
+            if not await self._ensure_connected(server_name):
+                return f"Error: MCP server {server_name} is unavailable"
+            tool = self._tools.get(tool_name)
+            if tool is None or tool.server_name != server_name or tool.handler is handler:
+                return f"Error: tool {tool_name} is no longer provided by {server_name}"
+            return await tool.handler(**kwargs)
+
+        return handler
+
+    async def _ensure_connected(self, name: str) -> bool:
+        """Connect a lazily registered server once; concurrent first calls share the attempt."""
+        if name in self._sessions:
+            return True
+        if name not in self._lazy_servers:
+            return False
+        lock = self._connect_locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            if name in self._sessions:
+                return True
+            await self._connect_server(name, self._server_configs[name])
+            if name not in self._sessions:
+                return False  # stays lazy: the next call retries
+            self._lazy_servers.discard(name)
+
+        self._invalidate_tools_cache()
+        self._update_dynamic_categories(name)
+        self._register_fetch_category()
+        if self._manifest_dirty:
+            await self._persist_config()
+        return True
 
     # ------------------------------------------------------------------
     # Hot-reload public API
@@ -215,23 +392,41 @@ class McpManager:
         if name in self._sessions:
             return f"Server '{name}' is already connected."
 
-        if "description" in cfg:
-            self._server_descriptions[name] = cfg["description"]
+        # Same lock as _ensure_connected: a lazily registered server with this name must not
+        # be spawned twice by a concurrent first tool call
+        lock = self._connect_locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            if name in self._sessions:
+                return f"Server '{name}' is already connected."
 
-        self._server_configs[name] = cfg
-        tools_before = len(self._tools)
-        await self._connect_server(name, cfg)
+            previous_cfg = self._server_configs.get(name)
+            previous_description = self._server_descriptions.get(name)
+            if "description" in cfg:
+                self._server_descriptions[name] = cfg["description"]
 
-        if name not in self._sessions:
-            self._server_configs.pop(name, None)
-            self._server_descriptions.pop(name, None)
-            return f"Failed to connect to server '{name}'. Check logs for details."
+            self._server_configs[name] = cfg
+            # By name: connecting a lazy server replaces its stubs instead of adding tools
+            tools_before = set(self._tools)
+            await self._connect_server(name, cfg)
 
-        new_tools = len(self._tools) - tools_before
+            if name not in self._sessions:
+                # Restore the lazy registration (if any) so its stubs keep working
+                if previous_cfg is None:
+                    self._server_configs.pop(name, None)
+                else:
+                    self._server_configs[name] = previous_cfg
+                if previous_description is None:
+                    self._server_descriptions.pop(name, None)
+                else:
+                    self._server_descriptions[name] = previous_description
+                return f"Failed to connect to server '{name}'. Check logs for details."
+            self._lazy_servers.discard(name)
+
+        new_tools = len(self._tools.keys() - tools_before)
         self._invalidate_tools_cache()
         self._update_dynamic_categories(name)
         self._register_fetch_category()
-        self._persist_config()
+        await self._persist_config()
 
         return f"Connected '{name}': {new_tools} new tool(s) available."
 
@@ -241,13 +436,12 @@ class McpManager:
         Updates the persisted config (marks as disabled).
         Returns a human-readable status message.
         """
-        if name not in self._sessions:
+        if name not in self._sessions and name not in self._lazy_servers:
             return f"Server '{name}' is not connected."
+        self._lazy_servers.discard(name)
 
         # Remove tools registered by this server
-        to_remove = [k for k, v in self._tools.items() if v.skill_name == f"mcp::{name}"]
-        for k in to_remove:
-            del self._tools[k]
+        to_remove = self._remove_server_tools(name)
 
         # Close per-server stack
         if name in self._server_stacks:
@@ -257,13 +451,13 @@ class McpManager:
                 logger.warning("Error closing MCP server %s: %s", name, e)
             del self._server_stacks[name]
 
-        del self._sessions[name]
+        self._sessions.pop(name, None)
         self._server_descriptions.pop(name, None)
 
         # Mark as disabled in persisted config (don't delete — allows re-enable)
         if name in self._server_configs:
             self._server_configs[name]["enabled"] = False
-        self._persist_config()
+        await self._persist_config()
         self._invalidate_tools_cache()
 
         return f"Disconnected '{name}', removed {len(to_remove)} tool(s)."
@@ -276,7 +470,7 @@ class McpManager:
         # Connected servers
         for name in self._sessions:
             seen.add(name)
-            tool_count = sum(1 for t in self._tools.values() if t.skill_name == f"mcp::{name}")
+            tool_count = len(self._tools_by_server.get(name, ()))
             result.append(
                 {
                     "name": name,
@@ -286,6 +480,18 @@ class McpManager:
                 }
             )
 
+        # Registered from the manifest, spawned on first tool call
+        for name in self._lazy_servers:
+            seen.add(name)
+            result.append(
+                {
+                    "name": name,
+                    "status": "idle",
+                    "tools": len(self._tools_by_server.get(name, ())),
+                    "description": self._server_descriptions.get(name, ""),
+                }
+            )
+
         # Configured but not connected (disabled or failed)
         for name, cfg in self._server_configs.items():
             if name in seen:
@@ -305,6 +511,16 @@ class McpManager:
         """Return the active web-fetch backend: 'puppeteer', 'mcp-fetch', or 'unavailable'."""
         return self._fetch_mode
 
+    def get_fetch_fallback_tool(self) -> str | None:
+        """Return the mcp-fetch tool used when a Puppeteer call fails, or None."""
+        if not self._fetch_fallback_resolved:
+            fetch_tools = self._tools_by_server.get("mcp-fetch", {})
+            self._fetch_fallback_cache = next(
+                (t for t in _FETCH_FALLBACK_PREFERENCE if t in fetch_tools), None
+            )
+            self._fetch_fallback_resolved = True
+        return self._fetch_fallback_cache
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
@@ -326,14 +542,12 @@ class McpManager:
         }
         puppeteer_tools = [
             name
-            for name, tool in self._tools.items()
-            if tool.skill_name == "mcp::puppeteer" and name in _PUPPETEER_FETCH_TOOLS
+            for name in self._tools_by_server.get("puppeteer", ())
+            if name in _PUPPETEER_FETCH_TOOLS
         ]
 
         # mcp-fetch tools (fallback, plain HTTP)
-        mcp_fetch_tools = [
-            name for name, tool in self._tools.items() if tool.skill_name == "mcp::mcp-fetch"
-        ]
+        mcp_fetch_tools = list(self._tools_by_server.get("mcp-fetch", ()))
 
         if puppeteer_tools:
             register_dynamic_category("fetch", puppeteer_tools)
@@ -349,29 +563,39 @@ class McpManager:
             self._fetch_mode = "unavailable"
             logger.error("Fetch mode: unavailable — no web browsing tools connected")
 
-    def _persist_config(self) -> None:
-        """Write current server configs back to disk."""
+    async def _persist_config(self) -> None:
+        """Write current server configs back to disk.
+
+        Serialized on the loop (a consistent snapshot, one dumps() call instead of
+        json.dump's many small writes); only the file I/O goes to a thread.
+        """
         try:
-            os.makedirs(os.path.dirname(self.config_path) or ".", exist_ok=True)
-            data = {"servers": self._server_configs}
-            with open(self.config_path, "w") as f:
-                json.dump(data, f, indent=2)
+            text = json.dumps({"servers": self._server_configs}, indent=2)
+            self._manifest_dirty = False
+            await asyncio.to_thread(_write_config, self.config_path, text)
             logger.info("MCP config saved to %s", self.config_path)
         except Exception as e:
+            self._manifest_dirty = True  # retry on the next persist
             logger.error("Failed to persist MCP config: %s", e)
 
-    @staticmethod
-    def _invalidate_tools_cache() -> None:
-        """Invalidate the executor-level tools map cache."""
+    def _tools_changed(self) -> None:
+        """Drop the cached Ollama schemas, prompt summary and fetch fallback after tools change."""
+        self._ollama_tools_cache = None
+        self._summary_cache = None
+        self._fetch_fallback_resolved = False
+
+    def _invalidate_tools_cache(self) -> None:
+        """Invalidate every derived tool view: this manager's and the executor's tools map."""
         from app.skills.executor import reset_tools_cache
 
+        self._tools_changed()
         reset_tools_cache()
 
     def _update_dynamic_categories(self, server_name: str) -> None:
         """Register newly added MCP tools into the router's TOOL_CATEGORIES."""
         from app.skills.router import register_dynamic_category
 
-        tool_names = [k for k, v in self._tools.items() if v.skill_name == f"mcp::{server_name}"]
+        tool_names = list(self._tools_by_server.get(server_name, ()))
         if tool_names:
             register_dynamic_category(server_name, tool_names)
 
@@ -380,8 +604,13 @@ class McpManager:
     # ------------------------------------------------------------------
 
     def get_ollama_tools(self) -> list[dict]:
-        """Return tool schemas in Ollama's expected format."""
-        return [
+        """Return tool schemas in Ollama's expected format.
+
+        The list is cached and shared between calls: treat it as read-only.
+        """
+        if self._ollama_tools_cache is not None:
+            return self._ollama_tools_cache
+        self._ollama_tools_cache = [
             {
                 "type": "function",
                 "function": {
@@ -392,17 +621,23 @@ class McpManager:
             }
             for tool in self._tools.values()
         ]
+        return self._ollama_tools_cache
 
     async def cleanup(self) -> None:
-        """Close all connections."""
-        for name, stack in list(self._server_stacks.items()):
-            try:
-                await stack.aclose()
-            except Exception as e:
-                logger.error("Error closing MCP server %s: %s", name, e)
+        """Close all connections concurrently: shutdown waits for the slowest server only."""
+        stacks = list(self._server_stacks.items())
+        results = await asyncio.gather(
+            *(stack.aclose() for _, stack in stacks), return_exceptions=True
+        )
+        for (name, _), result in zip(stacks, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.error("Error closing MCP server %s: %s", name, result)
         self._server_stacks.clear()
         self._sessions.clear()
+        self._lazy_servers.clear()
         self._tools.clear()
+        self._tools_by_server.clear()
+        self._tools_changed()
         logger.info("MCP Manager cleanup complete")
 
     def has_tool(self, tool_name: str) -> bool:
@@ -432,11 +667,12 @@ class McpManager:
         """Return a summary of MCP tools grouped by server, for the system prompt."""
         if not self._tools:
             return None
+        if self._summary_cache is not None:
+            return self._summary_cache
 
         by_server: dict[str, list[ToolDefinition]] = {}
         for tool in self._tools.values():
-            server = tool.skill_name.removeprefix("mcp::")  # type: ignore[union-attr]
-            by_server.setdefault(server, []).append(tool)
+            by_server.setdefault(tool.server_name, []).append(tool)  # type: ignore[arg-type]
 
         lines = ["Available MCP capabilities:"]
         for server, tools in by_server.items():
@@ -445,7 +681,12 @@ class McpManager:
             for tool in tools:
                 lines.append(f"- {tool.name}: {tool.description}")
 
-        return "\n".join(lines)
+        self._summary_cache = "\n".join(lines)
+        return self._summary_cache
 
-    def get_tools(self) -> dict[str, ToolDefinition]:
-        return dict(self._tools)
+    def get_tools(self) -> Mapping[str, ToolDefinition]:
+        """Read-only live view of the registered tools (no per-call copy).
+
+        Iterate it synchronously; take ``dict(...)`` if you need a snapshot across awaits.
+        """
+        return MappingProxyType(self._tools)
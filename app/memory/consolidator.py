@@ -28,10 +28,7 @@ CONSOLIDATE_PROMPT = (
 
 def _format_memories(memories: list) -> str:
     """Format memories with IDs for the consolidation prompt."""
-    lines = []
-    for m in memories:
-        lines.append(f"[{m.id}] {m.content}")
-    return "\n".join(lines)
+    return "\n".join([f"[{m.id}] {m.content}" for m in memories])
 
 
 async def consolidate_memories(
@@ -79,14 +76,14 @@ async def consolidate_memories(
     valid_ids = {m.id for m in memories}
     remove_ids = [rid for rid in remove_ids if isinstance(rid, int) and rid in valid_ids]
 
-    removed_count = 0
+    removed_ids: list[int] = []
     for memory_id in remove_ids:
         # Find the memory content for logging
         memory = next((m for m in memories if m.id == memory_id), None)
         if memory:
             success = await repository.remove_memory(memory.content)
             if success:
-                removed_count += 1
+                removed_ids.append(memory_id)
                 logger.info("Consolidated memory [%d]: %s", memory_id, memory.content[:80])
                 # Remove embedding (best-effort)
                 try:
@@ -98,8 +95,13 @@ async def consolidate_memories(
                         "Failed to delete embedding for consolidated memory %d", memory_id
                     )
 
-    # Sync MEMORY.md if any were removed
-    if removed_count > 0:
+    # Sync MEMORY.md if any were removed: splice out just those lines when the file's
+    # line index is still valid, otherwise re-render it from the DB
+    removed_count = len(removed_ids)
+    # remove_memory() deactivates every active row with that content, not just the id
+    removed_contents = {m.content for m in memories if m.id in removed_ids}
+    stale_ids = [m.id for m in memories if m.content in removed_contents]
+    if removed_ids and not await memory_file.delete_lines(stale_ids):
         updated_memories = await repository.list_memories()
         await memory_file.sync(updated_memories)
 
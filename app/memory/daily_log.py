@@ -34,18 +34,18 @@ class DailyLog:
         log_dir = self._dir
 
         def _do_load() -> str | None:
-            if not log_dir.exists():
-                return None
             now = datetime.now(UTC)
             parts: list[str] = []
             for i in range(days):
                 date = now - timedelta(days=i)
                 date_str = date.strftime("%Y-%m-%d")
-                file_path = log_dir / f"{date_str}.md"
-                if file_path.exists():
-                    content = file_path.read_text(encoding="utf-8").strip()
-                    if content:
-                        parts.append(content)
+                # Just try the open: a missing day costs one failed syscall, not stat + open
+                try:
+                    content = (log_dir / f"{date_str}.md").read_text(encoding="utf-8").strip()
+                except FileNotFoundError:
+                    continue
+                if content:
+                    parts.append(content)
             return "\n\n".join(parts) if parts else None
 
         return await asyncio.to_thread(_do_load)
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+import bisect
+import os
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -8,36 +12,135 @@ from app.models import Memory
 if TYPE_CHECKING:
     from app.memory.watcher import MemoryWatcher
 
+_HEADER = "# Memories\n\n"
+
+# memory_id → (start_byte, length) of its line in MEMORY.md. Memories that are not
+# rendered (self_correction) get a zero-length range so they still count as indexed.
+LineIndex = dict[int, tuple[int, int]]
+
 
 class MemoryFile:
     def __init__(self, path: str):
         self._path = Path(path)
         self._watcher: MemoryWatcher | None = None
+        # Byte ranges of the last file we wrote, valid while its (mtime_ns, size) holds
+        self._index: LineIndex | None = None
+        self._index_stat: tuple[int, int] | None = None
+        # Overlapping sync() calls collapse: whoever holds the lock writes the latest snapshot
+        self._lock = asyncio.Lock()
+        self._pending: list[Memory] | None = None
 
     def set_watcher(self, watcher: MemoryWatcher) -> None:
         """Register the watcher so sync() can set the guard."""
         self._watcher = watcher
 
     async def sync(self, memories: list[Memory]) -> None:
-        import asyncio
+        self._pending = memories
+        async with self._lock:
+            if self._pending is None:
+                return  # the lock holder before us already wrote our snapshot or a newer one
+            memories, self._pending = self._pending, None
+            await self._write(memories)
 
+    async def _write(self, memories: list[Memory]) -> None:
         if self._watcher:
             self._watcher.set_sync_guard()
         try:
-            self._path.parent.mkdir(parents=True, exist_ok=True)
-            lines = ["# Memories\n"]
-            for m in memories:
-                if m.category == "self_correction":
-                    continue
-                if m.category:
-                    lines.append(f"- [{m.category}] {m.content}")
-                else:
-                    lines.append(f"- {m.content}")
-            content = "\n".join(lines) + "\n"
-            path = self._path
-            await asyncio.to_thread(path.write_text, content, "utf-8")
+            self._index = None
+            self._index, self._index_stat = await asyncio.to_thread(
+                _write_memory_file, self._path, memories
+            )
         finally:
+            # The file is swapped in by rename: watchdog only sees the .tmp being written
+            # plus a move, neither of which fires modified/created on MEMORY.md itself,
+            # so the guard can be released right away.
             if self._watcher:
-                # Delay clearing guard so watchdog event can pass
-                await asyncio.sleep(0.5)
                 self._watcher.clear_sync_guard()
+
+    async def delete_lines(self, memory_ids: Iterable[int]) -> bool:
+        """Drop the given memories' lines from MEMORY.md without re-rendering the rest.
+
+        Returns False when the line index can't be trusted (file never written by sync(),
+        edited externally since, or an unknown id); the caller should fall back to sync().
+        """
+        async with self._lock:
+            if self._watcher:
+                self._watcher.set_sync_guard()
+            try:
+                return await asyncio.to_thread(self._splice_out, set(memory_ids))
+            finally:
+                if self._watcher:
+                    self._watcher.clear_sync_guard()
+
+    def _splice_out(self, memory_ids: set[int]) -> bool:
+        """Blocking; runs in a worker thread."""
+        index = self._index
+        if index is None or not memory_ids.issubset(index):
+            return False
+        try:
+            st = self._path.stat()
+            if (st.st_mtime_ns, st.st_size) != self._index_stat:
+                return False
+            data = self._path.read_bytes()
+        except OSError:
+            return False
+
+        cuts = sorted(index.pop(mid) for mid in memory_ids)
+        kept: list[bytes] = []
+        pos = 0
+        for start, length in cuts:
+            kept.append(data[pos:start])
+            pos = start + length
+        kept.append(data[pos:])
+
+        # Shift the surviving ranges left by the bytes removed before them
+        starts = [start for start, _ in cuts]
+        removed_before = [0]
+        for _, length in cuts:
+            removed_before.append(removed_before[-1] + length)
+        for mid, (start, length) in index.items():
+            index[mid] = (start - removed_before[bisect.bisect_right(starts, start)], length)
+
+        self._index_stat = _replace_file(self._path, kept)
+        return True
+
+
+def _memory_lines(memories: list[Memory], index: LineIndex) -> Iterator[bytes]:
+    line = _HEADER.encode()
+    pos = len(line)
+    yield line
+    for m in memories:
+        if m.category == "self_correction":
+            index[m.id] = (pos, 0)
+            continue
+        if m.category:
+            line = f"- [{m.category}] {m.content}\n".encode()
+        else:
+            line = f"- {m.content}\n".encode()
+        index[m.id] = (pos, len(line))
+        pos += len(line)
+        yield line
+
+
+def _write_memory_file(path: Path, memories: list[Memory]) -> tuple[LineIndex, tuple[int, int]]:
+    """Render the entries to MEMORY.md and return their line index plus the file's stat.
+
+    Blocking; runs in a worker thread.
+    """
+    index: LineIndex = {}
+    stat = _replace_file(path, _memory_lines(memories, index))
+    return index, stat
+
+
+def _replace_file(path: Path, chunks: Iterable[bytes]) -> tuple[int, int]:
+    """Stream chunks into a sibling .tmp file and atomically swap it in.
+
+    Readers never see a half-written file. Returns the new file's (mtime_ns, size).
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb", buffering=1 << 16) as f:
+        f.writelines(chunks)
+    os.replace(tmp, path)
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
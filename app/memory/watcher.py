@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
 import os
 import re
@@ -18,21 +20,21 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
-MEMORY_LINE_RE = re.compile(r"^-\s+(?:\[([^\]]*)\]\s+)?(.+)$")
+# Editors often emit several events per save (write + rename, truncate + write):
+# wait this long after the last one before syncing
+_DEBOUNCE_SECONDS = 0.15
+
+# One "- [category] content" entry per line, matched over the whole buffer. [^\S\n] is
+# "whitespace except newline", so a match never spans lines; surrounding whitespace
+# (including a CRLF's \r) stays outside the groups.
+MEMORY_LINE_RE = re.compile(
+    r"^[^\S\n]*-[^\S\n]+(?:\[([^\]\n]*)\][^\S\n]+)?(.*?\S)[^\S\n]*$", re.MULTILINE
+)
 
 
 def parse_memory_file(content: str) -> list[tuple[str, str | None]]:
     """Parse MEMORY.md content into list of (content, category) tuples."""
-    results = []
-    for line in content.splitlines():
-        line = line.strip()
-        m = MEMORY_LINE_RE.match(line)
-        if m:
-            category = m.group(1) or None
-            memory_content = m.group(2).strip()
-            if memory_content:
-                results.append((memory_content, category))
-    return results
+    return [(m.group(2), m.group(1) or None) for m in MEMORY_LINE_RE.finditer(content)]
 
 
 class _MemoryFileHandler(FileSystemEventHandler):
@@ -79,6 +81,11 @@ class MemoryWatcher:
         self._loop = loop
         self._observer: Observer | None = None  # type: ignore[valid-type]
         self._syncing = threading.Event()
+        # (mtime_ns, size, blake2b digest) of the last file state reconciled with the DB
+        self._last_stat: tuple[int, int, bytes] | None = None
+        # Pending debounced sync; only touched from the event loop thread
+        self._debounce_handle: asyncio.TimerHandle | None = None
+        self._sync_task: asyncio.Task | None = None  # strong ref while it runs
 
     def start(self) -> None:
         """Start watching MEMORY.md for changes."""
@@ -98,11 +105,16 @@ class MemoryWatcher:
         if self._observer:
             self._observer.stop()  # type: ignore[attr-defined]
             self._observer.join(timeout=5)  # type: ignore[attr-defined]
+            if self._debounce_handle is not None:
+                self._debounce_handle.cancel()
+                self._debounce_handle = None
             logger.info("Memory watcher stopped")
 
     def set_sync_guard(self) -> None:
         """Set the guard to prevent re-entrant sync."""
         self._syncing.set()
+        # The file is about to be rewritten from the DB: forget the reconciled state
+        self._last_stat = None
 
     def clear_sync_guard(self) -> None:
         """Clear the guard after sync completes."""
@@ -114,52 +126,77 @@ class MemoryWatcher:
             logger.debug("Skipping sync (guard set)")
             return
 
-        import asyncio
-
         try:
-            asyncio.run_coroutine_threadsafe(
-                self._sync_from_file(),
-                self._loop,
-            )
+            self._loop.call_soon_threadsafe(self._debounce_sync)
         except Exception:
             logger.warning("Failed to schedule file sync", exc_info=True)
 
+    def _debounce_sync(self) -> None:
+        """Runs on the event loop: (re)start the debounce window for a burst of events."""
+        if self._debounce_handle is not None:
+            self._debounce_handle.cancel()
+        self._debounce_handle = self._loop.call_later(_DEBOUNCE_SECONDS, self._fire_sync)
+
+    def _fire_sync(self) -> None:
+        self._debounce_handle = None
+        self._sync_task = self._loop.create_task(self._sync_from_file())
+
     async def _sync_from_file(self) -> None:
         """Read MEMORY.md and sync changes to SQLite."""
         path = Path(self._memory_file._path)
-        if not path.exists():
-            return
-
         try:
-            content = path.read_text(encoding="utf-8")
+            st = path.stat()
+            if self._last_stat is not None and self._last_stat[:2] == (
+                st.st_mtime_ns,
+                st.st_size,
+            ):
+                return
+            raw = path.read_bytes()
+            content = raw.decode("utf-8")
+        except FileNotFoundError:
+            return
         except Exception:
             logger.warning("Failed to read memory file", exc_info=True)
             return
 
+        digest = hashlib.blake2b(raw, digest_size=16).digest()
+        if self._last_stat is not None and self._last_stat[2] == digest:
+            # Touched but not edited (e.g. "save" without changes): nothing to reconcile
+            self._last_stat = (st.st_mtime_ns, st.st_size, digest)
+            return
+
         file_memories = parse_memory_file(content)
         all_db_memories = await self._repository.list_memories()
         # Exclude self_correction from sync so it stays in DB but not in user's markdown
         db_memories = [m for m in all_db_memories if m.category != "self_correction"]
 
-        # Build sets for comparison
-        file_set = {(c, cat) for c, cat in file_memories}
-        db_set = {(m.content, m.category) for m in db_memories}
+        # Keyed by content: a category-only edit becomes one UPDATE, not remove + add
+        file_map = dict(file_memories)
+        db_map = {m.content: m.category for m in db_memories}
 
         # Memories in file but not in DB → add
-        to_add = file_set - db_set
+        to_add = file_map.keys() - db_map.keys()
         # Memories in DB but not in file → deactivate
-        to_remove = db_set - file_set
+        to_remove = db_map.keys() - file_map.keys()
+        # Same memory, different category → recategorize in place
+        to_update = {k for k in file_map.keys() & db_map.keys() if file_map[k] != db_map[k]}
+
+        # One transaction per kind of change instead of one commit per line
+        if to_add:
+            await self._repository.add_memories_bulk([(c, file_map[c]) for c in to_add])
+            for content_text in to_add:
+                logger.info("Synced from file → added: %s", content_text[:80])
 
-        changed = False
-        for content_text, category in to_add:
-            await self._repository.add_memory(content_text, category)
-            logger.info("Synced from file → added: %s", content_text[:80])
-            changed = True
+        if to_remove:
+            await self._repository.remove_memories_bulk(list(to_remove))
+            for content_text in to_remove:
+                logger.info("Synced from file → removed: %s", content_text[:80])
 
-        for content_text, _category in to_remove:
-            await self._repository.remove_memory(content_text)
-            logger.info("Synced from file → removed: %s", content_text[:80])
-            changed = True
+        for content_text in to_update:
+            await self._repository.update_memory_category(content_text, file_map[content_text])
+            logger.info("Synced from file → recategorized: %s", content_text[:80])
+
+        changed = bool(to_add or to_remove or to_update)
 
         # Re-sync file to normalize format
         if changed:
@@ -168,10 +205,20 @@ class MemoryWatcher:
                 updated = await self._repository.list_memories()
                 await self._memory_file.sync(updated)
             finally:
-                # Clear guard after a short delay to let watchdog event pass
-                import asyncio
-
-                await asyncio.sleep(0.5)
                 self.clear_sync_guard()
 
-            logger.info("Memory sync complete: +%d -%d", len(to_add), len(to_remove))
+            logger.info(
+                "Memory sync complete: +%d -%d ~%d", len(to_add), len(to_remove), len(to_update)
+            )
+            self._remember_file_state(path)
+        else:
+            self._last_stat = (st.st_mtime_ns, st.st_size, digest)
+
+    def _remember_file_state(self, path: Path) -> None:
+        """Record the normalized file just written back, so its own events are no-ops."""
+        try:
+            st = path.stat()
+            digest = hashlib.blake2b(path.read_bytes(), digest_size=16).digest()
+        except OSError:
+            return
+        self._last_stat = (st.st_mtime_ns, st.st_size, digest)
@@ -2,11 +2,21 @@ from __future__ import annotations
 
 import json
 import logging
+import re
 
 from app.models import ChatMessage
 
 logger = logging.getLogger(__name__)
 
+# Opening fence line (any language tag) + body + optional closing fence line
+_FENCE_RE = re.compile(r"```[^\n]*(?:\n(.*?))??(?:\n[^\S\n]*```[^\S\n]*)?", re.DOTALL)
+
+_ROLE_LABEL = {"user": "User", "assistant": "Assistant"}
+
+# Almost-JSON repairs, only tried after a strict parse fails
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+_SMART_QUOTES = str.maketrans({"\u201c": '"', "\u201d": '"', "\u2018": "'", "\u2019": "'"})
+
 _DISCOVERY_SYSTEM = (
     "You are an information extractor. "
     "Read the conversation and extract factual information about the user. "
@@ -15,6 +25,7 @@ _DISCOVERY_SYSTEM = (
     "tech_context, interests, schedule, family, location, preferences, language. "
     "Values should be short strings. Return only the JSON object, nothing else."
 )
+_DISCOVERY_SYSTEM_MSG = ChatMessage(role="system", content=_DISCOVERY_SYSTEM)
 
 
 async def maybe_discover_profile_updates(
@@ -24,21 +35,34 @@ async def maybe_discover_profile_updates(
     repository,
     ollama_client,
     settings,
+    conversation_id: int | None = None,
 ) -> None:
     """Run profile discovery if message_count is a multiple of interval.
 
-    Best-effort: errors are logged but never propagated.
+    Best-effort: errors are logged but never propagated. Pass ``conversation_id`` when
+    the caller already has it to skip the conversation lookup.
     """
-    if interval <= 0 or message_count % interval != 0:
+    if not is_discovery_turn(message_count, interval):
         return
 
     try:
-        await _run_discovery(phone_number, repository, ollama_client, settings)
+        await _run_discovery(phone_number, repository, ollama_client, settings, conversation_id)
     except Exception:
         logger.warning("Profile discovery failed for %s", phone_number, exc_info=True)
 
 
-async def _run_discovery(phone_number: str, repository, ollama_client, settings) -> None:
+def is_discovery_turn(message_count: int, interval: int) -> bool:
+    """Cheap gate: discovery only runs every ``interval`` messages (0 disables it)."""
+    return interval > 0 and message_count % interval == 0
+
+
+async def _run_discovery(
+    phone_number: str,
+    repository,
+    ollama_client,
+    settings,
+    conversation_id: int | None = None,
+) -> None:
     """Fetch recent messages, run LLM extraction, merge into profile."""
     # Get current profile
     profile_row = await repository.get_user_profile(phone_number)
@@ -49,16 +73,14 @@ async def _run_discovery(phone_number: str, repository, ollama_client, settings)
     current_data = profile_row["data"]
 
     # Fetch last 15 messages for this conversation
-    conv_id = await repository.get_or_create_conversation(phone_number)
+    conv_id = conversation_id or await repository.get_or_create_conversation(phone_number)
     messages = await repository.get_recent_messages(conv_id, 15)
     if not messages:
         return
 
     # Format conversation for LLM
     conversation_text = "\n".join(
-        f"{m.role.capitalize()}: {m.content[:300]}"
-        for m in messages
-        if m.role in ("user", "assistant")
+        f"{_ROLE_LABEL[m.role]}: {m.content[:300]}" for m in messages if m.role in _ROLE_LABEL
     )
 
     prompt = (
@@ -70,12 +92,13 @@ async def _run_discovery(phone_number: str, repository, ollama_client, settings)
     )
 
     llm_messages = [
-        ChatMessage(role="system", content=_DISCOVERY_SYSTEM),
+        _DISCOVERY_SYSTEM_MSG,
         ChatMessage(role="user", content=prompt),
     ]
 
-    response = await ollama_client.chat_with_tools(llm_messages, think=False)
-    raw = response.content.strip()
+    # Exact-match cache (OllamaClient response LRU): a retry with the same history and
+    # known fields is answered without re-running inference. Onboarding stays uncached.
+    raw = (await ollama_client.chat(llm_messages, think=False, cache=True)).strip()
 
     # Try to parse JSON
     new_fields = _parse_json_safe(raw)
@@ -83,33 +106,46 @@ async def _run_discovery(phone_number: str, repository, ollama_client, settings)
         logger.debug("Discovery for %s: no new fields extracted", phone_number)
         return
 
-    # Merge: only add fields not already present
-    updated_data = dict(current_data)
-    added = []
-    for key, value in new_fields.items():
-        if key not in updated_data and isinstance(value, str) and value.strip():
-            updated_data[key] = value.strip()
-            added.append(key)
-
-    if not added:
+    # Merge: only add non-empty string fields not already present
+    additions = {
+        key: stripped
+        for key, value in new_fields.items()
+        if key not in current_data and isinstance(value, str) and (stripped := value.strip())
+    }
+    if not additions:
         return
 
-    logger.info("Profile discovery for %s: added fields %s", phone_number, added)
-    await repository.save_user_profile(phone_number, "complete", updated_data)
+    logger.info("Profile discovery for %s: added fields %s", phone_number, list(additions))
+    await repository.save_user_profile(phone_number, "complete", {**current_data, **additions})
 
 
 def _parse_json_safe(text: str) -> dict:
     """Try to parse JSON from LLM output. Returns empty dict on failure."""
     # Strip markdown code fences if present
     text = text.strip()
-    if text.startswith("```"):
-        lines = text.split("\n")
-        # Remove first and last fence lines
-        text = "\n".join(lines[1:-1] if lines[-1].strip() == "```" else lines[1:])
+    fence = _FENCE_RE.fullmatch(text)
+    if fence:
+        text = fence.group(1) or ""
     try:
         result = json.loads(text)
         if isinstance(result, dict):
             return result
     except (json.JSONDecodeError, ValueError):
         pass
+
+    # Rescue almost-JSON instead of wasting the generation: keep only the outermost
+    # object (drops "Here is the JSON:" chatter), straighten smart quotes, drop
+    # trailing commas
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end < start:
+        return {}
+    repaired = _TRAILING_COMMA_RE.sub(r"\1", text[start : end + 1].translate(_SMART_QUOTES))
+    try:
+        result = json.loads(repaired)
+    except (json.JSONDecodeError, ValueError):
+        logger.debug("Discovery output is not JSON even after repair: %s", text[:200])
+        return {}
+    if isinstance(result, dict):
+        logger.debug("Discovery output parsed after almost-JSON repair")
+        return result
     return {}
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
 
 from app.models import ChatMessage
 
@@ -9,12 +12,20 @@ logger = logging.getLogger(__name__)
 # State order: pending → step_1 → step_2 → step_3 → naming → complete
 STATES = ["pending", "step_1", "step_2", "step_3", "naming", "complete"]
 
-# System prompt used for onboarding LLM calls
+# System prompt used for onboarding LLM calls. Replies are deliberately not cached:
+# onboarding runs once per phone number and every prompt embeds that user's own answers,
+# so there is nothing to reuse across calls.
 _ONBOARDING_SYSTEM = (
     "You are a warm, friendly personal assistant on WhatsApp. "
     "Be concise and conversational — this is a chat, not a form. "
     "Answer in the same language the user writes in."
 )
+# Built once and shared by every call: same object, same wire bytes for the prompt prefix
+_ONBOARDING_SYSTEM_MSG = ChatMessage(role="system", content=_ONBOARDING_SYSTEM)
+_EXTRACTOR_SYSTEM_MSG = ChatMessage(
+    role="system",
+    content="You are a precise information extractor. Output only the requested value.",
+)
 
 
 async def handle_onboarding_message(
@@ -27,53 +38,72 @@ async def handle_onboarding_message(
 
     Returns (next_state, response_text, updated_profile_data).
     """
-    data = dict(profile_data)
-
-    if state == "pending":
-        # First contact — respond to the user's message and ask their name
-        response = await _generate_intro(user_reply, ollama_client)
-        return "step_1", response, data
-
-    if state == "step_1":
-        # Extract name from reply, then ask occupation
-        name = await _extract_field("name", user_reply, ollama_client)
-        if name:
-            data["name"] = name
-        response = await _ask_occupation(data, ollama_client)
-        return "step_2", response, data
-
-    if state == "step_2":
-        # Extract occupation, then ask about use cases / goals
-        occupation = await _extract_field("occupation or job role", user_reply, ollama_client)
-        if occupation:
-            data["occupation"] = occupation
-        response = await _ask_use_cases(data, ollama_client)
-        return "step_3", response, data
-
-    if state == "step_3":
-        # Extract use cases, then propose 2 assistant name options
-        use_cases = await _extract_field("main use cases or goals", user_reply, ollama_client)
-        if use_cases:
-            data["use_cases"] = use_cases
-        response = await _propose_names(data, ollama_client)
-        return "naming", response, data
-
-    if state == "naming":
-        # Extract confirmed name from user reply
-        assistant_name = await _extract_field(
-            "assistant name chosen by the user",
-            user_reply,
-            ollama_client,
-        )
-        if not assistant_name:
-            assistant_name = "Wasi"
-        data["assistant_name"] = assistant_name
-        response = await _generate_welcome(data, ollama_client)
-        return "complete", response, data
-
-    # Should not happen — if state is already complete, this won't be called
-    logger.warning("handle_onboarding_message called with unexpected state: %s", state)
-    return state, "", data
+    handler = _STATE_HANDLERS.get(state)
+    if handler is None:
+        # Should not happen — if state is already complete, this won't be called
+        logger.warning("handle_onboarding_message called with unexpected state: %s", state)
+        return state, "", profile_data
+    # Handlers never mutate profile_data: steps that learn a field return a merged copy
+    return await handler(user_reply, profile_data, ollama_client)
+
+
+async def _handle_pending(user_reply: str, data: dict, ollama_client) -> tuple[str, str, dict]:
+    # First contact — respond to the user's message and ask their name
+    response = await _generate_intro(user_reply, ollama_client)
+    return "step_1", response, data
+
+
+# Steps 1-3: extraction and the next question are independent LLM calls, so they run
+# concurrently. The question sees the raw reply instead of the not-yet-extracted field.
+
+
+async def _handle_step_1(user_reply: str, data: dict, ollama_client) -> tuple[str, str, dict]:
+    # Extract name from reply, while asking occupation
+    name, response = await asyncio.gather(
+        _extract_field("name", user_reply, ollama_client),
+        _ask_occupation(data, ollama_client, user_reply),
+    )
+    return "step_2", response, {**data, "name": name} if name else data
+
+
+async def _handle_step_2(user_reply: str, data: dict, ollama_client) -> tuple[str, str, dict]:
+    # Extract occupation, while asking about use cases / goals
+    occupation, response = await asyncio.gather(
+        _extract_field("occupation or job role", user_reply, ollama_client),
+        _ask_use_cases(data, ollama_client, user_reply),
+    )
+    return "step_3", response, {**data, "occupation": occupation} if occupation else data
+
+
+async def _handle_step_3(user_reply: str, data: dict, ollama_client) -> tuple[str, str, dict]:
+    # Extract use cases, while proposing 2 assistant name options
+    use_cases, response = await asyncio.gather(
+        _extract_field("main use cases or goals", user_reply, ollama_client),
+        _propose_names(data, ollama_client, user_reply),
+    )
+    return "naming", response, {**data, "use_cases": use_cases} if use_cases else data
+
+
+async def _handle_naming(user_reply: str, data: dict, ollama_client) -> tuple[str, str, dict]:
+    # Extract confirmed name from user reply (sequential: the welcome uses it)
+    assistant_name = await _extract_field(
+        "assistant name chosen by the user",
+        user_reply,
+        ollama_client,
+    )
+    data = {**data, "assistant_name": assistant_name or "Wasi"}
+    response = await _generate_welcome(data, ollama_client)
+    return "complete", response, data
+
+
+# state → handler(user_reply, data, ollama_client) -> (next_state, response, data)
+_STATE_HANDLERS: dict[str, Callable[[str, dict, Any], Awaitable[tuple[str, str, dict]]]] = {
+    "pending": _handle_pending,
+    "step_1": _handle_step_1,
+    "step_2": _handle_step_2,
+    "step_3": _handle_step_3,
+    "naming": _handle_naming,
+}
 
 
 async def _generate_intro(user_first_message: str, ollama_client) -> str:
@@ -86,30 +116,35 @@ async def _generate_intro(user_first_message: str, ollama_client) -> str:
         f"User's first message: {user_first_message}"
     )
     messages = [
-        ChatMessage(role="system", content=_ONBOARDING_SYSTEM),
+        _ONBOARDING_SYSTEM_MSG,
         ChatMessage(role="user", content=prompt),
     ]
     response = await ollama_client.chat_with_tools(messages, think=False)
     return response.content.strip()
 
 
-async def _ask_occupation(data: dict, ollama_client) -> str:
+def _last_reply_context(last_reply: str) -> str:
+    return f"\n\nTheir last message: {last_reply}" if last_reply else ""
+
+
+async def _ask_occupation(data: dict, ollama_client, last_reply: str = "") -> str:
     """Ask the user about their occupation."""
     name = data.get("name", "")
     prompt = (
         f"You are onboarding a user{' named ' + name if name else ''}. "
         "Ask them briefly and conversationally what they do for work or study "
         "(their occupation or field). One short sentence."
+        f"{_last_reply_context(last_reply)}"
     )
     messages = [
-        ChatMessage(role="system", content=_ONBOARDING_SYSTEM),
+        _ONBOARDING_SYSTEM_MSG,
         ChatMessage(role="user", content=prompt),
     ]
     response = await ollama_client.chat_with_tools(messages, think=False)
     return response.content.strip()
 
 
-async def _ask_use_cases(data: dict, ollama_client) -> str:
+async def _ask_use_cases(data: dict, ollama_client, last_reply: str = "") -> str:
     """Ask the user about their main use cases / goals."""
     name = data.get("name", "")
     occupation = data.get("occupation", "")
@@ -122,16 +157,17 @@ async def _ask_use_cases(data: dict, ollama_client) -> str:
         f"You are onboarding a user {context.strip()}. "
         "Ask them conversationally what they mainly want to use you for — "
         "what kinds of tasks, questions, or goals they have in mind. One short sentence."
+        f"{_last_reply_context(last_reply)}"
     )
     messages = [
-        ChatMessage(role="system", content=_ONBOARDING_SYSTEM),
+        _ONBOARDING_SYSTEM_MSG,
         ChatMessage(role="user", content=prompt),
     ]
     response = await ollama_client.chat_with_tools(messages, think=False)
     return response.content.strip()
 
 
-async def _propose_names(data: dict, ollama_client) -> str:
+async def _propose_names(data: dict, ollama_client, last_reply: str = "") -> str:
     """Propose 2 assistant name options and ask the user to pick or suggest their own."""
     name = data.get("name", "")
     occupation = data.get("occupation", "")
@@ -147,9 +183,10 @@ async def _propose_names(data: dict, ollama_client) -> str:
         "Then ask the user to pick one or suggest their own name. "
         "Format: propose the names naturally in a short message, not as a numbered list.\n\n"
         f"Profile:\n{profile_summary}"
+        f"{_last_reply_context(last_reply)}"
     )
     messages = [
-        ChatMessage(role="system", content=_ONBOARDING_SYSTEM),
+        _ONBOARDING_SYSTEM_MSG,
         ChatMessage(role="user", content=prompt),
     ]
     response = await ollama_client.chat_with_tools(messages, think=False)
@@ -170,7 +207,7 @@ async def _generate_welcome(data: dict, ollama_client) -> str:
         "Mention your name."
     )
     messages = [
-        ChatMessage(role="system", content=_ONBOARDING_SYSTEM),
+        _ONBOARDING_SYSTEM_MSG,
         ChatMessage(role="user", content=prompt),
     ]
     response = await ollama_client.chat_with_tools(messages, think=False)
@@ -186,10 +223,7 @@ async def _extract_field(field_description: str, user_reply: str, ollama_client)
         f"User message: {user_reply}"
     )
     messages = [
-        ChatMessage(
-            role="system",
-            content="You are a precise information extractor. Output only the requested value.",
-        ),
+        _EXTRACTOR_SYSTEM_MSG,
         ChatMessage(role="user", content=prompt),
     ]
     response = await ollama_client.chat_with_tools(messages, think=False)
@@ -1,31 +1,56 @@
 from __future__ import annotations
 
+import functools
+
+# (profile key, line template) in prompt order; falsy values are skipped
+_PROFILE_LINES = (
+    ("name", "The user's name is {}."),
+    ("assistant_name", "Your name is {}."),
+    ("occupation", "The user works as: {}."),
+    ("use_cases", "They mainly use you for: {}."),
+    ("tech_context", "Technical context: {}."),
+    ("interests", "Interests: {}."),
+    ("location", "Location: {}."),
+    ("preferences", "Preferences: {}."),
+)
+
 
 def build_system_prompt(base: str, profile: dict, current_date: str) -> str:
     """Build a personalized system prompt from base + user profile data."""
-    lines = [base]
+    stable, volatile = build_system_prompt_parts(base, profile, current_date)
+    return f"{stable}\n\n{volatile}"
+
 
-    if name := profile.get("name"):
-        lines.append(f"The user's name is {name}.")
-    if assistant_name := profile.get("assistant_name"):
-        lines.append(f"Your name is {assistant_name}.")
-    if occupation := profile.get("occupation"):
-        lines.append(f"The user works as: {occupation}.")
-    if use_cases := profile.get("use_cases"):
-        lines.append(f"They mainly use you for: {use_cases}.")
-    if tech_context := profile.get("tech_context"):
-        lines.append(f"Technical context: {tech_context}.")
-    if interests := profile.get("interests"):
-        lines.append(f"Interests: {interests}.")
-    if location := profile.get("location"):
-        lines.append(f"Location: {location}.")
-    if preferences := profile.get("preferences"):
-        lines.append(f"Preferences: {preferences}.")
+def build_system_prompt_parts(base: str, profile: dict, current_date: str) -> tuple[str, str]:
+    """Split the personalized system prompt into (stable_prefix, volatile_suffix).
 
+    The prefix (base + profile facts, in a fixed order) is byte-identical across turns so
+    Ollama can reuse its KV cache; callers put the suffix (debug flag, date) at the very end.
+    """
+    # Profile values in a fixed order: the prefix only changes when one of them does,
+    # so every other turn is a dict lookup instead of rebuilding the string
+    values = tuple(profile.get(key) for key, _ in _PROFILE_LINES)
+    try:
+        stable = _stable_prefix(base, values)
+    except TypeError:  # unhashable value (hand-edited profile): build it uncached
+        stable = _stable_prefix.__wrapped__(base, values)
+
+    volatile: list[str] = []
     if profile.get("debug_mode"):
-        lines.append(
-            "\n[🪲 DEBUG MODE ENABLED]: You are currently in auto-debug mode. If the user reports an error or asks to investigate, proactively use `get_recent_logs` to check internal backend execution errors, and `get_recent_messages` to review past conversation turns. Explain technical root causes explicitly."
+        volatile.append(
+            "[🪲 DEBUG MODE ENABLED]: You are currently in auto-debug mode. If the user reports an error or asks to investigate, proactively use `get_recent_logs` to check internal backend execution errors, and `get_recent_messages` to review past conversation turns. Explain technical root causes explicitly."
         )
 
-    lines.append(f"\nCurrent Date: {current_date}")
+    volatile.append(f"Current Date: {current_date}")
+    return stable, "\n\n".join(volatile)
+
+
+@functools.lru_cache(maxsize=1024)
+def _stable_prefix(base: str, values: tuple) -> str:
+    lines = [base]
+    lines.extend(
+        template.format(value)
+        for (_, template), value in zip(_PROFILE_LINES, values, strict=True)
+        if value
+    )
     return "\n".join(lines)
@@ -1,3 +1,4 @@
+import asyncio
 import hashlib
 import hmac as _hmac_mod
 import json
@@ -5,12 +6,37 @@ import logging
 import threading
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
 from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
 
+_TAIL_CHUNK = 8192
+
+
+def _read_last_line(path: Path) -> bytes:
+    """Return the last non-blank line of a file, reading backwards from the end.
+
+    Reads a window from the tail and doubles it until it holds a complete line, so
+    startup cost is one line instead of the whole append-only log.
+    """
+    with open(path, "rb") as f:
+        size = f.seek(0, 2)
+        window = _TAIL_CHUNK
+        while True:
+            start = max(0, size - window)
+            f.seek(start)
+            tail = f.read().rstrip()
+            newline = tail.rfind(b"\n")
+            if newline != -1 or start == 0:
+                return tail[newline + 1 :].strip()
+            window *= 2
+
+
+# (timestamp, tool_name, arguments, decision, decision_reason, execution_result)
+PendingRecord = tuple[str, str, dict[str, Any], str, str | None, str | None]
+
 
 class AuditEntry(BaseModel):
     timestamp: str
@@ -31,6 +57,10 @@ class AuditTrail:
         self._hmac_key: bytes | None = hmac_key.encode("utf-8") if hmac_key else None
         self._lock = threading.Lock()
         self._last_hash = self._initialize_log()
+        # Persistent append handle, opened on first record(): one write per entry (or per
+        # batch) instead of open + write + close. Writes stay synchronous: entries are
+        # flushed to disk before record()/record_batch() return.
+        self._file: TextIO | None = None
 
     def _initialize_log(self) -> str:
         """Ensures the file exists and returns the hash of the last entry."""
@@ -41,13 +71,10 @@ class AuditTrail:
 
         last_hash = "0000000000000000000000000000000000000000000000000000000000000000"
         try:
-            with open(self.log_path) as f:
-                lines = f.readlines()
-                if lines:
-                    last_line = lines[-1].strip()
-                    if last_line:
-                        data = json.loads(last_line)
-                        last_hash = data.get("entry_hash", last_hash)
+            last_line = _read_last_line(self.log_path)
+            if last_line:
+                data = json.loads(last_line)
+                last_hash = data.get("entry_hash", last_hash)
         except Exception as e:
             logger.error(f"Error reading audit log: {e}")
 
@@ -60,8 +87,9 @@ class AuditTrail:
         otherwise plain SHA-256 (integrity only).
         """
         payload_bytes = json.dumps(payload, sort_keys=True).encode("utf-8")
+        # hmac.digest: OpenSSL one-shot, no HMAC object per entry
         if self._hmac_key:
-            return _hmac_mod.new(self._hmac_key, payload_bytes, hashlib.sha256).hexdigest()
+            return _hmac_mod.digest(self._hmac_key, payload_bytes, "sha256").hex()
         return hashlib.sha256(payload_bytes).hexdigest()
 
     def record(
@@ -73,38 +101,141 @@ class AuditTrail:
         execution_result: str | None = None,
     ) -> AuditEntry:
         """Appends a new record to the audit trail with a rolling hash."""
+        timestamp = datetime.now(UTC).isoformat()
+        return self.record_batch(
+            [(timestamp, tool_name, arguments, decision, decision_reason, execution_result)]
+        )[0]
+
+    def record_batch(self, records: list[PendingRecord]) -> list[AuditEntry]:
+        """Append several records, chained in order, with a single write + flush.
+
+        Each record is (timestamp, tool_name, arguments, decision, decision_reason,
+        execution_result): the timestamp is taken by the caller, when the event happened.
+        """
+        entries: list[AuditEntry] = []
+        lines: list[str] = []
         with self._lock:
-            timestamp = datetime.now(UTC).isoformat()
-
-            payload_to_hash = {
-                "timestamp": timestamp,
-                "tool_name": tool_name,
-                "arguments": arguments,
-                "decision": decision,
-                "decision_reason": decision_reason,
-                "execution_result": execution_result,
-                "previous_hash": self._last_hash,
-            }
-
-            entry_hash = self._calculate_hash(payload_to_hash)
-
-            # Complete entry
-            entry = AuditEntry(
-                timestamp=timestamp,
-                tool_name=tool_name,
-                arguments=arguments,
-                decision=decision,
-                decision_reason=decision_reason,
-                execution_result=execution_result,
-                previous_hash=self._last_hash,
-                entry_hash=entry_hash,
-            )
+            previous_hash = self._last_hash
+            for (
+                timestamp,
+                tool_name,
+                arguments,
+                decision,
+                decision_reason,
+                execution_result,
+            ) in records:
+                payload_to_hash: dict[str, Any] = {
+                    "timestamp": timestamp,
+                    "tool_name": tool_name,
+                    "arguments": arguments,
+                    "decision": decision,
+                    "decision_reason": decision_reason,
+                    "execution_result": execution_result,
+                    "previous_hash": previous_hash,
+                }
+
+                entry_hash = self._calculate_hash(payload_to_hash)
+
+                # Complete entry: fields are internal and the payload already went through
+                # json.dumps for the hash, so no pydantic validation/serialization here.
+                # Compact separators + raw UTF-8 keep the line byte-identical to
+                # AuditEntry.model_dump_json().
+                entry_dict = {**payload_to_hash, "entry_hash": entry_hash}
+                lines.append(json.dumps(entry_dict, ensure_ascii=False, separators=(",", ":")))
+                entries.append(AuditEntry.model_construct(**entry_dict))
+                previous_hash = entry_hash
 
             try:
-                with open(self.log_path, "a") as f:
-                    f.write(entry.model_dump_json() + "\n")
-                self._last_hash = entry_hash
+                if self._file is None:
+                    self._file = open(self.log_path, "a")
+                self._file.write("".join(line + "\n" for line in lines))
+                self._file.flush()
+                self._last_hash = previous_hash
             except Exception as e:
                 logger.error(f"Failed to write to audit log: {e}")
+                self._close_file()  # reopen on the next record
+
+        return entries
+
+    def close(self) -> None:
+        """Close the append handle (the next record() reopens it)."""
+        with self._lock:
+            self._close_file()
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.close()
+            except Exception:
+                pass
+            self._file = None
 
-        return entry
+
+class AsyncAuditTrail:
+    """Event-loop front end for AuditTrail used by the tool executor.
+
+    record() only queues the event. A single drain task writes everything queued within
+    ``max_delay`` seconds (or as soon as ``max_batch`` events pile up) through one thread
+    hop and one AuditTrail.record_batch() append, instead of a run_in_executor + write per
+    event. flush() writes whatever is still queued right away.
+    """
+
+    def __init__(self, trail: AuditTrail, max_batch: int = 100, max_delay: float = 0.05):
+        self.trail = trail
+        self._max_batch = max_batch
+        self._max_delay = max_delay
+        self._pending: list[PendingRecord] = []
+        self._drain_task: asyncio.Task[None] | None = None
+        self._wakeup: asyncio.Future[None] | None = None
+
+    def record(
+        self,
+        tool_name: str,
+        arguments: dict[str, Any],
+        decision: str,
+        decision_reason: str | None,
+        execution_result: str | None = None,
+    ) -> None:
+        """Queue a record; it is hashed and written by the next drain."""
+        timestamp = datetime.now(UTC).isoformat()
+        self._pending.append(
+            (timestamp, tool_name, arguments, decision, decision_reason, execution_result)
+        )
+        self._ensure_drain_task()
+        if len(self._pending) >= self._max_batch:
+            self._wake()
+
+    async def flush(self) -> None:
+        """Write every queued record now."""
+        if not self._pending and (self._drain_task is None or self._drain_task.done()):
+            return
+        task = self._ensure_drain_task()
+        self._wake()
+        await task
+
+    def _ensure_drain_task(self) -> asyncio.Task[None]:
+        loop = asyncio.get_running_loop()
+        task = self._drain_task
+        # A task from another (closed) loop never finishes: start over on this one
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._wakeup = loop.create_future()
+            task = self._drain_task = loop.create_task(self._drain(self._wakeup))
+        return task
+
+    def _wake(self) -> None:
+        if self._wakeup is not None and not self._wakeup.done():
+            self._wakeup.set_result(None)
+
+    async def _drain(self, wakeup: asyncio.Future[None]) -> None:
+        timer = asyncio.get_running_loop().call_later(self._max_delay, self._wake)
+        try:
+            await wakeup
+        finally:
+            timer.cancel()
+        while self._pending:
+            batch = self._pending[: self._max_batch]
+            del self._pending[: self._max_batch]
+            try:
+                await asyncio.to_thread(self.trail.record_batch, batch)
+            except Exception:
+                logger.exception("Failed to write %d audit records", len(batch))
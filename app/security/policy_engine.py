@@ -1,13 +1,18 @@
 import logging
 import re
+from collections import OrderedDict
 from pathlib import Path
 
 import yaml  # type: ignore[import-untyped]
 
-from app.security.models import BasePolicy, PolicyAction, PolicyDecision
+from app.security.models import BasePolicy, PolicyAction, PolicyDecision, PolicyRule
 
 logger = logging.getLogger(__name__)
 
+_DECISION_CACHE_SIZE = 1024
+# Argument values longer than this (file contents, patches) are matched but not cached
+_DECISION_CACHE_MAX_KEY_CHARS = 2048
+
 
 class PolicyEngine:
     """Evaluates tool calls against the defined security policies."""
@@ -15,6 +20,16 @@ class PolicyEngine:
     def __init__(self, policy_path: Path):
         self.policy_path = policy_path
         self._policy: BasePolicy | None = None
+        # target_tool → [(rule, compiled argument patterns)] in file order, built at load
+        self._rules_by_tool: dict[str, list[tuple[PolicyRule, list[tuple[str, re.Pattern]]]]] = {}
+        # target_tool → argument keys its rules look at (the only ones a decision depends on)
+        self._arg_keys_by_tool: dict[str, tuple[str, ...]] = {}
+        # (tool_name, *argument values) → decision. Decisions only change with the policy
+        # file, and a reload builds a new engine, so entries never go stale.
+        self._decision_cache: OrderedDict[tuple[str, ...], PolicyDecision] = OrderedDict()
+        self._default_decision = PolicyDecision(
+            action=PolicyAction.BLOCK, reason="Policy engine initialization failed."
+        )
         self._load_policy()
 
     def _load_policy(self):
@@ -41,6 +56,28 @@ class PolicyEngine:
                 exc_info=True,
             )
             self._policy = BasePolicy(version="1.0", default_action=PolicyAction.BLOCK, rules=[])
+        self._compile_rules()
+
+    def _compile_rules(self) -> None:
+        """Precompile argument patterns once; rules with an invalid regex never match."""
+        self._rules_by_tool = {}
+        self._decision_cache.clear()
+        if not self._policy:
+            return
+        self._default_decision = PolicyDecision(
+            action=self._policy.default_action, reason="Matched default policy action."
+        )
+        for rule in self._policy.rules:
+            try:
+                patterns = [(key, re.compile(regex)) for key, regex in rule.argument_match.items()]
+            except re.error as e:
+                logger.error(f"Invalid regex in rule {rule.id}: {e}. Rule disabled.")
+                continue
+            self._rules_by_tool.setdefault(rule.target_tool, []).append((rule, patterns))
+        self._arg_keys_by_tool = {
+            tool: tuple(dict.fromkeys(key for _, patterns in rules for key, _ in patterns))
+            for tool, rules in self._rules_by_tool.items()
+        }
 
     def evaluate(self, tool_name: str, arguments: dict) -> PolicyDecision:
         """
@@ -49,32 +86,38 @@ class PolicyEngine:
         If no rules match, the default action is returned.
         """
         if not self._policy:
-            return PolicyDecision(
-                action=PolicyAction.BLOCK, reason="Policy engine initialization failed."
-            )
+            return self._default_decision
 
-        for rule in self._policy.rules:
-            if rule.target_tool != tool_name:
-                continue
+        rules = self._rules_by_tool.get(tool_name)
+        if not rules:
+            return self._default_decision
 
-            matches_all_args = True
-            for arg_key, arg_regex in rule.argument_match.items():
-                arg_value = str(arguments.get(arg_key, ""))
+        # Decisions are shared value objects: same tool + same values for the argument keys
+        # the rules inspect → same decision, so repeat calls skip the regex matching
+        values = {key: str(arguments.get(key, "")) for key in self._arg_keys_by_tool[tool_name]}
+        cache_key = (tool_name, *values.values())
+        decision = self._decision_cache.get(cache_key)
+        if decision is not None:
+            self._decision_cache.move_to_end(cache_key)
+            return decision
 
-                try:
-                    if not re.fullmatch(arg_regex, arg_value):
-                        matches_all_args = False
-                        break
-                except re.error as e:
-                    logger.error(f"Invalid regex in rule {rule.id}: {arg_regex} -> {e}")
-                    matches_all_args = False
-                    break
+        decision = self._match(tool_name, rules, values)
+        if sum(map(len, values.values())) <= _DECISION_CACHE_MAX_KEY_CHARS:
+            self._decision_cache[cache_key] = decision
+            if len(self._decision_cache) > _DECISION_CACHE_SIZE:
+                self._decision_cache.popitem(last=False)
+        return decision
 
-            if matches_all_args:
+    def _match(
+        self,
+        tool_name: str,
+        rules: list[tuple[PolicyRule, list[tuple[str, re.Pattern]]]],
+        values: dict[str, str],
+    ) -> PolicyDecision:
+        for rule, patterns in rules:
+            if all(pattern.fullmatch(values[arg_key]) for arg_key, pattern in patterns):
                 logger.debug(f"Tool {tool_name} matched rule {rule.id}, action={rule.action.value}")
                 return PolicyDecision(action=rule.action, reason=rule.reason, rule_id=rule.id)
 
         # Fallback to default
-        return PolicyDecision(
-            action=self._policy.default_action, reason="Matched default policy action."
-        )
+        return self._default_decision
@@ -2,20 +2,22 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from collections.abc import Awaitable, Callable
+from collections import deque
+from collections.abc import Awaitable, Callable, Coroutine
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from app.formatting.compaction import compact_tool_output
+from app.formatting.compaction import compact_tool_output, get_compaction_threshold
 from app.llm.client import OllamaClient
 from app.models import ChatMessage
-from app.security.audit import AuditTrail
+from app.security.audit import AsyncAuditTrail, AuditTrail
 from app.security.policy_engine import PolicyEngine
-from app.skills.models import ToolCall
+from app.skills.models import ToolCall, ToolResult
 from app.skills.registry import SkillRegistry
 from app.skills.router import (
     REQUEST_MORE_TOOLS_NAME,
     TOOL_CATEGORIES,
+    build_category_index,
     build_request_more_tools_schema,
     classify_intent,
     select_tools,
@@ -28,42 +30,68 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 MAX_TOOL_ITERATIONS = 5
+# Tool calls from one LLM response that run at once; a runaway response with dozens of
+# calls is flattened instead of fanning out MCP round trips and threads all together
+MAX_PARALLEL_TOOL_CALLS = 8
 
 # Module-level cache: tools don't change at runtime after initialization
 _cached_tools_map: dict[str, dict] | None = None
+# build_category_index() of the tools map it was built from (held so identity is stable)
+_cached_category_index: tuple[dict[str, dict], dict[str, list[tuple[str, dict]]]] | None = None
 
 _policy_engine: PolicyEngine | None = None
-_audit_trail: AuditTrail | None = None
+_audit_trail: AsyncAuditTrail | None = None
+# Double-checked init: a burst of first tool calls builds each object once, not once per call
+_policy_lock = asyncio.Lock()
+_audit_lock = asyncio.Lock()
 
 
 async def get_policy_engine() -> PolicyEngine:
     global _policy_engine
     if _policy_engine is None:
-        loop = asyncio.get_running_loop()
-        _policy_engine = await loop.run_in_executor(
-            None, lambda: PolicyEngine(Path("data/security_policies.yaml"))
-        )
+        async with _policy_lock:
+            if _policy_engine is None:
+                _policy_engine = await asyncio.to_thread(
+                    PolicyEngine, Path("data/security_policies.yaml")
+                )
     return _policy_engine
 
 
-async def get_audit_trail() -> AuditTrail:
+async def get_audit_trail() -> AsyncAuditTrail:
     import os
 
     global _audit_trail
     if _audit_trail is None:
-        loop = asyncio.get_running_loop()
-        hmac_key = os.getenv("AUDIT_HMAC_KEY")
-        if not hmac_key:
-            logger.warning(
-                "AUDIT_HMAC_KEY is not set — audit trail uses plain SHA-256 (no HMAC tamper-evidence). "
-                "Set AUDIT_HMAC_KEY in .env to enable cryptographic tamper protection."
-            )
-        _audit_trail = await loop.run_in_executor(
-            None, lambda: AuditTrail(Path("data/audit_trail.jsonl"), hmac_key=hmac_key)
-        )
+        async with _audit_lock:
+            if _audit_trail is None:
+                hmac_key = os.getenv("AUDIT_HMAC_KEY")
+                if not hmac_key:
+                    logger.warning(
+                        "AUDIT_HMAC_KEY is not set — audit trail uses plain SHA-256 (no HMAC tamper-evidence). "
+                        "Set AUDIT_HMAC_KEY in .env to enable cryptographic tamper protection."
+                    )
+                trail = await asyncio.to_thread(
+                    AuditTrail, Path("data/audit_trail.jsonl"), hmac_key=hmac_key
+                )
+                # Records are queued and appended in batches; execute_tool_loop flushes
+                # each round
+                _audit_trail = AsyncAuditTrail(trail)
     return _audit_trail
 
 
+async def warmup_security() -> None:
+    """Load the policy file and open the audit log before the first tool call needs them."""
+    await asyncio.gather(get_policy_engine(), get_audit_trail())
+
+
+async def close_audit_trail() -> None:
+    """Write the audit records still queued and close the log handle (app shutdown)."""
+    if _audit_trail is None:
+        return
+    await _audit_trail.flush()
+    await asyncio.to_thread(_audit_trail.trail.close)
+
+
 def _build_tools_map(
     skill_registry: SkillRegistry,
     mcp_manager: McpManager | None,
@@ -91,17 +119,63 @@ def _get_cached_tools_map(
     return _cached_tools_map
 
 
+def _get_category_index(all_tools_map: dict[str, dict]) -> dict[str, list[tuple[str, dict]]]:
+    """Return the per-category tool index for all_tools_map, building it once per map."""
+    global _cached_category_index
+    if _cached_category_index is None or _cached_category_index[0] is not all_tools_map:
+        _cached_category_index = (all_tools_map, build_category_index(all_tools_map))
+    return _cached_category_index[1]
+
+
 def reset_tools_cache() -> None:
     """Invalidate the cached tools map so it rebuilds on the next request.
 
     Call this after hot-adding or hot-removing MCP servers, or after
     reloading skills, to ensure the executor picks up the new tools.
     """
-    global _cached_tools_map
+    global _cached_tools_map, _cached_category_index
     _cached_tools_map = None
+    _cached_category_index = None
     logger.info("Tools cache invalidated")
 
 
+def reset_policy_cache() -> None:
+    """Drop the loaded PolicyEngine (and its decision cache).
+
+    The next tool call reloads data/security_policies.yaml, so edited rules apply
+    without a restart.
+    """
+    global _policy_engine
+    _policy_engine = None
+    logger.info("Policy engine cache invalidated")
+
+
+async def _gather_limited(
+    coros: list[Coroutine[Any, Any, ChatMessage]], limit: int
+) -> list[ChatMessage]:
+    """asyncio.gather with at most `limit` coroutines running at once; results keep input order."""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _run(coro: Coroutine[Any, Any, ChatMessage]) -> ChatMessage:
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(_run(coro) for coro in coros))
+
+
+def _fetch_fallback_call(
+    tool_name: str, arguments: dict, mcp_manager: McpManager | None
+) -> ToolCall | None:
+    """mcp-fetch call that replaces a failed Puppeteer tool call, or None if not applicable."""
+    if not tool_name.startswith("puppeteer_") or mcp_manager is None:
+        return None
+    fallback_name = mcp_manager.get_fetch_fallback_tool()
+    url = arguments.get("url") or arguments.get("name") or arguments.get("input", "")
+    if not fallback_name or not url:
+        return None
+    return ToolCall(name=fallback_name, arguments={"url": url})
+
+
 async def _run_tool_call(
     tc: dict,
     skill_registry: SkillRegistry,
@@ -122,124 +196,105 @@ async def _run_tool_call(
     policy = await get_policy_engine()
     audit = await get_audit_trail()
 
-    loop = asyncio.get_running_loop()
-
     decision = policy.evaluate(tool_name, arguments)
 
     if decision.is_blocked:
-        await loop.run_in_executor(
-            None,
-            lambda: audit.record(
-                tool_name, arguments, "block", decision.reason, "blocked_by_policy"
-            ),
-        )
+        audit.record(tool_name, arguments, "block", decision.reason, "blocked_by_policy")
         error_msg = f"Security Policy Blocked execution: {decision.reason}"
         logger.warning(f"Blocked tool {tool_name}: {decision.reason}")
         return ChatMessage(role="tool", content=error_msg)
 
     if decision.requires_flag:
         if hitl_callback:
-            await loop.run_in_executor(
-                None,
-                lambda: audit.record(
-                    tool_name, arguments, "flag", decision.reason, "pending_hitl_approval"
-                ),
-            )
+            audit.record(tool_name, arguments, "flag", decision.reason, "pending_hitl_approval")
             logger.warning(f"Tool {tool_name} flagged for HITL approval: {decision.reason}")
             try:
                 approved = await hitl_callback(tool_name, arguments, decision.reason or "")
                 if not approved:
-                    await loop.run_in_executor(
-                        None,
-                        lambda: audit.record(
-                            tool_name,
-                            arguments,
-                            "blocked_via_hitl",
-                            decision.reason,
-                            "denied_by_user",
-                        ),
+                    audit.record(
+                        tool_name,
+                        arguments,
+                        "blocked_via_hitl",
+                        decision.reason,
+                        "denied_by_user",
                     )
                     return ChatMessage(
                         role="tool", content="Security Policy BLOCK: Execution denied by user."
                     )
-                await loop.run_in_executor(
-                    None,
-                    lambda: audit.record(
-                        tool_name,
-                        arguments,
-                        "allowed_via_hitl",
-                        decision.reason,
-                        "approved_by_user",
-                    ),
+                audit.record(
+                    tool_name,
+                    arguments,
+                    "allowed_via_hitl",
+                    decision.reason,
+                    "approved_by_user",
                 )
             except Exception as e:
                 return ChatMessage(role="tool", content=f"HITL error: {e}")
         else:
-            await loop.run_in_executor(
-                None,
-                lambda: audit.record(
-                    tool_name, arguments, "block", decision.reason, "no_hitl_available"
-                ),
-            )
+            audit.record(tool_name, arguments, "block", decision.reason, "no_hitl_available")
             return ChatMessage(
                 role="tool", content="Security Policy BLOCK: Flagged but no HITL provided."
             )
 
     tool_call = ToolCall(name=tool_name, arguments=arguments)
 
-    trace = get_current_trace()
-    if trace:
-        async with trace.span(f"tool:{tool_name}", kind="tool", parent_id=parent_span_id) as span:
-            span.set_input({"tool": tool_name, "arguments": arguments})
+    # Runtime fallback: if a Puppeteer tool fails, retry with mcp-fetch (plain HTTP).
+    # With speculative_fetch_fallback the fetch is raced alongside the Puppeteer call so a
+    # failure costs no extra round trip; it is cancelled as soon as Puppeteer succeeds.
+    fallback_call = _fetch_fallback_call(tool_name, arguments, mcp_manager)
+    speculative: asyncio.Task[ToolResult] | None = None
+    if (
+        fallback_call is not None
+        and mcp_manager is not None
+        and mcp_manager.speculative_fetch_fallback
+    ):
+        speculative = asyncio.create_task(mcp_manager.execute_tool(fallback_call))
+        # Mark a discarded result's exception as retrieved (no "never retrieved" warning)
+        speculative.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    try:
+        trace = get_current_trace()
+        if trace:
+            async with trace.span(
+                f"tool:{tool_name}", kind="tool", parent_id=parent_span_id
+            ) as span:
+                span.set_input({"tool": tool_name, "arguments": arguments})
+                if mcp_manager and mcp_manager.has_tool(tool_name):
+                    result = await mcp_manager.execute_tool(tool_call)
+                else:
+                    result = await skill_registry.execute_tool(tool_call)
+                span.set_output({"content": result.content[:1000]})
+        else:
             if mcp_manager and mcp_manager.has_tool(tool_name):
                 result = await mcp_manager.execute_tool(tool_call)
             else:
                 result = await skill_registry.execute_tool(tool_call)
-            span.set_output({"content": result.content[:1000]})
-    else:
-        if mcp_manager and mcp_manager.has_tool(tool_name):
-            result = await mcp_manager.execute_tool(tool_call)
+    except BaseException:
+        if speculative is not None:
+            speculative.cancel()
+        raise
+
+    if fallback_call is not None and mcp_manager is not None and not result.success:
+        logger.warning(
+            "Puppeteer tool %s failed, %s mcp-fetch fallback (%s)",
+            tool_name,
+            "using speculative" if speculative is not None else "retrying with",
+            fallback_call.name,
+        )
+        if speculative is not None:
+            fallback_result = await speculative
         else:
-            result = await skill_registry.execute_tool(tool_call)
-
-    # Runtime fallback: if a Puppeteer tool fails, retry with mcp-fetch (plain HTTP)
-    if not result.success and tool_name.startswith("puppeteer_") and mcp_manager is not None:
-        mcp_fetch_tools = {
-            name
-            for name, tool in mcp_manager.get_tools().items()
-            if tool.skill_name == "mcp::mcp-fetch"
-        }
-        if mcp_fetch_tools:
-            url = arguments.get("url") or arguments.get("name") or arguments.get("input", "")
-            if url:
-                fallback_name = next(
-                    (t for t in ("fetch_markdown", "fetch", "fetch_txt") if t in mcp_fetch_tools),
-                    None,
-                )
-                if fallback_name:
-                    logger.warning(
-                        "Puppeteer tool %s failed, retrying with mcp-fetch fallback (%s)",
-                        tool_name,
-                        fallback_name,
-                    )
-                    from app.skills.models import ToolCall as _ToolCall
-
-                    fallback_call = _ToolCall(name=fallback_name, arguments={"url": url})
-                    fallback_result = await mcp_manager.execute_tool(fallback_call)
-                    prefix = "[⚠️ Fallback a mcp-fetch — Puppeteer no respondió]\n"
-                    from app.skills.models import ToolResult as _ToolResult
-
-                    result = _ToolResult(
-                        tool_name=fallback_name,
-                        content=prefix + fallback_result.content,
-                        success=fallback_result.success,
-                    )
+            fallback_result = await mcp_manager.execute_tool(fallback_call)
+        result = ToolResult(
+            tool_name=fallback_call.name,
+            content="[⚠️ Fallback a mcp-fetch — Puppeteer no respondió]\n" + fallback_result.content,
+            success=fallback_result.success,
+        )
+    elif speculative is not None:
+        speculative.cancel()
 
     # Record allowed execution in audit log
-    await loop.run_in_executor(
-        None,
-        lambda: audit.record(tool_name, arguments, "allow", decision.reason, result.content[:200]),
-    )
+    audit.record(tool_name, arguments, "allow", decision.reason, result.content[:200])
 
     logger.debug("Tool Execution RAW PAYLOAD send to %s: %s", tool_name, arguments)
     logger.debug("Tool Execution RAW OUPUT from %s: %r", tool_name, result.content)
@@ -247,13 +302,16 @@ async def _run_tool_call(
 
     final_content = result.content
 
-    # Compress the context if it is massive
-    final_content = await compact_tool_output(
-        tool_name=tool_name,
-        text=final_content,
-        user_request=user_message,
-        ollama_client=ollama_client,
-    )
+    # Compress the context if it is massive (most results are small: skip the call entirely)
+    max_length = get_compaction_threshold()
+    if len(final_content) > max_length:
+        final_content = await compact_tool_output(
+            tool_name=tool_name,
+            text=final_content,
+            user_request=user_message,
+            ollama_client=ollama_client,
+            max_length=max_length,
+        )
 
     if instructions:
         final_content = f"{instructions}\n\nResult:\n{final_content}"
@@ -310,7 +368,10 @@ async def execute_tool_loop(
         return await ollama_client.chat(messages)
 
     # Stage 2: select relevant tools (budget distributed proportionally across categories)
-    tools = select_tools(categories, all_tools_map, max_tools=max_tools)
+    category_index = _get_category_index(all_tools_map)
+    tools = select_tools(
+        categories, all_tools_map, max_tools=max_tools, category_index=category_index
+    )
     logger.info(
         "Tool router: categories=%s, selected %d tools: %s",
         categories,
@@ -341,6 +402,10 @@ async def execute_tool_loop(
             )
             logger.debug("Injected user_facts into tool loop: %s", list(user_facts.keys()))
 
+    # Índices de tool results aún sin compactar. working_messages solo crece por append/extend
+    # dentro del loop, así que los índices son estables y no hace falta re-escanear la lista.
+    tool_indices = deque(i for i, m in enumerate(working_messages) if m.role == "tool")
+
     for iteration in range(MAX_TOOL_ITERATIONS):
         trace = get_current_trace()
         iteration_span_id: str | None = None
@@ -415,7 +480,9 @@ async def execute_tool_loop(
             requested_cats = args.get("categories", [])
             reason = args.get("reason", "")
 
-            new_tools = select_tools(requested_cats, all_tools_map, max_tools=max_tools)
+            new_tools = select_tools(
+                requested_cats, all_tools_map, max_tools=max_tools, category_index=category_index
+            )
             existing_names = {t.get("function", {}).get("name") for t in tools}
             added: list[str] = []
             for tool_schema in new_tools:
@@ -439,10 +506,11 @@ async def execute_tool_loop(
             )
             tool_result_map[i] = ChatMessage(role="tool", content=confirmation)
 
-        # Execute regular tool calls in parallel, preserving original index for ordering
+        # Execute regular tool calls in parallel (at most MAX_PARALLEL_TOOL_CALLS at a
+        # time), preserving original index for ordering
         if regular_indices:
-            regular_results = await asyncio.gather(
-                *[
+            regular_results = await _gather_limited(
+                [
                     _run_tool_call(
                         response.tool_calls[i],
                         skill_registry,
@@ -453,17 +521,23 @@ async def execute_tool_loop(
                         parent_span_id=iteration_span_id,
                     )
                     for i in regular_indices
-                ]
+                ],
+                MAX_PARALLEL_TOOL_CALLS,
             )
             for i, msg in zip(regular_indices, regular_results, strict=True):
                 tool_result_map[i] = msg
+            # The round's audit records go to disk in one append before the next LLM call
+            if _audit_trail is not None:
+                await _audit_trail.flush()
 
         # Append results in original call order
+        start = len(working_messages)
         working_messages.extend(tool_result_map[i] for i in sorted(tool_result_map))
+        tool_indices.extend(range(start, len(working_messages)))
 
         # Tool result clearing: replace old (raw) tool results with compact placeholders
         # to prevent context bloat on iterations 3+. Keep the last 2 rounds intact.
-        _clear_old_tool_results(working_messages, keep_last_n=2)
+        _clear_old_tool_results(working_messages, keep_last_n=2, tool_indices=tool_indices)
 
     # Safety: exceeded max iterations, force a text response without tools
     logger.warning("Max tool iterations (%d) reached, forcing text response", MAX_TOOL_ITERATIONS)
@@ -471,19 +545,26 @@ async def execute_tool_loop(
     return response.content
 
 
-def _clear_old_tool_results(messages: list[ChatMessage], keep_last_n: int = 2) -> None:
+def _clear_old_tool_results(
+    messages: list[ChatMessage],
+    keep_last_n: int = 2,
+    tool_indices: deque[int] | None = None,
+) -> None:
     """Replace old tool results with compact summaries to free context window space.
 
     Keeps the last `keep_last_n` tool messages intact (most recent are most useful).
     This implements the Anthropic-recommended 'tool result clearing' pattern:
     once a raw API response is processed, there's no reason to keep it verbatim.
-    """
-    tool_indices = [i for i, m in enumerate(messages) if m.role == "tool"]
 
-    if len(tool_indices) <= keep_last_n:
-        return  # Not enough tool results to warrant clearing
+    Callers that only append to `messages` can pass `tool_indices`, a deque with the
+    positions of the not-yet-cleared tool messages: cleared entries are popped from it,
+    so each result is summarized once and the list is never rescanned.
+    """
+    if tool_indices is None:
+        tool_indices = deque(i for i, m in enumerate(messages) if m.role == "tool")
 
-    for idx in tool_indices[:-keep_last_n]:
+    while len(tool_indices) > keep_last_n:
+        idx = tool_indices.popleft()
         old_content = messages[idx].content
         first_line = old_content.split("\n")[0][:120].strip()
         messages[idx] = ChatMessage(
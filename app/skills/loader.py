@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import logging
 import re
 from pathlib import Path
@@ -8,13 +9,17 @@ from app.skills.models import SkillMetadata
 
 logger = logging.getLogger(__name__)
 
+_FRONTMATTER_RE = re.compile(r"^---\s*\n(.*?)\n---\s*\n?(.*)", re.DOTALL)
+_LIST_ITEM_RE = re.compile(r"^\s+-\s+(.+)$")
+_KEY_VALUE_RE = re.compile(r"^(\w+)\s*:\s*(.*)$")
+
 
 def parse_frontmatter(text: str) -> tuple[dict[str, str | list[str]], str]:
     """Parse YAML-like frontmatter from a SKILL.md file using regex.
 
     Returns (frontmatter_dict, body_text).
     """
-    match = re.match(r"^---\s*\n(.*?)\n---\s*\n?(.*)", text, re.DOTALL)
+    match = _FRONTMATTER_RE.match(text)
     if not match:
         return {}, text
 
@@ -26,7 +31,7 @@ def parse_frontmatter(text: str) -> tuple[dict[str, str | list[str]], str]:
 
     for line in fm_text.split("\n"):
         # List item under current key
-        list_match = re.match(r"^\s+-\s+(.+)$", line)
+        list_match = _LIST_ITEM_RE.match(line)
         if list_match and current_key is not None:
             val = result.get(current_key)
             if not isinstance(val, list):
@@ -35,7 +40,7 @@ def parse_frontmatter(text: str) -> tuple[dict[str, str | list[str]], str]:
             continue
 
         # Key-value pair
-        kv_match = re.match(r"^(\w+)\s*:\s*(.*)$", line)
+        kv_match = _KEY_VALUE_RE.match(line)
         if kv_match:
             current_key = kv_match.group(1)
             value = kv_match.group(2).strip()
@@ -51,10 +56,18 @@ def parse_frontmatter(text: str) -> tuple[dict[str, str | list[str]], str]:
 def load_skill_metadata(skill_dir: Path) -> SkillMetadata | None:
     """Load a SkillMetadata from a SKILL.md file in the given directory."""
     skill_file = skill_dir / "SKILL.md"
-    if not skill_file.exists():
+    try:
+        st = skill_file.stat()
+    except FileNotFoundError:
         return None
+    # Re-scans (hot reload) only re-parse SKILL.md files whose mtime/size changed
+    return _load_skill_file(str(skill_file), st.st_mtime_ns, st.st_size)
+
 
-    text = skill_file.read_text(encoding="utf-8")
+@functools.lru_cache(maxsize=256)
+def _load_skill_file(path: str, mtime_ns: int, size: int) -> SkillMetadata | None:
+    skill_dir = Path(path).parent
+    text = Path(path).read_text(encoding="utf-8")
     fm, body = parse_frontmatter(text)
 
     name = fm.get("name")
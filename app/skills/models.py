@@ -5,29 +5,36 @@ from dataclasses import dataclass, field
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolDefinition:
     name: str
     description: str
     parameters: dict[str, Any]
     handler: Callable[..., Awaitable[str]]
     skill_name: str | None = None
+    # MCP server that provides the tool, derived once from skill_name "mcp::<server>"
+    server_name: str | None = field(default=None, init=False)
 
+    def __post_init__(self) -> None:
+        if self.skill_name and self.skill_name.startswith("mcp::"):
+            self.server_name = self.skill_name[5:]
 
-@dataclass
+
+@dataclass(slots=True)
 class ToolCall:
     name: str
     arguments: dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolResult:
     tool_name: str
     content: str
     success: bool = True
 
 
-@dataclass
+# Shared between re-scans by the loader's parse cache: never mutated after construction
+@dataclass(slots=True, frozen=True)
 class SkillMetadata:
     name: str
     description: str
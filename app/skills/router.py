@@ -272,10 +272,23 @@ async def classify_intent(
         return DEFAULT_CATEGORIES
 
 
+def build_category_index(all_tools: dict[str, dict]) -> dict[str, list[tuple[str, dict]]]:
+    """Map each category to its (name, schema) pairs that exist in all_tools, in TOOL_CATEGORIES order.
+
+    Built once per tools map (the executor caches it next to the map) so select_tools
+    doesn't re-check every category tool against the map on each request.
+    """
+    return {
+        category: [(name, all_tools[name]) for name in names if name in all_tools]
+        for category, names in TOOL_CATEGORIES.items()
+    }
+
+
 def select_tools(
     categories: list[str],
     all_tools: dict[str, dict],
     max_tools: int = 8,
+    category_index: dict[str, list[tuple[str, dict]]] | None = None,
 ) -> list[dict]:
     """Given categories and a map of all available tools (name -> ollama schema), return filtered list.
 
@@ -291,6 +304,7 @@ def select_tools(
         categories: List of category names from classify_intent.
         all_tools: Dict mapping tool name to its Ollama tool schema dict.
         max_tools: Maximum number of tools to return.
+        category_index: Optional precomputed build_category_index(all_tools).
 
     Returns:
         List of Ollama tool schema dicts, capped at max_tools.
@@ -298,22 +312,30 @@ def select_tools(
     if not categories:
         return []
 
+    if category_index is None:
+        category_index = {
+            category: [
+                (name, all_tools[name])
+                for name in TOOL_CATEGORIES.get(category, [])
+                if name in all_tools
+            ]
+            for category in categories
+        }
+
     selected: list[dict] = []
     seen: set[str] = set()
     per_cat = max(2, max_tools // len(categories))
 
     for category in categories:
-        tool_names = TOOL_CATEGORIES.get(category, [])
         cat_count = 0
-        for name in tool_names:
-            if name in seen:
-                continue
-            if name in all_tools:
-                selected.append(all_tools[name])
-                seen.add(name)
-                cat_count += 1
+        for name, schema in category_index.get(category, ()):
             if cat_count >= per_cat:
                 break
+            if name in seen:
+                continue
+            selected.append(schema)
+            seen.add(name)
+            cat_count += 1
 
     return selected[:max_tools]
 
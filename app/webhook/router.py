@@ -38,9 +38,9 @@ from app.formatting.whatsapp import markdown_to_whatsapp
 from app.llm.client import OllamaClient
 from app.memory.daily_log import DailyLog
 from app.models import ChatMessage, Note, WhatsAppMessage
-from app.profiles.discovery import maybe_discover_profile_updates
+from app.profiles.discovery import is_discovery_turn, maybe_discover_profile_updates
 from app.profiles.onboarding import handle_onboarding_message
-from app.profiles.prompt_builder import build_system_prompt
+from app.profiles.prompt_builder import build_system_prompt_parts
 from app.skills.executor import execute_tool_loop
 from app.skills.registry import SkillRegistry
 from app.skills.router import classify_intent
@@ -174,7 +174,7 @@ async def process_message(
     command_registry,
     memory_file,
     daily_log: DailyLog,
-    transcriber: Transcriber,
+    transcriber: Transcriber | None,
     skill_registry: SkillRegistry,
     mcp_manager: McpManager | None = None,
     vec_available: bool = False,
@@ -347,8 +347,9 @@ def _build_capabilities_section(
         if mcp_tools:
             by_server: dict[str, list[str]] = {}
             for tool in mcp_tools.values():
-                server = tool.skill_name.removeprefix("mcp::")  # type: ignore[union-attr]
-                by_server.setdefault(server, []).append(f"{tool.name}: {tool.description}")
+                by_server.setdefault(tool.server_name, []).append(  # type: ignore[arg-type]
+                    f"{tool.name}: {tool.description}"
+                )
 
             mcp_lines = ["MCP Servers (external integrations):"]
             for server_name, tool_descs in by_server.items():
@@ -425,8 +426,9 @@ def _build_capabilities_for_categories(
             for tool in mcp_tools.values():
                 if relevant_tools and tool.name not in relevant_tools:
                     continue
-                server = tool.skill_name.removeprefix("mcp::")  # type: ignore[union-attr]
-                by_server.setdefault(server, []).append(f"{tool.name}: {tool.description}")
+                by_server.setdefault(tool.server_name, []).append(  # type: ignore[arg-type]
+                    f"{tool.name}: {tool.description}"
+                )
 
             if by_server:
                 mcp_lines = ["MCP Servers (external integrations):"]
@@ -494,11 +496,13 @@ def _build_context(
     summary: str | None,
     history: list[ChatMessage],
     projects_summary: str | None = None,
+    volatile_suffix: str | None = None,
 ) -> list[ChatMessage]:
     """Build LLM context from pre-fetched data (sync, no DB calls).
 
     Consolidates context into a single system message with XML-delimited sections
-    for better attention focus in qwen3:8b.
+    for better attention focus in qwen3:8b. ``volatile_suffix`` (date, debug flag) goes
+    last so it never breaks the cacheable prefix.
     """
     from app.context.context_builder import ContextBuilder
 
@@ -511,9 +515,10 @@ def _build_context(
     if summary:
         builder.add_section("conversation_summary", f"Previous conversation summary:\n{summary}")
 
-    context: list[ChatMessage] = [
-        ChatMessage(role="system", content=builder.build_system_message())
-    ]
+    system_message = builder.build_system_message()
+    if volatile_suffix:
+        system_message = f"{system_message}\n\n{volatile_suffix}"
+    context: list[ChatMessage] = [ChatMessage(role="system", content=system_message)]
     context.extend(history)
     return context
 
@@ -828,7 +833,7 @@ async def _handle_message(
     command_registry,
     memory_file,
     daily_log: DailyLog,
-    transcriber: Transcriber,
+    transcriber: Transcriber | None,
     skill_registry: SkillRegistry,
     mcp_manager: McpManager | None = None,
     vec_available: bool = False,
@@ -836,6 +841,13 @@ async def _handle_message(
 ) -> None:
     # Handle audio: transcribe to text
     if msg.type == "audio" and msg.media_id:
+        if transcriber is None:
+            logger.warning("Audio received before the Whisper model finished loading")
+            await wa_client.send_message(
+                msg.from_number,
+                "I'm still starting up and can't process audio yet. Please try again in a minute.",
+            )
+            return
         try:
             audio_bytes = await wa_client.download_media(msg.media_id)
             transcription = await transcriber.transcribe_async(audio_bytes)
@@ -994,7 +1006,9 @@ async def _handle_message(
     now = datetime.datetime.now(datetime.UTC)
     current_date = now.strftime("%Y-%m-%d")
     base_prompt = await get_active_prompt("system_prompt", repository, settings.system_prompt)
-    system_prompt_with_date = build_system_prompt(
+    # Stable prefix (base + profile) first, volatile suffix (date, debug) at the end of
+    # the system message: keeps the prompt prefix byte-identical for Ollama's KV cache
+    system_prompt_stable, system_prompt_volatile = build_system_prompt_parts(
         base_prompt,
         profile_row["data"],
         current_date,
@@ -1213,7 +1227,7 @@ async def _handle_message(
 
         # Phase D: build context (sync) → main LLM call (~3-8s)
         context = _build_context(
-            system_prompt_with_date,
+            system_prompt_stable,
             memories,
             relevant_notes,
             daily_logs,
@@ -1221,6 +1235,7 @@ async def _handle_message(
             summary,
             history,
             projects_summary=projects_summary,
+            volatile_suffix=system_prompt_volatile,
         )
 
         # Inject mcp-fetch fallback note after context is built (append as system message)
@@ -1417,18 +1432,21 @@ async def _handle_message(
         # Increment profile message count and maybe run progressive discovery
         if settings.onboarding_enabled:
             new_count = await repository.increment_profile_message_count(msg.from_number)
-            _track_task(
-                asyncio.create_task(
-                    maybe_discover_profile_updates(
-                        msg.from_number,
-                        new_count,
-                        settings.profile_discovery_interval,
-                        repository,
-                        ollama_client,
-                        settings,
+            # Gate here too: no background task at all on the (interval - 1) other turns
+            if is_discovery_turn(new_count, settings.profile_discovery_interval):
+                _track_task(
+                    asyncio.create_task(
+                        maybe_discover_profile_updates(
+                            msg.from_number,
+                            new_count,
+                            settings.profile_discovery_interval,
+                            repository,
+                            ollama_client,
+                            settings,
+                            conversation_id=conv_id,
+                        )
                     )
                 )
-            )
 
         # Auto-curate completed trace to eval dataset (best-effort, background)
         if trace_ctx and settings.eval_auto_curate:
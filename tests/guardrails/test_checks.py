@@ -1,6 +1,10 @@
 """Unit tests for individual guardrail checks."""
 
+from app.guardrails import checks as checks_module
 from app.guardrails.checks import (
+    _pii_core,
+    _scan_user_pii,
+    check_combined_llm,
     check_excessive_length,
     check_hallucination,
     check_language_match,
@@ -93,10 +97,58 @@ class TestCheckNoPii:
         result = check_no_pii(user, reply)
         assert result.passed is False
 
+    def test_fails_when_bot_generates_bearer_token_without_digits(self):
+        # Token prefilter must not depend on digits or "@"
+        result = check_no_pii("Dame el header", "Usá Authorization: Bearer abcdefXYZ")
+        assert result.passed is False
+        assert "token" in result.details
+
+    def test_fails_when_bot_generates_phone(self):
+        result = check_no_pii("¿Cuál es el teléfono?", "Llamá al 1145678901")
+        assert result.passed is False
+        assert "phone" in result.details
+
+    def test_passes_when_phone_is_reformatted_from_user_text(self):
+        result = check_no_pii("Mi número es 11 4567-8901", "Te llamo al 1145678901")
+        assert result.passed is True
+
+    def test_ignores_iso_dates(self):
+        result = check_no_pii("¿Cuándo vence?", "Vence el 2025-03-14, no te olvides.")
+        assert result.passed is True
+
     def test_check_name(self):
         result = check_no_pii("hola", "hola")
         assert result.check_name == "no_pii"
 
+    def test_repeated_call_is_memoized(self, mocker):
+        _pii_core.cache_clear()
+        _scan_user_pii.cache_clear()
+        spy = mocker.spy(checks_module, "_extract_pii")
+        user = "¿Cuál es mi email?"
+        reply = "Tu email es otro@empresa.com"
+        first = check_no_pii(user, reply)
+        second = check_no_pii(user, reply)
+        assert first.details == second.details
+        assert second.passed is False
+        assert spy.call_count == 2  # reply + user_text, only on the first call
+
+    def test_user_side_scan_reused_across_replies(self, mocker):
+        _scan_user_pii.cache_clear()
+        spy = mocker.spy(checks_module, "_extract_pii")
+        user = "Escribime a yo@casa.com"
+        check_no_pii(user, "Anotado: otro@empresa.com")
+        check_no_pii(user, "Perdón, quise decir tercero@empresa.com")
+        scanned = [call.args[0] for call in spy.call_args_list]
+        assert scanned.count(user) == 1
+
+    def test_accepts_precomputed_user_pii(self):
+        user = "Mi email es test@example.com"
+        user_pii = _scan_user_pii(user)
+        result = check_no_pii(user, "Confirmo test@example.com", user_pii=user_pii)
+        assert result.passed is True
+        result = check_no_pii(user, "Te escribo a otro@example.com", user_pii=user_pii)
+        assert result.passed is False
+
 
 class TestCheckLanguageMatch:
     def test_skips_when_user_text_too_short(self):
@@ -188,6 +240,47 @@ class TestCheckHallucination:
         assert "check error" in result.details
 
 
+class TestCheckCombinedLlm:
+    async def test_single_call_for_both_judgments(self, mocker):
+        mock_client = mocker.AsyncMock()
+        mock_client.chat.return_value = "coherent: yes\nhallucination: no"
+        results = await check_combined_llm("¿Qué hora es?", "Son las 3pm.", mock_client)
+        mock_client.chat.assert_called_once()
+        assert [r.check_name for r in results] == ["tool_coherence", "hallucination_check"]
+        assert all(r.passed for r in results)
+
+    async def test_fails_each_judgment_independently(self, mocker):
+        mock_client = mocker.AsyncMock()
+        mock_client.chat.return_value = "Coherent: no\nHallucination: yes"
+        coherence, hallucination = await check_combined_llm("q", "a", mock_client)
+        assert coherence.passed is False
+        assert "incoherent" in coherence.details
+        assert hallucination.passed is False
+        assert "hallucination" in hallucination.details
+
+    async def test_without_coherence_accepts_bare_answer(self, mocker):
+        mock_client = mocker.AsyncMock()
+        mock_client.chat.return_value = "yes"
+        results = await check_combined_llm("q", "a", mock_client, include_coherence=False)
+        assert [r.check_name for r in results] == ["hallucination_check"]
+        assert results[0].passed is False
+
+    async def test_missing_verdict_fails_open(self, mocker):
+        mock_client = mocker.AsyncMock()
+        mock_client.chat.return_value = "hallucination: no"
+        coherence, hallucination = await check_combined_llm("q", "a", mock_client)
+        assert coherence.passed is True
+        assert "no verdict" in coherence.details
+        assert hallucination.passed is True
+
+    async def test_fails_open_on_exception(self, mocker):
+        mock_client = mocker.AsyncMock()
+        mock_client.chat.side_effect = RuntimeError("boom")
+        results = await check_combined_llm("hello", "hi", mock_client)
+        assert all(r.passed for r in results)
+        assert all("check error" in r.details for r in results)
+
+
 class TestRedactPii:
     def test_redacts_email(self):
         text = "Contacta a user@example.com para más info"
@@ -146,6 +146,8 @@ async def test_pipeline_llm_checks_tool_coherence_included_when_tools_used(mocke
     check_names = {r.check_name for r in report.results}
     assert "tool_coherence" in check_names
     assert "hallucination_check" in check_names
+    # Both judgments are batched into a single Ollama call
+    assert mock_client.chat.call_count == 1
 
 
 @pytest.mark.asyncio
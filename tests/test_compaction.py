@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
-from app.formatting.compaction import compact_tool_output
+from app.formatting.compaction import compact_tool_output, get_compaction_threshold
 
 
 async def test_compact_returns_as_is_when_small():
@@ -82,3 +82,15 @@ async def test_compact_hard_truncate_on_llm_failure():
 
     assert result.endswith("…[truncated]")
     assert len(result) <= 120  # 100 chars + suffix
+
+
+def test_compaction_threshold_is_read_once():
+    get_compaction_threshold.cache_clear()
+    fake_settings = MagicMock(return_value=MagicMock(compaction_threshold=1234))
+    try:
+        with patch("app.config.Settings", fake_settings):
+            assert get_compaction_threshold() == 1234
+            assert get_compaction_threshold() == 1234
+        fake_settings.assert_called_once()
+    finally:
+        get_compaction_threshold.cache_clear()
@@ -81,3 +81,22 @@ def test_history_appended_after_system():
     # History messages follow
     assert context[1].role == "user"
     assert context[2].role == "assistant"
+
+
+def test_volatile_suffix_goes_after_sections():
+    """Date/debug suffix ends the system message so the prefix stays cacheable."""
+    from app.webhook.router import _build_context
+
+    context = _build_context(
+        system_prompt="sys",
+        memories=["likes tea"],
+        relevant_notes=[],
+        daily_logs=None,
+        skills_summary=None,
+        summary=None,
+        history=[],
+        volatile_suffix="Current Date: 2026-02-19",
+    )
+    content = context[0].content
+    assert content.startswith("sys\n")
+    assert content.endswith("</user_memories>\n\nCurrent Date: 2026-02-19")
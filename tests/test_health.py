@@ -23,3 +23,26 @@ def test_health_ollama_down(client):
     data = resp.json()
     assert data["status"] == "degraded"
     assert data["checks"]["available"] is False
+
+
+def test_health_live(client):
+    resp = client.get("/health/live")
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "ok"}
+
+
+def test_health_ready_until_deferred_init_finishes(client):
+    import asyncio
+
+    client.app.state.ready = asyncio.Event()
+    try:
+        resp = client.get("/health/ready")
+        assert resp.status_code == 503
+        assert resp.json() == {"status": "starting"}
+
+        client.app.state.ready.set()
+        resp = client.get("/health/ready")
+        assert resp.status_code == 200
+        assert resp.json() == {"status": "ready"}
+    finally:
+        del client.app.state.ready
@@ -44,3 +44,67 @@ async def test_sync_overwrites_previous(memory_file):
     content = memory_file._path.read_text()
     assert "old data" not in content
     assert "new data" in content
+
+
+async def test_sync_replaces_file_atomically(memory_file):
+    await memory_file.sync([Memory(id=1, content="old data", created_at="2024-01-01")])
+    await memory_file.sync([Memory(id=2, content="new data", created_at="2024-01-02")])
+
+    assert "new data" in memory_file._path.read_text()
+    # The staging file is renamed over MEMORY.md, never left behind
+    assert [p.name for p in memory_file._path.parent.iterdir()] == ["MEMORY.md"]
+
+
+async def test_delete_lines_splices_out_entries(memory_file):
+    memories = [
+        Memory(id=1, content="keep one", created_at="2024-01-01"),
+        Memory(id=2, content="drop me", category="misc", created_at="2024-01-02"),
+        Memory(id=3, content="hidden", category="self_correction", created_at="2024-01-03"),
+        Memory(id=4, content="keep twö", created_at="2024-01-04"),
+        Memory(id=5, content="drop me too", created_at="2024-01-05"),
+    ]
+    await memory_file.sync(memories)
+
+    assert await memory_file.delete_lines([2, 3]) is True
+    assert await memory_file.delete_lines([5]) is True  # index was shifted after the splice
+
+    spliced = memory_file._path.read_text(encoding="utf-8")
+    await memory_file.sync([memories[0], memories[3]])
+    assert spliced == memory_file._path.read_text(encoding="utf-8")
+
+
+async def test_delete_lines_refuses_stale_index(memory_file):
+    assert await memory_file.delete_lines([1]) is False  # never synced
+
+    await memory_file.sync([Memory(id=1, content="a", created_at="2024-01-01")])
+    assert await memory_file.delete_lines([99]) is False  # unknown id
+
+    memory_file._path.write_text("# Memories\n\n- edited by hand\n", encoding="utf-8")
+    assert await memory_file.delete_lines([1]) is False
+    assert "edited by hand" in memory_file._path.read_text(encoding="utf-8")
+
+
+async def test_overlapping_syncs_collapse_to_latest(memory_file, monkeypatch):
+    import asyncio
+
+    from app.memory import markdown
+
+    writes = []
+    real_write = markdown._write_memory_file
+
+    def counting_write(path, memories):
+        writes.append([m.content for m in memories])
+        return real_write(path, memories)
+
+    monkeypatch.setattr(markdown, "_write_memory_file", counting_write)
+
+    await asyncio.gather(
+        *(
+            memory_file.sync([Memory(id=i, content=f"v{i}", created_at="2024-01-01")])
+            for i in range(5)
+        )
+    )
+
+    assert len(writes) <= 2
+    assert writes[-1] == ["v4"]
+    assert "- v4" in memory_file._path.read_text()
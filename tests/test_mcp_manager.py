@@ -155,6 +155,35 @@ async def test_initialize_disabled_server(tmp_path):
     mgr._connect_server.assert_not_called()
 
 
+async def test_initialize_connects_servers_concurrently(tmp_path):
+    """Enabled servers connect in parallel; one failing doesn't block the others."""
+    import asyncio
+
+    config = tmp_path / "mcp.json"
+    config.write_text(
+        json.dumps({"servers": {"a": {"command": "x"}, "b": {"command": "y"}, "c": {"url": "z"}}})
+    )
+
+    mgr = McpManager(config_path=str(config))
+    started: list[str] = []
+    release = asyncio.Event()
+
+    async def fake_connect(name, cfg):
+        started.append(name)
+        if len(started) == 3:
+            release.set()
+        # Would deadlock if connections were awaited one after another
+        await asyncio.wait_for(release.wait(), timeout=1.0)
+        if name == "b":
+            raise RuntimeError("boom")
+
+    mgr._connect_server = fake_connect
+    await mgr.initialize()
+
+    assert sorted(started) == ["a", "b", "c"]
+    assert set(mgr._server_configs) == {"a", "b", "c"}
+
+
 async def test_has_tool_and_execute():
     """has_tool and execute_tool work correctly."""
     mgr = McpManager(config_path="/nonexistent")
@@ -260,6 +289,35 @@ async def test_cleanup():
     assert mgr._tools == {}
 
 
+async def test_cleanup_closes_servers_concurrently():
+    """Stacks are closed in parallel and one failure doesn't block the others."""
+    import asyncio
+
+    mgr = McpManager(config_path="/nonexistent")
+    closing = 0
+    peak = 0
+
+    class SlowStack:
+        def __init__(self, fail: bool = False):
+            self.fail = fail
+
+        async def aclose(self):
+            nonlocal closing, peak
+            closing += 1
+            peak = max(peak, closing)
+            await asyncio.sleep(0.05)
+            closing -= 1
+            if self.fail:
+                raise RuntimeError("boom")
+
+    mgr._server_stacks = {"a": SlowStack(), "b": SlowStack(fail=True), "c": SlowStack()}
+
+    await mgr.cleanup()
+
+    assert peak == 3
+    assert mgr._server_stacks == {}
+
+
 # --- Tool executor integration with MCP ---
 
 
@@ -334,7 +392,7 @@ async def test_executor_routes_to_mcp_manager():
         ),
         sync_patch(
             "app.skills.executor.select_tools",
-            side_effect=lambda cats, all_tools, max_tools=8: list(all_tools.values()),
+            side_effect=lambda cats, all_tools, max_tools=8, **_: list(all_tools.values()),
         ),
         sync_patch(
             "app.skills.executor.get_policy_engine",
@@ -423,3 +481,406 @@ async def test_get_tools_summary_no_description_fallback():
     summary = mgr.get_tools_summary()
     assert "myserver (myserver):" in summary
     assert "- some_tool: Does something" in summary
+
+
+async def test_tool_views_cached_until_tools_change():
+    """get_ollama_tools/get_tools_summary are built once and rebuilt after cleanup."""
+    from app.skills.models import ToolDefinition
+
+    mgr = McpManager(config_path="/nonexistent")
+
+    async def h(**kwargs):
+        return ""
+
+    mgr._tools["some_tool"] = ToolDefinition(
+        name="some_tool",
+        description="Does something",
+        parameters={},
+        handler=h,
+        skill_name="mcp::myserver",
+    )
+
+    tools = mgr.get_ollama_tools()
+    summary = mgr.get_tools_summary()
+    assert mgr.get_ollama_tools() is tools
+    assert mgr.get_tools_summary() is summary
+
+    await mgr.cleanup()
+    assert mgr.get_ollama_tools() == []
+    assert mgr.get_tools_summary() is None
+
+
+def test_server_env_overrides_do_not_leak_between_servers():
+    from app.mcp.manager import _BASE_ENV, _server_env
+
+    env_a = _server_env({"env": {"MCP_TEST_TOKEN": "a"}})
+    env_b = _server_env({})
+
+    assert env_a["MCP_TEST_TOKEN"] == "a"
+    assert "MCP_TEST_TOKEN" not in env_b
+    assert "MCP_TEST_TOKEN" not in _BASE_ENV
+    assert env_b == dict(_BASE_ENV)
+
+
+def test_tool_definition_server_name_derived_from_skill_name():
+    from app.skills.models import ToolDefinition
+
+    async def h(**kwargs):
+        return ""
+
+    mcp_tool = ToolDefinition(
+        name="t", description="", parameters={}, handler=h, skill_name="mcp::fs"
+    )
+    local_tool = ToolDefinition(
+        name="u", description="", parameters={}, handler=h, skill_name="notes"
+    )
+
+    assert mcp_tool.server_name == "fs"
+    assert local_tool.server_name is None
+
+
+# --- lazy connect tests ---
+
+
+def _lazy_config(tmp_path, tools=None):
+    cfg = {"command": "echo", "args": []}
+    if tools is not None:
+        cfg["tools"] = tools
+    config = tmp_path / "mcp.json"
+    config.write_text(json.dumps({"servers": {"fs": cfg}}))
+    return config
+
+
+async def test_initialize_lazy_server_registers_stubs_without_connecting(tmp_path):
+    config = _lazy_config(
+        tmp_path, tools=[{"name": "read_file", "description": "Read", "parameters": {}}]
+    )
+    mgr = McpManager(config_path=str(config))
+    mgr._connect_server = AsyncMock()
+
+    await mgr.initialize()
+
+    mgr._connect_server.assert_not_called()
+    assert mgr.has_tool("read_file")
+    assert mgr.get_tools()["read_file"].server_name == "fs"
+    assert mgr.list_servers()[0]["status"] == "idle"
+
+
+async def test_lazy_server_connects_once_on_first_call(tmp_path):
+    from app.skills.models import ToolDefinition
+
+    config = _lazy_config(
+        tmp_path, tools=[{"name": "read_file", "description": "Read", "parameters": {}}]
+    )
+    mgr = McpManager(config_path=str(config))
+    await mgr.initialize()
+
+    real_handler = AsyncMock(return_value="file contents")
+    connects = 0
+
+    async def fake_connect(name, cfg):
+        nonlocal connects
+        connects += 1
+        mgr._sessions[name] = MagicMock()
+        mgr._tools["read_file"] = ToolDefinition(
+            name="read_file",
+            description="Read",
+            parameters={},
+            handler=real_handler,
+            skill_name=f"mcp::{name}",
+        )
+
+    mgr._connect_server = fake_connect
+
+    import asyncio
+
+    results = await asyncio.gather(
+        mgr.execute_tool(ToolCall(name="read_file", arguments={"path": "a"})),
+        mgr.execute_tool(ToolCall(name="read_file", arguments={"path": "b"})),
+    )
+
+    assert connects == 1
+    assert [r.content for r in results] == ["file contents", "file contents"]
+    assert mgr.list_servers()[0]["status"] == "connected"
+
+
+async def test_lazy_server_connect_failure_returns_error(tmp_path):
+    config = _lazy_config(
+        tmp_path, tools=[{"name": "read_file", "description": "Read", "parameters": {}}]
+    )
+    mgr = McpManager(config_path=str(config))
+    await mgr.initialize()
+    mgr._connect_server = AsyncMock()  # connects nothing
+
+    result = await mgr.execute_tool(ToolCall(name="read_file", arguments={}))
+
+    assert "unavailable" in result.content
+    assert mgr.list_servers()[0]["status"] == "idle"
+
+
+async def test_hot_add_lazy_server_connects_it_once(tmp_path):
+    from app.skills.models import ToolDefinition
+
+    config = _lazy_config(
+        tmp_path, tools=[{"name": "read_file", "description": "Read", "parameters": {}}]
+    )
+    mgr = McpManager(config_path=str(config))
+    await mgr.initialize()
+
+    connects = 0
+
+    async def fake_connect(name, cfg):
+        nonlocal connects
+        connects += 1
+        mgr._sessions[name] = MagicMock()
+        for tool_name in ("read_file", "write_file"):
+            mgr._add_tool(
+                ToolDefinition(
+                    name=tool_name,
+                    description=tool_name,
+                    parameters={},
+                    handler=AsyncMock(return_value="ok"),
+                    skill_name=f"mcp::{name}",
+                )
+            )
+
+    mgr._connect_server = fake_connect
+
+    import asyncio
+
+    msg, result = await asyncio.gather(
+        mgr.hot_add_server("fs", {"command": "echo", "args": []}),
+        mgr.execute_tool(ToolCall(name="read_file", arguments={})),
+    )
+
+    assert connects == 1
+    assert msg == "Connected 'fs': 1 new tool(s) available."
+    assert result.content == "ok"
+    assert [(s["name"], s["status"]) for s in mgr.list_servers()] == [("fs", "connected")]
+
+
+async def test_hot_add_lazy_server_failure_keeps_it_idle(tmp_path):
+    config = _lazy_config(
+        tmp_path, tools=[{"name": "read_file", "description": "Read", "parameters": {}}]
+    )
+    mgr = McpManager(config_path=str(config))
+    await mgr.initialize()
+    lazy_cfg = mgr._server_configs["fs"]
+    mgr._connect_server = AsyncMock()  # connects nothing
+
+    msg = await mgr.hot_add_server("fs", {"command": "other"})
+
+    assert msg.startswith("Failed to connect")
+    assert mgr._server_configs["fs"] is lazy_cfg
+    assert [(s["name"], s["status"]) for s in mgr.list_servers()] == [("fs", "idle")]
+
+
+async def test_load_tools_persists_manifest(tmp_path):
+    config = _lazy_config(tmp_path)
+    mgr = McpManager(config_path=str(config))
+    mgr._server_configs["fs"] = json.loads(config.read_text())["servers"]["fs"]
+
+    tool = MagicMock()
+    tool.name = "read_file"
+    tool.description = "Read"
+    tool.inputSchema = {"type": "object", "properties": {}}
+    session = MagicMock()
+    session.list_tools = AsyncMock(return_value=MagicMock(tools=[tool]))
+
+    await mgr._load_tools("fs", session)
+    assert mgr._manifest_dirty
+    await mgr._persist_config()
+
+    saved = json.loads(config.read_text())["servers"]["fs"]["tools"]
+    assert saved == [{"name": "read_file", "description": "Read", "parameters": tool.inputSchema}]
+    assert not mgr._manifest_dirty
+
+
+async def test_invalidate_tools_cache_drops_local_views():
+    mgr = McpManager(config_path="/nonexistent")
+    mgr._ollama_tools_cache = [{"stale": True}]
+    mgr._summary_cache = "stale"
+
+    mgr._invalidate_tools_cache()
+
+    assert mgr.get_ollama_tools() == []
+    assert mgr._summary_cache is None
+
+
+async def test_tools_by_server_index_tracks_collisions_and_removal():
+    from app.skills.models import ToolDefinition
+
+    async def h(**kwargs):
+        return ""
+
+    mgr = McpManager(config_path="/nonexistent")
+    for server, name in (("a", "shared"), ("a", "only_a"), ("b", "shared")):
+        mgr._add_tool(
+            ToolDefinition(
+                name=name, description="", parameters={}, handler=h, skill_name=f"mcp::{server}"
+            )
+        )
+    mgr._sessions["a"] = MagicMock()
+    mgr._sessions["b"] = MagicMock()
+
+    counts = {s["name"]: s["tools"] for s in mgr.list_servers()}
+    assert counts == {"a": 1, "b": 1}
+
+    mgr._persist_config = AsyncMock()
+    await mgr.hot_remove_server("a")
+    assert set(mgr.get_tools()) == {"shared"}
+    assert mgr.get_tools()["shared"].server_name == "b"
+
+
+def test_read_config_caches_parse_until_file_changes(tmp_path, monkeypatch):
+    from app.mcp import manager as manager_mod
+
+    config = tmp_path / "mcp_servers.json"
+    config.write_text(json.dumps({"servers": {"fs": {"command": "x"}}}))
+
+    first = manager_mod._read_config(str(config))
+    first["servers"]["fs"]["enabled"] = False  # a manager mutating its own copy
+
+    loads = 0
+    real_load = json.load
+
+    def counting_load(f):
+        nonlocal loads
+        loads += 1
+        return real_load(f)
+
+    monkeypatch.setattr(manager_mod.json, "load", counting_load)
+    second = manager_mod._read_config(str(config))
+    assert loads == 0
+    assert second == {"servers": {"fs": {"command": "x"}}}
+
+    manager_mod._write_config(str(config), json.dumps({"servers": {}}))
+    assert manager_mod._read_config(str(config)) == {"servers": {}}
+    assert loads == 1
+
+
+def _puppeteer_and_fetch_manager(puppeteer_handler, fetch_handler, speculative: bool) -> McpManager:
+    from app.skills.models import ToolDefinition
+
+    mgr = McpManager(config_path="/nonexistent.json", speculative_fetch_fallback=speculative)
+    for name, server, handler in (
+        ("puppeteer_navigate", "puppeteer", puppeteer_handler),
+        ("fetch_markdown", "mcp-fetch", fetch_handler),
+    ):
+        mgr._add_tool(
+            ToolDefinition(
+                name=name,
+                description=name,
+                parameters={"type": "object", "properties": {}},
+                handler=handler,
+                skill_name=f"mcp::{server}",
+            )
+        )
+    return mgr
+
+
+async def _run_puppeteer_call(mgr: McpManager):
+    from unittest.mock import patch
+
+    from app.skills.executor import _run_tool_call
+
+    allow = MagicMock(is_blocked=False, requires_flag=False, reason=None)
+    policy = MagicMock()
+    policy.evaluate.return_value = allow
+    tc = {"function": {"name": "puppeteer_navigate", "arguments": {"url": "https://x.test"}}}
+    with (
+        patch("app.skills.executor.get_policy_engine", return_value=policy),
+        patch("app.skills.executor.get_audit_trail", return_value=MagicMock()),
+        patch("app.skills.executor.get_compaction_threshold", return_value=20000),
+    ):
+        registry = MagicMock()
+        registry.get_skill_instructions.return_value = None
+        return await _run_tool_call(tc, registry, mgr, MagicMock(), "open it")
+
+
+async def test_fetch_fallback_retries_after_puppeteer_failure():
+    calls: list[str] = []
+
+    async def puppeteer(**kwargs):
+        calls.append("puppeteer")
+        raise RuntimeError("browser crashed")
+
+    async def fetch(**kwargs):
+        calls.append("fetch")
+        return "# page"
+
+    mgr = _puppeteer_and_fetch_manager(puppeteer, fetch, speculative=False)
+    assert mgr.get_fetch_fallback_tool() == "fetch_markdown"
+
+    msg = await _run_puppeteer_call(mgr)
+    assert calls == ["puppeteer", "fetch"]
+    assert msg.content == "[⚠️ Fallback a mcp-fetch — Puppeteer no respondió]\n# page"
+
+
+async def test_speculative_fetch_fallback_overlaps_and_is_cancelled_on_success():
+    import asyncio
+
+    fetch_started = asyncio.Event()
+    fetch_cancelled = asyncio.Event()
+
+    async def puppeteer(**kwargs):
+        await fetch_started.wait()  # only returns if the fallback is already in flight
+        return "rendered"
+
+    async def fetch(**kwargs):
+        fetch_started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            fetch_cancelled.set()
+            raise
+        return "static"
+
+    mgr = _puppeteer_and_fetch_manager(puppeteer, fetch, speculative=True)
+    msg = await asyncio.wait_for(_run_puppeteer_call(mgr), timeout=2)
+    assert msg.content == "rendered"
+    await asyncio.wait_for(fetch_cancelled.wait(), timeout=1)
+
+
+async def test_speculative_fetch_fallback_reuses_inflight_result_on_failure():
+    fetch_calls = 0
+
+    async def puppeteer(**kwargs):
+        raise RuntimeError("browser crashed")
+
+    async def fetch(**kwargs):
+        nonlocal fetch_calls
+        fetch_calls += 1
+        return "# page"
+
+    mgr = _puppeteer_and_fetch_manager(puppeteer, fetch, speculative=True)
+    msg = await _run_puppeteer_call(mgr)
+    assert fetch_calls == 1
+    assert msg.content.endswith("# page")
+
+
+def test_fetch_fallback_tool_is_cached_until_tools_change():
+    from app.skills.models import ToolDefinition
+
+    async def handler(**kwargs):
+        return "ok"
+
+    mgr = _puppeteer_and_fetch_manager(handler, handler, speculative=False)
+    assert mgr.get_fetch_fallback_tool() == "fetch_markdown"
+
+    mgr._remove_server_tools("mcp-fetch")
+    assert mgr.get_fetch_fallback_tool() == "fetch_markdown"  # cached
+    mgr._tools_changed()
+    assert mgr.get_fetch_fallback_tool() is None
+
+    mgr._add_tool(
+        ToolDefinition(
+            name="fetch_txt",
+            description="fetch_txt",
+            parameters={"type": "object", "properties": {}},
+            handler=handler,
+            skill_name="mcp::mcp-fetch",
+        )
+    )
+    mgr._tools_changed()
+    assert mgr.get_fetch_fallback_tool() == "fetch_txt"
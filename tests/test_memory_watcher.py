@@ -39,6 +39,16 @@ Some random text
     assert len(result) == 2
 
 
+def test_parse_memory_file_whitespace_and_crlf():
+    content = "# Memories\r\n  - Indented one  \r\n-\t[work]\tTabs\r\n- [empty]\r\n-   \r\n-\n- next line\n"
+    assert parse_memory_file(content) == [
+        ("Indented one", None),
+        ("Tabs", "work"),
+        ("[empty]", None),
+        ("next line", None),
+    ]
+
+
 @pytest.fixture
 async def watcher_setup(tmp_path):
     conn, _vec = await init_db(":memory:")
@@ -137,3 +147,73 @@ async def test_memory_file_sync_with_watcher(watcher_setup):
 
     # Guard should be cleared after sync
     assert not watcher._syncing.is_set()
+
+
+async def test_sync_from_file_skips_unchanged_file(watcher_setup, monkeypatch):
+    repo, mf, tmp_path = watcher_setup
+    import asyncio
+    import os
+
+    watcher = MemoryWatcher(memory_file=mf, repository=repo, loop=asyncio.get_event_loop())
+    path = tmp_path / "MEMORY.md"
+    path.write_text("# Memories\n\n- Stable memory\n", encoding="utf-8")
+    await watcher._sync_from_file()
+
+    calls = 0
+    original = repo.list_memories
+
+    async def counting_list_memories():
+        nonlocal calls
+        calls += 1
+        return await original()
+
+    monkeypatch.setattr(repo, "list_memories", counting_list_memories)
+
+    # Same stat: skipped before reading
+    await watcher._sync_from_file()
+    # Touched (new mtime) but identical content: skipped after hashing
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    await watcher._sync_from_file()
+    assert calls == 0
+
+    # A DB-driven rewrite forgets the cached state
+    watcher.set_sync_guard()
+    watcher.clear_sync_guard()
+    await watcher._sync_from_file()
+    assert calls == 1
+
+
+async def test_sync_from_file_recategorizes_in_place(watcher_setup):
+    repo, mf, tmp_path = watcher_setup
+    import asyncio
+
+    watcher = MemoryWatcher(memory_file=mf, repository=repo, loop=asyncio.get_event_loop())
+    memory_id = await repo.add_memory("Likes tea", "food")
+
+    (tmp_path / "MEMORY.md").write_text("# Memories\n\n- [drinks] Likes tea\n", encoding="utf-8")
+    await watcher._sync_from_file()
+
+    memories = await repo.list_memories()
+    assert [(m.id, m.content, m.category) for m in memories] == [(memory_id, "Likes tea", "drinks")]
+
+
+async def test_burst_of_file_events_triggers_one_sync(watcher_setup, monkeypatch):
+    repo, mf, tmp_path = watcher_setup
+    import asyncio
+
+    watcher = MemoryWatcher(memory_file=mf, repository=repo, loop=asyncio.get_running_loop())
+    calls = 0
+
+    async def counting_sync():
+        nonlocal calls
+        calls += 1
+
+    monkeypatch.setattr(watcher, "_sync_from_file", counting_sync)
+
+    # e.g. modified + created for one editor save, delivered from the watchdog thread
+    for _ in range(3):
+        await asyncio.to_thread(watcher._on_file_changed)
+    await asyncio.sleep(0.3)
+
+    assert calls == 1
@@ -93,3 +93,244 @@ async def test_chat_without_images_excludes_key(ollama_client):
 
     payload = ollama_client._http.post.call_args.kwargs["json"]
     assert "images" not in payload["messages"][0]
+
+
+@pytest.mark.asyncio
+async def test_keep_alive_sent_on_chat_and_embed():
+    mock_http = AsyncMock()
+    client = OllamaClient(
+        http_client=mock_http,
+        base_url="http://localhost:11434",
+        model="test-model",
+        keep_alive="24h",
+    )
+    mock_response = MagicMock()
+    mock_response.raise_for_status = MagicMock()
+    mock_response.json.return_value = {
+        "message": {"role": "assistant", "content": "Hi"},
+        "embeddings": [[0.1]],
+    }
+    mock_http.post = AsyncMock(return_value=mock_response)
+
+    await client.chat([ChatMessage(role="user", content="Hello")])
+    assert mock_http.post.call_args.kwargs["json"]["keep_alive"] == "24h"
+
+    await client.embed(["text"])
+    assert mock_http.post.call_args.kwargs["json"]["keep_alive"] == "24h"
+
+
+@pytest.mark.asyncio
+async def test_keep_alive_bare_integer_sent_as_number():
+    mock_http = AsyncMock()
+    client = OllamaClient(
+        http_client=mock_http,
+        base_url="http://localhost:11434",
+        model="test-model",
+        keep_alive="-1",
+    )
+    mock_response = MagicMock()
+    mock_response.raise_for_status = MagicMock()
+    mock_response.json.return_value = {
+        "message": {"role": "assistant", "content": "Hi"},
+        "embeddings": [[0.1]],
+    }
+    mock_http.post = AsyncMock(return_value=mock_response)
+
+    await client.chat([ChatMessage(role="user", content="Hello")])
+    keep_alive = mock_http.post.call_args.kwargs["json"]["keep_alive"]
+    assert keep_alive == -1 and isinstance(keep_alive, int)
+
+    await client.embed(["text"])
+    assert mock_http.post.call_args.kwargs["json"]["keep_alive"] == -1
+
+    await client.preload()
+    assert mock_http.post.call_args.kwargs["json"]["keep_alive"] == -1
+
+
+@pytest.mark.asyncio
+async def test_keep_alive_omitted_by_default(ollama_client):
+    mock_response = MagicMock()
+    mock_response.raise_for_status = MagicMock()
+    mock_response.json.return_value = {"message": {"role": "assistant", "content": "Hi"}}
+    ollama_client._http.post = AsyncMock(return_value=mock_response)
+
+    await ollama_client.chat([ChatMessage(role="user", content="Hello")])
+    assert "keep_alive" not in ollama_client._http.post.call_args.kwargs["json"]
+
+
+@pytest.mark.asyncio
+async def test_chat_cache_returns_hit_without_post(ollama_client):
+    mock_response = MagicMock()
+    mock_response.raise_for_status = MagicMock()
+    mock_response.json.return_value = {"message": {"role": "assistant", "content": "yes"}}
+    ollama_client._http.post = AsyncMock(return_value=mock_response)
+
+    messages = [ChatMessage(role="user", content="Is this coherent?")]
+    first = await ollama_client.chat(messages, think=False, cache=True)
+    second = await ollama_client.chat(messages, think=False, cache=True)
+
+    assert first == second == "yes"
+    ollama_client._http.post.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_chat_without_cache_always_posts(ollama_client):
+    mock_response = MagicMock()
+    mock_response.raise_for_status = MagicMock()
+    mock_response.json.return_value = {"message": {"role": "assistant", "content": "hi"}}
+    ollama_client._http.post = AsyncMock(return_value=mock_response)
+
+    messages = [ChatMessage(role="user", content="Hi")]
+    await ollama_client.chat(messages)
+    await ollama_client.chat(messages)
+
+    assert ollama_client._http.post.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_chat_cache_evicts_least_recently_used():
+    mock_http = AsyncMock()
+    client = OllamaClient(
+        http_client=mock_http,
+        base_url="http://localhost:11434",
+        model="test-model",
+        response_cache_size=1,
+    )
+    mock_response = MagicMock()
+    mock_response.raise_for_status = MagicMock()
+    mock_response.json.return_value = {"message": {"role": "assistant", "content": "no"}}
+    mock_http.post = AsyncMock(return_value=mock_response)
+
+    a = [ChatMessage(role="user", content="a")]
+    b = [ChatMessage(role="user", content="b")]
+    await client.chat(a, cache=True)
+    await client.chat(b, cache=True)
+    await client.chat(a, cache=True)
+
+    assert mock_http.post.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_share_one_post(ollama_client):
+    import asyncio
+
+    release = asyncio.Event()
+    mock_response = MagicMock()
+    mock_response.raise_for_status = MagicMock()
+    mock_response.json.return_value = {"message": {"role": "assistant", "content": "shared"}}
+
+    async def slow_post(*args, **kwargs):
+        await release.wait()
+        return mock_response
+
+    ollama_client._http.post = AsyncMock(side_effect=slow_post)
+    messages = [ChatMessage(role="user", content="same prompt")]
+
+    tasks = [asyncio.create_task(ollama_client.chat_with_tools(messages)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert [r.content for r in results] == ["shared"] * 3
+    ollama_client._http.post.assert_called_once()
+    assert ollama_client._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_propagate_error(ollama_client):
+    import asyncio
+
+    release = asyncio.Event()
+
+    async def failing_post(*args, **kwargs):
+        await release.wait()
+        raise httpx.ConnectError("refused")
+
+    ollama_client._http.post = AsyncMock(side_effect=failing_post)
+    messages = [ChatMessage(role="user", content="boom")]
+
+    tasks = [asyncio.create_task(ollama_client.chat_with_tools(messages)) for _ in range(2)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert all(isinstance(r, httpx.ConnectError) for r in results)
+    ollama_client._http.post.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "raw,expected",
+    [
+        ("plain answer", "plain answer"),
+        ("<think>reasoning</think>\n\nanswer", "answer"),
+        ("a<think>x</think>b<think>y</think>\nc", "abc"),
+        ("reasoning truncated</think>answer", "answer"),
+        ("answer<think>truncated reasoning", "answer"),
+        ("<think>only reasoning</think>", ""),
+    ],
+)
+def test_strip_think(raw, expected):
+    from app.llm.client import _strip_think
+
+    assert _strip_think(raw) == expected
+
+
+def test_message_dicts_reused_until_message_changes(ollama_client):
+    msg = ChatMessage(role="user", content="history")
+    first = ollama_client._build_message_dicts([msg])[0]
+    assert ollama_client._build_message_dicts([msg])[0] is first
+
+    msg.content = "edited"
+    rebuilt = ollama_client._build_message_dicts([msg])[0]
+    assert rebuilt is not first
+    assert rebuilt["content"] == "edited"
+
+
+def test_message_dict_cache_entry_dies_with_message(ollama_client):
+    import gc
+
+    msg = ChatMessage(role="user", content="ephemeral")
+    ollama_client._build_message_dicts([msg])
+    assert len(ollama_client._message_dicts) == 1
+    del msg
+    gc.collect()
+    assert ollama_client._message_dicts == {}
+
+
+def test_tools_json_encodes_each_schema_once(ollama_client):
+    schema = {"type": "function", "function": {"name": "calc", "parameters": {}}}
+    other = {"type": "function", "function": {"name": "clock", "parameters": {}}}
+
+    first = ollama_client._tools_json([schema])
+    cached = ollama_client._tool_json[id(schema)][1]
+    assert (
+        ollama_client._tools_json([schema, other])
+        == f"[{cached},{ollama_client._tool_json[id(other)][1]}]"
+    )
+    assert ollama_client._tool_json[id(schema)][1] is cached
+    assert first == f"[{cached}]"
+
+    messages = [ChatMessage(role="user", content="hi")]
+    assert ollama_client._request_key(messages, "m", None, [schema]) != ollama_client._request_key(
+        messages, "m", None, [other]
+    )
+
+
+@pytest.mark.asyncio
+async def test_preload_posts_empty_generate_with_keep_alive():
+    mock_http = AsyncMock()
+    client = OllamaClient(
+        http_client=mock_http,
+        base_url="http://localhost:11434",
+        model="test-model",
+        keep_alive="24h",
+    )
+    mock_response = MagicMock()
+    mock_response.raise_for_status = MagicMock()
+    mock_http.post = AsyncMock(return_value=mock_response)
+
+    await client.preload()
+
+    args, kwargs = mock_http.post.call_args
+    assert args[0] == "http://localhost:11434/api/generate"
+    assert kwargs["json"] == {"model": "test-model", "keep_alive": "24h"}
@@ -7,7 +7,7 @@ from unittest.mock import AsyncMock, MagicMock
 from app.llm.client import ChatResponse
 from app.profiles.discovery import _parse_json_safe, maybe_discover_profile_updates
 from app.profiles.onboarding import handle_onboarding_message
-from app.profiles.prompt_builder import build_system_prompt
+from app.profiles.prompt_builder import build_system_prompt, build_system_prompt_parts
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -15,9 +15,10 @@ from app.profiles.prompt_builder import build_system_prompt
 
 
 def make_ollama(reply: str = "LLM response") -> MagicMock:
-    """Return a mock OllamaClient whose chat_with_tools always returns reply."""
+    """Return a mock OllamaClient whose chat_with_tools and chat always return reply."""
     client = MagicMock()
     client.chat_with_tools = AsyncMock(return_value=ChatResponse(content=reply))
+    client.chat = AsyncMock(return_value=reply)
     return client
 
 
@@ -59,6 +60,47 @@ async def test_onboarding_step_1_extracts_name():
     assert reply == "What do you do?"
 
 
+async def test_onboarding_does_not_mutate_input_profile():
+    profile = {"name": "Alice"}
+    ollama = make_ollama("Engineer")
+    _, _, data = await handle_onboarding_message("I'm an engineer", "step_2", profile, ollama)
+    assert data == {"name": "Alice", "occupation": "Engineer"}
+    assert profile == {"name": "Alice"}
+
+
+async def test_onboarding_step_runs_extraction_and_question_concurrently():
+    import asyncio
+
+    in_flight = 0
+    peak = 0
+    prompts = []
+
+    async def chat_with_tools(messages, **kwargs):
+        nonlocal in_flight, peak
+        prompts.append(messages[-1].content)
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        extracting = messages[-1].content.startswith("Extract")
+        return ChatResponse(content="Alice" if extracting else "What do you do?")
+
+    ollama = MagicMock()
+    ollama.chat_with_tools = chat_with_tools
+
+    _, reply, data = await handle_onboarding_message(
+        user_reply="My name is Alice",
+        state="step_1",
+        profile_data={},
+        ollama_client=ollama,
+    )
+    assert peak == 2
+    assert data["name"] == "Alice"
+    assert reply == "What do you do?"
+    # The question can't see the extracted name yet, so it gets the raw reply
+    assert "My name is Alice" in prompts[1]
+
+
 async def test_onboarding_step_2_extracts_occupation():
     ollama = MagicMock()
     responses = [
@@ -189,6 +231,25 @@ def test_build_system_prompt_full_profile():
     assert "Current Date: 2026-02-19" in result
 
 
+def test_build_system_prompt_parts_split_stable_from_volatile():
+    profile = {"name": "Alice", "debug_mode": True}
+    stable, volatile = build_system_prompt_parts("Base.", profile, "2026-02-19")
+    assert stable == "Base.\nThe user's name is Alice."
+    assert "DEBUG MODE" in volatile
+    assert volatile.endswith("Current Date: 2026-02-19")
+
+    # The prefix doesn't move with the date or the debug flag
+    other_day, _ = build_system_prompt_parts("Base.", {"name": "Alice"}, "2026-02-20")
+    assert other_day == stable
+    # ...and is memoized: same profile values, same string object
+    assert other_day is stable
+
+
+def test_build_system_prompt_parts_unhashable_profile_value():
+    stable, _ = build_system_prompt_parts("Base.", {"interests": ["chess", "go"]}, "2026-02-19")
+    assert stable == "Base.\nInterests: ['chess', 'go']."
+
+
 def test_build_system_prompt_partial_profile():
     profile = {"name": "Bob"}
     result = build_system_prompt("Base.", profile, "2026-02-19")
@@ -270,11 +331,25 @@ def test_parse_json_safe_with_fences():
     assert _parse_json_safe(text) == {"tech_context": "Python"}
 
 
+def test_parse_json_safe_fence_variants():
+    assert _parse_json_safe('```JSON\n{"a": "1"}\n```  ') == {"a": "1"}
+    assert _parse_json_safe('```\n{"a": "1"}') == {"a": "1"}  # sin fence de cierre
+    assert _parse_json_safe('```json\n{"a": "x```y"}\n```') == {"a": "x```y"}
+
+
 def test_parse_json_safe_invalid():
     assert _parse_json_safe("not json at all") == {}
     assert _parse_json_safe("") == {}
 
 
+def test_parse_json_safe_repairs_almost_json():
+    assert _parse_json_safe('Here is the JSON: {"interests": "music",}') == {"interests": "music"}
+    assert _parse_json_safe("{\u201clocation\u201d: \u201cRosario\u201d}") == {
+        "location": "Rosario"
+    }
+    assert _parse_json_safe("{interests: music}") == {}
+
+
 def test_parse_json_safe_non_dict():
     assert _parse_json_safe('["a", "b"]') == {}
 
@@ -284,14 +359,14 @@ async def test_maybe_discover_skipped_when_not_multiple(repository):
     ollama = make_ollama()
     await maybe_discover_profile_updates("123", 7, 10, repository, ollama, MagicMock())
     # If nothing ran, no LLM call was made
-    ollama.chat_with_tools.assert_not_called()
+    ollama.chat.assert_not_called()
 
 
 async def test_maybe_discover_skipped_zero_interval(repository):
     """interval=0 should skip to avoid ZeroDivisionError."""
     ollama = make_ollama()
     await maybe_discover_profile_updates("123", 10, 0, repository, ollama, MagicMock())
-    ollama.chat_with_tools.assert_not_called()
+    ollama.chat.assert_not_called()
 
 
 async def test_maybe_discover_skipped_during_onboarding(repository):
@@ -299,7 +374,7 @@ async def test_maybe_discover_skipped_during_onboarding(repository):
     await repository.save_user_profile("555", "step_2", {"name": "F"})
     ollama = make_ollama('{"interests": "hiking"}')
     await maybe_discover_profile_updates("555", 10, 10, repository, ollama, MagicMock())
-    ollama.chat_with_tools.assert_not_called()
+    ollama.chat.assert_not_called()
 
 
 async def test_maybe_discover_runs_and_merges(repository):
@@ -318,6 +393,27 @@ async def test_maybe_discover_runs_and_merges(repository):
     profile = await repository.get_user_profile(phone)
     assert profile["data"].get("interests") == "hiking"
     assert profile["data"].get("name") == "G"  # existing field preserved
+    assert ollama.chat.call_args.kwargs == {"think": False, "cache": True}
+
+
+async def test_maybe_discover_uses_known_conversation_id(repository, monkeypatch):
+    """A caller-supplied conversation_id skips the conversation lookup."""
+    phone = "779"
+    await repository.save_user_profile(phone, "complete", {})
+    conv_id = await repository.get_or_create_conversation(phone)
+    await repository.save_message(conv_id, "user", "I live in Rosario")
+
+    lookup = AsyncMock()
+    monkeypatch.setattr(repository, "get_or_create_conversation", lookup)
+    ollama = make_ollama('{"location": "Rosario"}')
+
+    await maybe_discover_profile_updates(
+        phone, 10, 10, repository, ollama, MagicMock(), conversation_id=conv_id
+    )
+
+    lookup.assert_not_called()
+    profile = await repository.get_user_profile(phone)
+    assert profile["data"]["location"] == "Rosario"
 
 
 async def test_maybe_discover_does_not_overwrite_existing(repository):
@@ -106,6 +106,29 @@ async def test_remove_nonexistent_memory(repository):
     assert removed is False
 
 
+async def test_memories_bulk_add_and_remove(repository):
+    await repository.add_memories_bulk([("Fact A", None), ("Fact B", "work"), ("Fact C", None)])
+    memories = await repository.list_memories()
+    assert [(m.content, m.category) for m in memories] == [
+        ("Fact A", None),
+        ("Fact B", "work"),
+        ("Fact C", None),
+    ]
+
+    assert await repository.remove_memories_bulk(["Fact A", "Fact C", "missing"]) == 2
+    assert await repository.get_active_memories() == ["Fact B"]
+    assert await repository.remove_memories_bulk([]) == 0
+
+
+async def test_update_memory_category(repository):
+    memory_id = await repository.add_memory("Likes tea", category="food")
+    assert await repository.update_memory_category("Likes tea", "drinks") is True
+    assert await repository.update_memory_category("does not exist", "x") is False
+
+    memories = await repository.list_memories()
+    assert [(m.id, m.category) for m in memories] == [(memory_id, "drinks")]
+
+
 async def test_get_active_memories(repository):
     await repository.add_memory("Fact 1")
     await repository.add_memory("Fact 2")
@@ -2,7 +2,7 @@ import hashlib
 import hmac
 import json
 
-from app.security.audit import AuditTrail
+from app.security.audit import AsyncAuditTrail, AuditEntry, AuditTrail
 from app.security.models import PolicyAction
 from app.security.policy_engine import PolicyEngine
 
@@ -122,3 +122,227 @@ def test_audit_trail_hmac_chain_links(tmp_path):
     e1 = audit.record("t1", {}, "allow", None, None)
     e2 = audit.record("t2", {}, "block", None, None)
     assert e2.previous_hash == e1.entry_hash
+
+
+def test_audit_trail_resumes_chain_from_last_line(tmp_path, monkeypatch):
+    """Reopening a log continues from the last entry, even when it spans several tail windows."""
+    from app.security import audit as audit_mod
+
+    monkeypatch.setattr(audit_mod, "_TAIL_CHUNK", 16)
+    log_file = tmp_path / "audit_resume.jsonl"
+    audit = AuditTrail(log_file)
+    audit.record("t1", {"x": "a" * 50}, "allow", None, None)
+    last = audit.record("t2", {"x": "b" * 50}, "allow", None, None)
+
+    reopened = AuditTrail(log_file)
+    assert reopened._last_hash == last.entry_hash
+
+
+def test_audit_trail_reuses_append_handle(tmp_path):
+    """Entries share one open handle and are flushed to disk as they are recorded."""
+    log_file = tmp_path / "audit_handle.jsonl"
+    audit = AuditTrail(log_file)
+    audit.record("t1", {}, "allow", None, None)
+    handle = audit._file
+    audit.record("t2", {}, "allow", None, None)
+
+    assert audit._file is handle
+    assert len(log_file.read_text().splitlines()) == 2
+
+    audit.close()
+    assert audit._file is None
+    audit.record("t3", {}, "allow", None, None)
+    assert len(log_file.read_text().splitlines()) == 3
+
+
+def test_policy_engine_invalid_regex_disables_only_that_rule(tmp_path):
+    policy_file = tmp_path / "policies.yaml"
+    policy_file.write_text(r"""
+version: "1.0"
+default_action: "allow"
+rules:
+  - id: "broken"
+    target_tool: "run_command"
+    argument_match:
+      CommandLine: '(unclosed'
+    action: "block"
+    reason: "never matches"
+  - id: "block_sudo"
+    target_tool: "run_command"
+    argument_match:
+      CommandLine: 'sudo .*'
+    action: "block"
+    reason: "no sudo"
+""")
+    engine = PolicyEngine(policy_file)
+
+    decision = engine.evaluate("run_command", {"CommandLine": "sudo ls"})
+    assert decision.rule_id == "block_sudo"
+    assert engine.evaluate("run_command", {"CommandLine": "(unclosed"}).is_allowed
+    assert engine.evaluate("other_tool", {}).is_allowed
+
+
+def test_policy_engine_tool_index_keeps_file_order(tmp_path):
+    """Rules are indexed per tool, but the first matching rule in the file still wins."""
+    policy_file = tmp_path / "policies.yaml"
+    policy_file.write_text(r"""
+version: "1.0"
+default_action: "block"
+rules:
+  - id: "flag_git_push"
+    target_tool: "run_command"
+    argument_match:
+      CommandLine: 'git push.*'
+    action: "flag"
+    reason: "pushes need approval"
+  - id: "allow_read"
+    target_tool: "read_file"
+    action: "allow"
+    reason: "reads are fine"
+  - id: "allow_git"
+    target_tool: "run_command"
+    argument_match:
+      CommandLine: 'git .*'
+    action: "allow"
+    reason: "git is fine"
+""")
+    engine = PolicyEngine(policy_file)
+
+    assert engine.evaluate("run_command", {"CommandLine": "git push"}).rule_id == "flag_git_push"
+    assert engine.evaluate("run_command", {"CommandLine": "git status"}).rule_id == "allow_git"
+    assert engine.evaluate("read_file", {"path": "x"}).rule_id == "allow_read"
+    assert engine.evaluate("write_file", {}).is_blocked
+
+
+def test_audit_trail_line_matches_entry_model(tmp_path):
+    """The raw line written to disk is exactly what AuditEntry would serialize."""
+    log_file = tmp_path / "audit_line.jsonl"
+    audit = AuditTrail(log_file)
+    entry = audit.record("t", {"texto": "año ✓", "n": [1, 2.5]}, "allow", None, "ok")
+
+    line = log_file.read_text(encoding="utf-8").rstrip("\n")
+    assert line == AuditEntry.model_validate(entry.model_dump()).model_dump_json()
+
+
+def test_audit_trail_record_batch_chains_in_one_write(tmp_path):
+    log_file = tmp_path / "audit_batch.jsonl"
+    audit = AuditTrail(log_file)
+    first = audit.record("t0", {}, "allow", None, None)
+    entries = audit.record_batch(
+        [
+            ("2026-01-01T00:00:00+00:00", "t1", {"x": 1}, "block", "r", "blocked_by_policy"),
+            ("2026-01-01T00:00:01+00:00", "t2", {}, "allow", None, "ok"),
+        ]
+    )
+
+    assert entries[0].previous_hash == first.entry_hash
+    assert entries[1].previous_hash == entries[0].entry_hash
+    assert audit._last_hash == entries[1].entry_hash
+    lines = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert [line["tool_name"] for line in lines] == ["t0", "t1", "t2"]
+    assert lines[1]["timestamp"] == "2026-01-01T00:00:00+00:00"
+
+
+async def test_async_audit_trail_batches_until_flush(tmp_path):
+    from unittest.mock import patch
+
+    log_file = tmp_path / "audit_async.jsonl"
+    trail = AuditTrail(log_file)
+    audit = AsyncAuditTrail(trail, max_delay=60)
+
+    with patch.object(trail, "record_batch", wraps=trail.record_batch) as record_batch:
+        audit.record("t1", {}, "block", "r", "blocked_by_policy")
+        audit.record("t2", {}, "allow", None, "ok")
+        assert log_file.read_text() == ""  # queued, nothing written yet
+
+        await audit.flush()
+
+    record_batch.assert_called_once()
+    lines = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert [line["tool_name"] for line in lines] == ["t1", "t2"]
+    assert lines[1]["previous_hash"] == lines[0]["entry_hash"]
+
+
+async def test_async_audit_trail_drains_after_delay(tmp_path):
+    import asyncio
+
+    log_file = tmp_path / "audit_delay.jsonl"
+    audit = AsyncAuditTrail(AuditTrail(log_file), max_delay=0.01)
+    audit.record("t1", {}, "allow", None, "ok")
+
+    for _ in range(100):
+        if log_file.read_text():
+            break
+        await asyncio.sleep(0.01)
+    assert len(log_file.read_text().splitlines()) == 1
+
+
+async def test_close_audit_trail_flushes_queue_and_closes_handle(tmp_path, monkeypatch):
+    from app.skills import executor
+
+    log_file = tmp_path / "audit_close.jsonl"
+    trail = AuditTrail(log_file)
+    audit = AsyncAuditTrail(trail, max_delay=60)
+    monkeypatch.setattr(executor, "_audit_trail", audit)
+
+    audit.record("t1", {}, "allow", None, "ok")
+    await executor.close_audit_trail()
+
+    assert [json.loads(line)["tool_name"] for line in log_file.read_text().splitlines()] == ["t1"]
+    assert trail._file is None
+
+
+def test_policy_engine_caches_decisions_by_inspected_args(tmp_path):
+    policy_file = tmp_path / "policies.yaml"
+    policy_file.write_text(r"""
+version: "1.0"
+default_action: "allow"
+rules:
+  - id: "block_rm"
+    target_tool: "run_command"
+    argument_match:
+      command: "rm .*"
+    action: "block"
+    reason: "No rm"
+""")
+    engine = PolicyEngine(policy_file)
+
+    first = engine.evaluate("run_command", {"command": "rm -rf /tmp/x", "cwd": "/a"})
+    # Same inspected value, different uninspected arg: served from the cache
+    again = engine.evaluate("run_command", {"command": "rm -rf /tmp/x", "cwd": "/b"})
+    assert first.action == PolicyAction.BLOCK
+    assert again is first
+    assert engine.evaluate("run_command", {"command": "ls"}).action == PolicyAction.ALLOW
+    assert len(engine._decision_cache) == 2
+
+    # Tools without rules never touch the cache
+    assert engine.evaluate("get_weather", {"city": "Rosario"}).action == PolicyAction.ALLOW
+    assert len(engine._decision_cache) == 2
+
+
+def test_reset_policy_cache_reloads_engine(monkeypatch):
+    from app.skills import executor
+
+    monkeypatch.setattr(executor, "_policy_engine", object())
+    executor.reset_policy_cache()
+    assert executor._policy_engine is None
+
+
+async def test_get_policy_engine_concurrent_first_calls_build_once(monkeypatch):
+    import asyncio
+
+    from app.skills import executor
+
+    built = []
+
+    def fake_engine(path):
+        built.append(path)
+        return object()
+
+    monkeypatch.setattr(executor, "_policy_engine", None)
+    monkeypatch.setattr(executor, "PolicyEngine", fake_engine)
+
+    engines = await asyncio.gather(*(executor.get_policy_engine() for _ in range(5)))
+
+    assert len(built) == 1
+    assert all(e is engines[0] for e in engines)
@@ -110,3 +110,22 @@ Instructions for {name}.""")
 def test_scan_nonexistent_directory():
     skills = scan_skills_directory("/nonexistent/path")
     assert skills == []
+
+
+def test_load_skill_metadata_reparses_only_changed_files(tmp_path):
+    import os
+
+    skill_dir = tmp_path / "notes"
+    skill_dir.mkdir()
+    skill_file = skill_dir / "SKILL.md"
+    skill_file.write_text("---\nname: notes\ndescription: v1\n---\nBody.")
+
+    first = load_skill_metadata(skill_dir)
+    assert load_skill_metadata(skill_dir) is first  # unchanged file: cached parse
+
+    skill_file.write_text("---\nname: notes\ndescription: v2 edited\n---\nBody.")
+    st = skill_file.stat()
+    os.utime(skill_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    edited = load_skill_metadata(skill_dir)
+    assert edited is not first
+    assert edited.description == "v2 edited"
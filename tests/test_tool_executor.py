@@ -1,10 +1,11 @@
+from collections import deque
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
 from app.llm.client import ChatResponse, OllamaClient
 from app.models import ChatMessage
-from app.skills.executor import MAX_TOOL_ITERATIONS, execute_tool_loop
+from app.skills.executor import MAX_TOOL_ITERATIONS, _clear_old_tool_results, execute_tool_loop
 from app.skills.registry import SkillRegistry
 
 
@@ -14,7 +15,7 @@ def _bypass_router():
         patch("app.skills.executor.classify_intent", new_callable=AsyncMock, return_value=["time"]),
         patch(
             "app.skills.executor.select_tools",
-            side_effect=lambda cats, all_tools, max_tools=8: list(all_tools.values()),
+            side_effect=lambda cats, all_tools, max_tools=8, **_: list(all_tools.values()),
         ),
     )
 
@@ -268,3 +269,68 @@ async def test_multiple_tool_calls_in_one_response(ollama_client, skill_registry
     with p1, p2:
         result = await execute_tool_loop(messages, ollama_client, skill_registry)
     assert result == "Both tools returned results"
+
+
+async def test_parallel_tool_calls_are_bounded(ollama_client, skill_registry):
+    """A response with many tool calls runs at most MAX_PARALLEL_TOOL_CALLS at once, in order."""
+    import asyncio
+
+    from app.skills import executor
+
+    running = 0
+    peak = 0
+
+    async def fake_run_tool_call(tc, *args, **kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return ChatMessage(role="tool", content=tc["function"]["name"])
+
+    async def noop() -> str:
+        return ""
+
+    skill_registry.register_tool(
+        name="tool_00",
+        description="Noop",
+        parameters={"type": "object", "properties": {}},
+        handler=noop,
+    )
+    calls = [{"function": {"name": f"tool_{n:02d}", "arguments": {}}} for n in range(20)]
+    ollama_client.chat_with_tools = AsyncMock(
+        side_effect=[ChatResponse(content="", tool_calls=calls), ChatResponse(content="done")]
+    )
+
+    p1, p2 = _bypass_router()
+    messages = [ChatMessage(role="user", content="Do everything")]
+    with p1, p2, patch("app.skills.executor._run_tool_call", side_effect=fake_run_tool_call):
+        assert await execute_tool_loop(messages, ollama_client, skill_registry) == "done"
+
+    assert peak == executor.MAX_PARALLEL_TOOL_CALLS
+    # Results are appended in call order (older ones already compacted to a summary line)
+    final_messages = ollama_client.chat_with_tools.call_args.args[0]
+    tool_contents = [m.content for m in final_messages if m.role == "tool"]
+    assert len(tool_contents) == 20
+    assert all(f"tool_{n:02d}" in c for n, c in enumerate(tool_contents))
+
+
+def test_clear_old_tool_results_with_tracked_indices():
+    messages = [ChatMessage(role="user", content="hi")]
+    tool_indices: deque[int] = deque()
+    for n in range(4):
+        tool_indices.append(len(messages))
+        messages.append(ChatMessage(role="tool", content=f"result {n}\nbody"))
+        _clear_old_tool_results(messages, keep_last_n=2, tool_indices=tool_indices)
+
+    assert list(tool_indices) == [3, 4]
+    # Each old result is summarized exactly once (no nested placeholders)
+    assert messages[1].content == "[Previous result processed — summary: result 0]"
+    assert messages[2].content == "[Previous result processed — summary: result 1]"
+    assert [m.content for m in messages[3:]] == ["result 2\nbody", "result 3\nbody"]
+
+    # Without tracked indices the list is scanned, same result for fresh messages
+    fresh = [ChatMessage(role="tool", content=f"r{n}") for n in range(3)]
+    _clear_old_tool_results(fresh, keep_last_n=2)
+    assert fresh[0].content == "[Previous result processed — summary: r0]"
+    assert [m.content for m in fresh[1:]] == ["r1", "r2"]
@@ -5,6 +5,7 @@ from app.skills.router import (
     DEFAULT_CATEGORIES,
     REQUEST_MORE_TOOLS_NAME,
     TOOL_CATEGORIES,
+    build_category_index,
     build_request_more_tools_schema,
     classify_intent,
     select_tools,
@@ -194,6 +195,19 @@ def test_select_tools_single_category_unchanged():
     assert len(result) == min(8, len(all_names))
 
 
+def test_select_tools_with_category_index_matches_scan():
+    names = TOOL_CATEGORIES["projects"] + TOOL_CATEGORIES["github"] + ["get_weather"]
+    tools_map = _make_tools_map(names)
+    index = build_category_index(tools_map)
+
+    assert index["math"] == []  # calculate is not in the map
+    for cats in (["projects", "github"], ["weather", "projects"], ["github"], ["nope"]):
+        for max_tools in (3, 8):
+            assert select_tools(cats, tools_map, max_tools, category_index=index) == select_tools(
+                cats, tools_map, max_tools
+            )
+
+
 # --- request_more_tools schema tests ---
 
 
@@ -191,7 +191,7 @@ async def test_execute_tool_loop_creates_generation_span():
         patch("app.skills.executor.classify_intent", new_callable=AsyncMock, return_value=["time"]),
         patch(
             "app.skills.executor.select_tools",
-            side_effect=lambda cats, all_tools, max_tools=8: list(all_tools.values()),
+            side_effect=lambda cats, all_tools, max_tools=8, **_: list(all_tools.values()),
         ),
     ):
         async with TraceContext("test", "test", mock_recorder):